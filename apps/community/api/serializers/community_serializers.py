@@ -1,7 +1,10 @@
 from rest_framework import serializers
-from community.models import Community, CommunityMember, CommunityCategory, CommunityChannel, CommunityInvitation
+from community.models import (
+    Community, CommunityMember, CommunityCategory, CommunityChannel, CommunityInvitation, CommunityDiscovery,
+)
 from users.models import User
-from users.api import UserSerializer
+from users.api import UserSerializer, UserCardListSerializer
+from community.permissions import get_community_role
 
 class CommunityCategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,6 +21,7 @@ class CommunityMemberSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CommunityMember
+        list_serializer_class = UserCardListSerializer
         fields = ['id', 'user', 'role', 'joined_at']
 
 class CommunitySerializer(serializers.ModelSerializer):
@@ -31,6 +35,7 @@ class CommunitySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Community
+        list_serializer_class = UserCardListSerializer
         fields = [
             'id', 'name', 'description', 'icon', 'visibility', 
             'category', 'category_name', 'created_by', 'created_at', 
@@ -47,11 +52,7 @@ class CommunitySerializer(serializers.ModelSerializer):
     def get_user_role(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            membership = CommunityMember.objects.filter(
-                community=obj, # Fixed from 'server'
-                user=request.user
-            ).first()
-            return membership.role if membership else None
+            return get_community_role(request, obj.id)
         return None
 
 class CreateCommunitySerializer(serializers.ModelSerializer):
@@ -153,12 +154,16 @@ class ReceivedCommunityInvitationSerializer(serializers.ModelSerializer):
 # --- PUBLIC & DISCOVERY SERIALIZERS ---
 
 class PublicCommunityListSerializer(serializers.ModelSerializer):
+    """Row of the discovery index (CommunityDiscovery), one per public community."""
+    id = serializers.UUIDField(source="community_id", read_only=True)
+    name = serializers.CharField(source="community.name", read_only=True)
+    description = serializers.CharField(source="community.description", read_only=True)
     category = serializers.CharField(source="category.name", read_only=True)
+    icon = serializers.ImageField(source="community.icon", read_only=True)
     invite_code = serializers.SerializerMethodField()
-    member_count = serializers.IntegerField(source='members.count', read_only=True)
 
     class Meta:
-        model = Community
+        model = CommunityDiscovery
         fields = [
             "id",
             "name",
@@ -170,12 +175,8 @@ class PublicCommunityListSerializer(serializers.ModelSerializer):
         ]
 
     def get_invite_code(self, obj):
-        # Find the first valid public invite code for this community
-        invite = obj.invitations.filter(
-            invited_user__isnull=True, # Public link
-            max_uses=0 # Infinite uses
-        ).first()
-        return invite.invite_code if invite else None
+        # Default public link, precomputed in the index
+        return obj.invite_code or None
 
 
 class PublicCommunityInviteSerializer(serializers.ModelSerializer):
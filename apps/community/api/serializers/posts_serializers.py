@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from community.models import Post, PostAttachment, Comment, PostLike
 from community.models import Community
-from users.api.serializers.user_serializers import UserSerializer
+from users.api.serializers.user_serializers import UserSerializer, UserCardListSerializer
 
 # --- Attachment Serializer ---
 class PostAttachmentSerializer(serializers.ModelSerializer):
@@ -15,6 +15,7 @@ class CommentReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = UserCardListSerializer
         fields = ["id", "author", "content", "created_at", "updated_at"]
 
 class CommentWriteSerializer(serializers.ModelSerializer):
@@ -31,15 +32,14 @@ class PostReadSerializer(serializers.ModelSerializer):
     # Nested Relations
     attachments = PostAttachmentSerializer(many=True, read_only=True)
     
-    # We usually don't load ALL comments in the feed, just the count
-    comment_count = serializers.IntegerField(source="comments.count", read_only=True)
-    like_count = serializers.IntegerField(source="likes.count", read_only=True)
-    
+    # comment_count / like_count are denormalized columns on Post
+
     # Check if current user liked it (Requires 'context' passed from view)
     is_liked = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
+        list_serializer_class = UserCardListSerializer
         fields = [
             "id",
             "author",
@@ -56,6 +56,9 @@ class PostReadSerializer(serializers.ModelSerializer):
         ]
 
     def get_is_liked(self, obj):
+        # Annotated for the whole page by the views (with_is_liked)
+        if hasattr(obj, 'is_liked'):
+            return obj.is_liked
         user = self.context.get('request').user
         if user.is_authenticated:
             return obj.likes.filter(user=user).exists()
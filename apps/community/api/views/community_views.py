@@ -4,20 +4,25 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
 
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
+from uuid import UUID
 
 # Models
 from community.models import (
     Community, 
     CommunityMember, 
     CommunityInvitation, 
-    CommunityCategory
+    CommunityCategory,
+    CommunityDiscovery
 )
 
+from community.caches import category_cache
+from community.permissions import get_community_role
+
 # Serializers (Assumed you have renamed/created these based on previous steps)
 from ..serializers.community_serializers import (
     CommunitySerializer,
@@ -38,10 +43,25 @@ from ..serializers.community_serializers import (
 class CommunityCategoryListView(generics.ListAPIView):
     serializer_class = CommunityCategorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = None  # small lookup list
 
     def get_queryset(self):
         return CommunityCategory.objects.all()
 
+    def list(self, request, *args, **kwargs):
+        # Same list for everyone: served from the worker's own LRU most of the time
+        def compute():
+            return super(CommunityCategoryListView, self).list(request, *args, **kwargs).data
+
+        return Response(category_cache.get_or_set("all", compute=compute))
+
+
+# Sort orders of the discovery listing (?sort=), each ending with the unique key
+DISCOVERY_ORDERINGS = {
+    'popular': ('-member_count', '-community_id'),
+    'recent': ('-created_at', '-community_id'),
+}
+
 
 # --- MAIN COMMUNITY VIEWSET ---
 class CommunityViewSet(viewsets.ModelViewSet):
@@ -53,6 +73,14 @@ class CommunityViewSet(viewsets.ModelViewSet):
         if self.action == 'create':
             return CreateCommunitySerializer
         return CommunitySerializer
+
+    def get_cursor_ordering(self):
+        if self.action == 'members':
+            return ('joined_at', 'id')
+        if self.action == 'public_communities':
+            sort = self.request.query_params.get('sort')
+            return DISCOVERY_ORDERINGS.get(sort, DISCOVERY_ORDERINGS['popular'])
+        return ('-created_at', '-id')
     
     def get_queryset(self):
         user = self.request.user
@@ -85,27 +113,31 @@ class CommunityViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def public_communities(self, request):
-        """Get all public communities that the user is NOT a member of"""
-        user = request.user
-        
-        # IDs where user is already a member
-        user_community_ids = Community.objects.filter(
-            Q(created_by=user) | Q(members__user=user)
-        ).values_list('id', flat=True)
-        
-        # Public communities excluding joined ones
-        communities = Community.objects.filter(
-            visibility="public"
-        ).exclude(
-            id__in=user_community_ids
-        ).select_related("category")
-        
+        """
+        Public communities the user is NOT a member of, from the discovery index.
+        ?category=<category id>  ?sort=popular (default) | recent
+        """
+        # Joined ones are excluded with NOT EXISTS on the (community, user) unique index
+        joined = CommunityMember.objects.filter(
+            community_id=OuterRef('community_id'), user=request.user
+        )
+        entries = CommunityDiscovery.objects.filter(~Exists(joined))\
+            .select_related('community', 'category')
+
+        category = request.query_params.get('category')
+        if category:
+            try:
+                entries = entries.filter(category_id=UUID(category))
+            except ValueError:
+                raise ValidationError({"category": "Invalid category id."})
+
+        page = self.paginate_queryset(entries)
         serializer = PublicCommunityListSerializer(
-            communities,
+            page,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['get'], url_path='members')
     def members(self, request, pk=None):
@@ -113,9 +145,10 @@ class CommunityViewSet(viewsets.ModelViewSet):
         Fetch all members of a specific community.
         """
         community = self.get_object()
-        members = CommunityMember.objects.filter(community=community).select_related('user')
-        serializer = CommunityMemberSerializer(members, many=True)
-        return Response(serializer.data)
+        members = CommunityMember.objects.filter(community=community).select_related('user__profile')
+        page = self.paginate_queryset(members)
+        serializer = CommunityMemberSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
 
 # --- INVITATION VIEWS ---
@@ -242,12 +275,11 @@ class CommunityMemberRoleView(APIView):
         community = get_object_or_404(Community, id=community_id)
 
         # 1. Check if requester is Admin
-        try:
-            requester_member = CommunityMember.objects.get(community=community, user=request.user)
-        except CommunityMember.DoesNotExist:
+        requester_role = get_community_role(request, community.id)
+        if requester_role is None:
             return Response({"error": "You are not a member."}, status=status.HTTP_403_FORBIDDEN)
 
-        if requester_member.role != "admin":
+        if requester_role != "admin":
              # Note: 'created_by' is not a role in the Member model, it's on the Community model
              # So we check if role is admin OR if they are the creator
             if community.created_by != request.user:
@@ -266,7 +298,7 @@ class CommunityMemberRoleView(APIView):
             return Response({"error": "Invalid role."}, status=status.HTTP_400_BAD_REQUEST)
 
         member.role = role
-        member.save()
+        member.save(update_fields=["role"])  # post_save drops the cached ACL entry
 
         return Response(
             {"message": "Role updated", "user": member.user.id, "role": member.role},
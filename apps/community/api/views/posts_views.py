@@ -2,7 +2,7 @@ from rest_framework import generics, viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef
 from community.models import Post, Comment, PostLike
 from community.api import (
 PostReadSerializer, 
@@ -12,13 +12,31 @@ PostReadSerializer,
 )
 
 from community.models import Community, CommunityMember
+from community.permissions import get_community_role
+from src.conditional import ConditionalGetMixin
+from community import likes, timeline
+
+
+def with_is_liked(queryset, user):
+    """Annotates `is_liked` for every post in one query (read by PostReadSerializer)."""
+    return queryset.annotate(
+        is_liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=user))
+    )
+
+
+class LikeOverlayMixin:
+    """Serves like_count/is_liked including toggles not yet flushed (community/likes.py)."""
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        return likes.overlay(page, self.request.user) if page is not None else None
 
 
 # ---------------------------------------------------------
 # 1. POST VIEWS
 # ---------------------------------------------------------
 
-class CommunityPostListCreateView(generics.ListCreateAPIView):
+class CommunityPostListCreateView(ConditionalGetMixin, LikeOverlayMixin, generics.ListCreateAPIView):
     """
     ENDPOINT: /api/communities/<community_id>/posts/
     USAGE: 
@@ -26,13 +44,22 @@ class CommunityPostListCreateView(generics.ListCreateAPIView):
     - POST: Create a new post in that community
     """
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ('-is_pinned', '-created_at', '-id')
+
+    def get_etag_version(self):
+        community_id = self.kwargs['community_id']
+        version = Community.objects.filter(pk=community_id).values_list('version', flat=True).first()
+        if version is None:
+            return None
+        # Write-behind like toggles do not bump Community.version
+        return f"{version}.{likes.likes_generation(community_id)}"
 
     def get_queryset(self):
         community_id = self.kwargs['community_id']
-        return Post.objects.filter(community_id=community_id)\
-            .select_related('author', 'community')\
-            .prefetch_related('attachments', 'likes')\
-            .order_by('-is_pinned', '-created_at')
+        posts = Post.objects.filter(community_id=community_id)\
+            .select_related('author__profile', 'community')\
+            .prefetch_related('attachments')
+        return with_is_liked(posts, self.request.user)
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -42,32 +69,30 @@ class CommunityPostListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         community = get_object_or_404(Community, id=self.kwargs['community_id'])
         # Check if user is a member here before letting them post
-        if not CommunityMember.objects.filter(community=community, user=self.request.user).exists():
+        if not get_community_role(self.request, community.id):
              raise permissions.PermissionDenied("You must be a member to post.")
              
-        serializer.save(author=self.request.user, community=community)
+        post = serializer.save(author=self.request.user, community=community)
+        # Push into the members' home timelines once the post is committed
+        timeline.fan_out_on_commit(post)
 
 
-class HomeActivityFeedView(generics.ListAPIView):
+class HomeActivityFeedView(LikeOverlayMixin, generics.ListAPIView):
     """
     ENDPOINT: /api/feed/home/
     USAGE: Lists posts from ALL communities the user belongs to.
     This is for the 'Home Dashboard' widget.
+    Candidates come from the user's precomputed timeline (community/timeline.py).
     """
     serializer_class = PostReadSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        # 1. Get IDs of communities I am a member of
-        my_community_ids = CommunityMember.objects.filter(
-            user=self.request.user
-        ).values_list('community_id', flat=True)
-
-        # 2. Filter posts only from those communities
-        return Post.objects.filter(community__id__in=my_community_ids)\
-            .select_related('author', 'community')\
-            .prefetch_related('attachments')\
-            .order_by('-created_at')
+        # Timeline post ids + posts of communities too large to fan out
+        posts = timeline.home_feed_queryset(self.request.user)\
+            .select_related('author__profile', 'community')\
+            .prefetch_related('attachments')
+        return with_is_liked(posts, self.request.user)
 
 
 class PostDetailView(generics.RetrieveDestroyAPIView):
@@ -75,10 +100,16 @@ class PostDetailView(generics.RetrieveDestroyAPIView):
     ENDPOINT: /api/posts/<post_id>/
     USAGE: Get single post or Delete post
     """
-    queryset = Post.objects.all()
     serializer_class = PostReadSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        posts = Post.objects.select_related('author__profile', 'community').prefetch_related('attachments')
+        return with_is_liked(posts, self.request.user)
+
+    def get_object(self):
+        return likes.overlay([super().get_object()], self.request.user)[0]
+
     def perform_destroy(self, instance):
         if instance.author != self.request.user:
              raise permissions.PermissionDenied("You can only delete your own posts.")
@@ -97,14 +128,15 @@ class ToggleLikeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, post_id):
-        post = get_object_or_404(Post, id=post_id)
-        like, created = PostLike.objects.get_or_create(user=request.user, post=post)
+        post = get_object_or_404(Post.objects.only('id', 'like_count', 'community_id'), id=post_id)
+        # Atomic flip in the like store, PostLike rows written behind; or a
+        # synchronous PostLike insert/delete without django-redis (community/likes.py)
+        liked, count = likes.toggle(post, request.user)
 
-        if not created:
-            like.delete()
-            return Response({"status": "unliked", "count": post.likes.count()})
+        if not liked:
+            return Response({"status": "unliked", "count": count})
         
-        return Response({"status": "liked", "count": post.likes.count()})
+        return Response({"status": "liked", "count": count})
 
 
 class PostCommentListCreateView(generics.ListCreateAPIView):
@@ -112,9 +144,11 @@ class PostCommentListCreateView(generics.ListCreateAPIView):
     ENDPOINT: /api/posts/<post_id>/comments/
     """
     permission_classes = [permissions.IsAuthenticated]
+    # Oldest first, like a conversation
+    cursor_ordering = ('created_at', 'id')
 
     def get_queryset(self):
-        return Comment.objects.filter(post_id=self.kwargs['post_id']).order_by('created_at')
+        return Comment.objects.filter(post_id=self.kwargs['post_id']).select_related('author')
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
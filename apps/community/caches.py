@@ -0,0 +1,6 @@
+# community/caches.py
+"""Cached community reads (see src/cache_aside.py), invalidated by community/signals.py."""
+from src.cache_aside import CacheAside
+
+# The category list: read by every community form, changed from the admin only
+category_cache = CacheAside("community:categories", timeout=60 * 60, hot=True)
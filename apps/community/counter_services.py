@@ -0,0 +1,25 @@
+# community/counter_services.py
+from django.db.models import F
+
+from .models import Community, Post
+
+
+def apply_post_counter_delta(post_id, likes=0, comments=0):
+    """Atomically shifts the engagement counters of one post (single UPDATE with F())."""
+    changes = {}
+    if likes:
+        changes['like_count'] = F('like_count') + likes
+    if comments:
+        changes['comment_count'] = F('comment_count') + comments
+    if changes:
+        Post.objects.filter(pk=post_id).update(**changes)
+
+
+def bump_community_version(community_id):
+    """Marks the community's lists as changed (ETags derive from Community.version)."""
+    Community.objects.filter(pk=community_id).update(version=F('version') + 1)
+
+
+def bump_member_communities_version(user_id):
+    """Every community `user_id` belongs to (their name/avatar is shown there)."""
+    Community.objects.filter(members__user_id=user_id).update(version=F('version') + 1)
@@ -0,0 +1,52 @@
+# community/discovery_services.py
+from django.db.models import F
+
+from .models import Community, CommunityDiscovery, CommunityInvitation, CommunityMember
+
+
+def is_default_invite(invitation):
+    """The open, unlimited link created with every public community."""
+    return invitation.invited_user_id is None and invitation.max_uses == 0
+
+
+def default_invite_code(community_id):
+    return CommunityInvitation.objects.filter(
+        community_id=community_id, invited_user__isnull=True, max_uses=0
+    ).order_by('created_at').values_list('invite_code', flat=True).first() or ''
+
+
+def sync_community(community):
+    """Recomputes the discovery row of one community (removed when not public)."""
+    if community.visibility != 'public':
+        CommunityDiscovery.objects.filter(community_id=community.id).delete()
+        return
+
+    CommunityDiscovery.objects.update_or_create(
+        community_id=community.id,
+        defaults={
+            'category_id': community.category_id,
+            'member_count': CommunityMember.objects.filter(community_id=community.id).count(),
+            'invite_code': default_invite_code(community.id),
+            'created_at': community.created_at,
+        },
+    )
+
+
+def apply_member_delta(community_id, delta):
+    """Join/leave: single UPDATE with F(), no recount."""
+    CommunityDiscovery.objects.filter(community_id=community_id)\
+        .update(member_count=F('member_count') + delta)
+
+
+def refresh_invite_code(community_id):
+    CommunityDiscovery.objects.filter(community_id=community_id)\
+        .update(invite_code=default_invite_code(community_id))
+
+
+def rebuild_discovery_index():
+    """Full rebuild (management command / repair). Returns the number of communities synced."""
+    count = 0
+    for community in Community.objects.only('id', 'visibility', 'category_id', 'created_at').iterator():
+        sync_community(community)
+        count += 1
+    return count
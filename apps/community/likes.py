@@ -0,0 +1,281 @@
+# community/likes.py
+"""
+Write-behind likes.
+
+With the django-redis cache, a toggle never touches PostLike: it flips the user's state in a fast store and
+moves the post's counter in the same atomic step, then marks the post dirty.
+
+    toggle(post, user)      -> (liked, like_count), no row lock, no COUNT(*)
+    overlay(posts, user)    -> applies pending state/counts to loaded posts
+    likes_generation(c)     -> changes with every write-behind toggle in community `c` (for ETags)
+    flush_likes()           -> writes pending toggles to PostLike + Post.like_count
+                               (flush-post-likes, run by Celery beat)
+
+Any other cache is not shared between workers (and nothing guarantees a beat
+process), so toggles are then written to PostLike synchronously.
+
+Per post:
+    community:likes:{post}:pending   {user_id: 1|0}  toggles not yet written
+    community:likes:{post}:flushing  {user_id: 1|0}  toggles being written
+    community:likes:{post}:count     current like count
+    community:likes:{post}:epoch     bumped by every flush of the post
+    community:likes:dirty            posts with pending toggles
+
+The flusher moves `pending` to `flushing`, writes it (idempotently: insert
+ignoring conflicts, delete, recount) and only then drops `flushing`. A flusher
+that dies half way leaves `flushing` and the dirty mark behind, so the next
+run writes the same batch again. Once a post has no pending toggles left,
+the flusher resets its count key to the recounted Post.like_count.
+
+A toggle reads the user's like from PostLike before the store falls back to
+it; a flush finishing in between would make that read stale. The toggle
+therefore carries the epoch it read first and is retried if it changed.
+
+    RedisLikeStore -> Lua scripts on the django-redis connection
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .counter_services import bump_community_version
+from .models import Post, PostLike
+
+COUNT_TTL = 60 * 60 * 24
+FLUSH_BATCH_SIZE = 500
+DIRTY_KEY = "community:likes:dirty"
+
+
+def pending_key(post_id):
+    return f"community:likes:{post_id}:pending"
+
+
+def flushing_key(post_id):
+    return f"community:likes:{post_id}:flushing"
+
+
+def count_key(post_id):
+    return f"community:likes:{post_id}:count"
+
+
+def epoch_key(post_id):
+    return f"community:likes:{post_id}:epoch"
+
+
+# KEYS: pending, flushing, count, dirty, epoch   ARGV: user, db_liked, db_count, post, epoch
+_TOGGLE = """
+if (redis.call('GET', KEYS[5]) or '0') ~= ARGV[5] then
+    return {-1, 0}
+end
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if not current then current = redis.call('HGET', KEYS[2], ARGV[1]) end
+if not current then current = ARGV[2] end
+local liked = 1 - tonumber(current)
+redis.call('HSET', KEYS[1], ARGV[1], liked)
+redis.call('SET', KEYS[3], ARGV[3], 'NX')
+redis.call('PERSIST', KEYS[3])
+local count = redis.call('INCRBY', KEYS[3], liked == 1 and 1 or -1)
+redis.call('SADD', KEYS[4], ARGV[4])
+return {liked, count}
+"""
+
+# KEYS: pending, flushing   (a leftover `flushing` is written again first)
+_CLAIM = """
+if redis.call('EXISTS', KEYS[2]) == 0 and redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('RENAME', KEYS[1], KEYS[2])
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+
+# KEYS: pending, flushing, count, dirty, epoch   ARGV: post, count ttl, recounted count ('' if unknown)
+_FINALIZE = """
+redis.call('DEL', KEYS[2])
+redis.call('INCR', KEYS[5])
+redis.call('EXPIRE', KEYS[5], ARGV[2])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[4], ARGV[1])
+    if ARGV[3] ~= '' then
+        redis.call('SET', KEYS[3], ARGV[3], 'EX', ARGV[2])
+    else
+        redis.call('EXPIRE', KEYS[3], ARGV[2])
+    end
+end
+"""
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisLikeStore:
+    def __init__(self, client):
+        self.client = client
+        self._toggle = client.register_script(_TOGGLE)
+        self._claim = client.register_script(_CLAIM)
+        self._finalize = client.register_script(_FINALIZE)
+
+    def _keys(self, post_id):
+        return [pending_key(post_id), flushing_key(post_id), count_key(post_id), DIRTY_KEY, epoch_key(post_id)]
+
+    def epoch(self, post_id):
+        return int(self.client.get(epoch_key(post_id)) or 0)
+
+    def toggle(self, post_id, user_id, db_liked, db_count, epoch=0):
+        """(liked, count), or None when a flush ran since `epoch` was read."""
+        args = [user_id, int(db_liked), db_count, post_id, epoch]
+        liked, count = self._toggle(keys=self._keys(post_id), args=args)
+        if liked == -1:
+            return None
+        return bool(liked), int(count)
+
+    def state(self, post_ids, user_id):
+        """{post_id: (count or None, liked or None)} for the posts with cached state."""
+        pipe = self.client.pipeline(transaction=False)
+        for post_id in post_ids:
+            pipe.get(count_key(post_id))
+            pipe.hget(pending_key(post_id), user_id)
+            pipe.hget(flushing_key(post_id), user_id)
+        values = pipe.execute()
+
+        result = {}
+        for i, post_id in enumerate(post_ids):
+            count, pending, flushing = values[3 * i: 3 * i + 3]
+            liked = pending if pending is not None else flushing
+            result[post_id] = (
+                int(count) if count is not None else None,
+                bool(int(liked)) if liked is not None else None,
+            )
+        return result
+
+    def dirty_posts(self, limit):
+        return [_decode(post_id) for post_id in self.client.srandmember(DIRTY_KEY, limit)]
+
+    def claim(self, post_id):
+        values = self._claim(keys=[pending_key(post_id), flushing_key(post_id)])
+        return {_decode(values[i]): int(values[i + 1]) for i in range(0, len(values), 2)}
+
+    def finalize(self, post_id, count=None):
+        self._finalize(keys=self._keys(post_id), args=[post_id, COUNT_TTL, "" if count is None else count])
+
+
+def get_store():
+    """The write-behind store, or None: toggles are then written synchronously."""
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        from django_redis import get_redis_connection
+        return RedisLikeStore(get_redis_connection("default"))
+    return None
+
+
+# --- REQUEST PATH ---
+
+def generation_key(community_id):
+    return f"community:likes:generation:{community_id}"
+
+
+def likes_generation(community_id):
+    # Only write-behind toggles need it (synchronous ones bump Community.version),
+    # and only then is the cache shared by every worker
+    if get_store() is None:
+        return 0
+    return cache.get(generation_key(community_id), 0)
+
+
+def _toggle_now(post, user):
+    # Post.like_count follows the insert/delete (community/signals.py)
+    with transaction.atomic():
+        like, created = PostLike.objects.get_or_create(user_id=user.pk, post_id=post.pk)
+        if not created:
+            like.delete()
+        bump_community_version(post.community_id)
+    count = Post.objects.filter(pk=post.pk).values_list('like_count', flat=True).first()
+    return created, count
+
+
+def _toggle_behind(store, post, user):
+    db_state = Post.objects.filter(pk=post.pk).annotate(
+        liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user_id=user.pk))
+    ).values_list('like_count', 'liked')
+    while True:
+        epoch = store.epoch(str(post.pk))
+        db_count, db_liked = db_state.first() or (0, False)
+        result = store.toggle(str(post.pk), str(user.pk), db_liked, db_count, epoch)
+        if result is not None:
+            return result
+
+
+def toggle(post, user):
+    """Flips `user`'s like on `post`; returns (liked, like_count)."""
+    store = get_store()
+    if store is None:
+        return _toggle_now(post, user)
+    result = _toggle_behind(store, post, user)
+
+    # Write-behind toggles do not touch Community.version; list ETags include this instead
+    try:
+        cache.incr(generation_key(post.community_id))
+    except ValueError:
+        cache.add(generation_key(post.community_id), 1, timeout=None)
+    return result
+
+
+def overlay(posts, user):
+    """Replaces like_count/is_liked of loaded posts with the not yet flushed values."""
+    posts = list(posts)
+    store = get_store()
+    if not posts or store is None:
+        return posts
+    state = store.state([str(post.pk) for post in posts], str(user.pk))
+    for post in posts:
+        count, liked = state[str(post.pk)]
+        if count is not None:
+            post.like_count = count
+        if liked is not None:
+            post.is_liked = liked
+    return posts
+
+
+# --- FLUSHER ---
+
+def recount_likes(post_ids):
+    """Recounts Post.like_count from PostLike; returns {post_id: like_count}."""
+    likes = PostLike.objects.filter(post=OuterRef('pk')).order_by().values('post')
+    posts = Post.objects.filter(pk__in=post_ids)
+    posts.update(like_count=Coalesce(
+        Subquery(likes.annotate(c=Count('*')).values('c'), output_field=IntegerField()), 0
+    ))
+    return {str(pk): count for pk, count in posts.values_list('pk', 'like_count')}
+
+
+def flush_likes(batch_size=FLUSH_BATCH_SIZE):
+    """Writes one batch of dirty posts; returns how many posts were flushed."""
+    store = get_store()
+    if store is None:
+        return 0
+    post_ids = store.dirty_posts(batch_size)
+    if not post_ids:
+        return 0
+
+    changes = {post_id: store.claim(post_id) for post_id in post_ids}
+    # Posts deleted meanwhile have nothing left to write
+    existing = {str(pk) for pk in Post.objects.filter(pk__in=post_ids).values_list('pk', flat=True)}
+
+    liked, unliked = [], Q()
+    for post_id, users in changes.items():
+        if post_id not in existing:
+            continue
+        liked += [PostLike(post_id=post_id, user_id=user_id) for user_id, value in users.items() if value]
+        removed = [user_id for user_id, value in users.items() if not value]
+        if removed:
+            unliked |= Q(post_id=post_id, user_id__in=removed)
+
+    with transaction.atomic():
+        PostLike.objects.bulk_create(liked, ignore_conflicts=True)
+        if unliked:
+            PostLike.objects.filter(unliked).delete()
+        counts = recount_likes(existing)
+
+    # The count keys restart from the recounted value (toggles only move them)
+    for post_id in post_ids:
+        store.finalize(post_id, counts.get(post_id))
+    return len(post_ids)
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from community.discovery_services import rebuild_discovery_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the CommunityDiscovery index (public communities, member counts, invite codes)."
+
+    def handle(self, *args, **options):
+        count = rebuild_discovery_index()
+        self.stdout.write(self.style.SUCCESS(f"Synced discovery for {count} community(ies)."))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0005_alter_community_category'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'created_at'], name='community_c_post_id_bea033_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['community', '-is_pinned', '-created_at'], name='community_p_communi_7bddc8_idx'),
+        ),
+    ]
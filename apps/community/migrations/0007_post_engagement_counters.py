@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:35
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_engagement_counters(apps, schema_editor):
+    Post = apps.get_model('community', 'Post')
+    Comment = apps.get_model('community', 'Comment')
+    PostLike = apps.get_model('community', 'PostLike')
+
+    def count(model):
+        rows = model.objects.filter(post=OuterRef('pk')).order_by().values('post')
+        return Coalesce(
+            Subquery(rows.annotate(c=Count('*')).values('c'), output_field=IntegerField()), 0
+        )
+
+    Post.objects.update(comment_count=count(Comment), like_count=count(PostLike))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_engagement_counters, migrations.RunPython.noop),
+    ]
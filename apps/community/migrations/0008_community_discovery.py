@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_discovery(apps, schema_editor):
+    Community = apps.get_model('community', 'Community')
+    CommunityDiscovery = apps.get_model('community', 'CommunityDiscovery')
+    CommunityInvitation = apps.get_model('community', 'CommunityInvitation')
+
+    invite_codes = {}
+    for community_id, code in CommunityInvitation.objects.filter(
+        invited_user__isnull=True, max_uses=0
+    ).order_by('-created_at').values_list('community_id', 'invite_code'):
+        invite_codes[community_id] = code  # oldest wins
+
+    CommunityDiscovery.objects.bulk_create(
+        [
+            CommunityDiscovery(
+                community_id=community.id,
+                category_id=community.category_id,
+                member_count=community.n,
+                invite_code=invite_codes.get(community.id, ''),
+                created_at=community.created_at,
+            )
+            for community in Community.objects.filter(visibility='public').annotate(n=Count('members'))
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0007_post_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommunityDiscovery',
+            fields=[
+                ('community', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='discovery', serialize=False, to='community.community')),
+                ('member_count', models.PositiveIntegerField(default=0)),
+                ('invite_code', models.CharField(blank=True, max_length=50)),
+                ('created_at', models.DateTimeField()),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='community.communitycategory')),
+            ],
+            options={
+                'db_table': 'community_discovery',
+                'indexes': [models.Index(fields=['-member_count', '-community'], name='community_d_member__6ce871_idx'), models.Index(fields=['-created_at', '-community'], name='community_d_created_422bfe_idx'), models.Index(fields=['category', '-member_count', '-community'], name='community_d_categor_206856_idx'), models.Index(fields=['category', '-created_at', '-community'], name='community_d_categor_06b2d3_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_discovery, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0008_community_discovery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='community',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+    ]
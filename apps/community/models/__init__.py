@@ -1,7 +1,7 @@
 from ..models.community import (
     Community, CommunityCategory,
     CommunityMember, CommunityInvitation,
-    CommunityChannel
+    CommunityChannel, CommunityDiscovery
 )
 
 from ..models.posts import (
@@ -50,6 +50,10 @@ class Community(models.Model):
         related_name='created_communities'
     )
 
+    # Incremented by writes to the community's members, posts and comments
+    # (community/signals.py); drives the ETag of the post list
+    version = models.PositiveBigIntegerField(default=1)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -85,6 +89,44 @@ class CommunityMember(models.Model):
     class Meta:
         unique_together = ('community', 'user')
 
+
+class CommunityDiscovery(models.Model):
+    """
+    Precomputed "discover communities" index.
+
+    One row per public community with what the listing needs (category,
+    member count, default public invite code), kept current by
+    community/signals.py (see discovery_services.py), so discovery is a single
+    indexed, paginated query without per-row COUNT(*) or invite lookups.
+    """
+
+    community = models.OneToOneField(
+        Community,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='discovery',
+    )
+    category = models.ForeignKey(
+        CommunityCategory,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    member_count = models.PositiveIntegerField(default=0)
+    invite_code = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'community_discovery'
+        indexes = [
+            models.Index(fields=['-member_count', '-community']),
+            models.Index(fields=['-created_at', '-community']),
+            models.Index(fields=['category', '-member_count', '-community']),
+            models.Index(fields=['category', '-created_at', '-community']),
+        ]
+
+    def __str__(self):
+        return f"{self.community_id} ({self.member_count})"
+
 class CommunityChannel(models.Model):
     CHANNEL_TYPES = (
         ('text', 'Text'),
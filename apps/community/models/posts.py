@@ -20,12 +20,19 @@ class Post(models.Model):
     
     # Simple pinned logic for "Announcements" in a workspace context
     is_pinned = models.BooleanField(default=False)
+
+    # Denormalized engagement counters (kept current by community/signals.py)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-is_pinned', '-created_at'] # Pinned posts first, then new ones
+        indexes = [
+            models.Index(fields=['community', '-is_pinned', '-created_at']),
+        ]
         verbose_name = "Community Post"
         verbose_name_plural = "Community Posts"
 
@@ -73,6 +80,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['created_at'] # Oldest first usually makes sense for reading flow
+        indexes = [
+            models.Index(fields=['post', 'created_at']),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.profile.username}"
@@ -0,0 +1,37 @@
+from src import acl_cache
+from community.models import CommunityMember
+
+
+def get_community_role(request, community_id, user_id=None):
+    """
+    Returns the role ('admin' / 'moderator' / 'member') of the user in the
+    community, or None if they are not a member.
+
+    Memoized on the request and backed by the shared ACL cache, the same way
+    workspace memberships are resolved (workspace.permissions.membership).
+    """
+    user_id = str(user_id or request.user.id)
+    community_id = str(community_id)
+
+    roles = getattr(request, 'community_roles', None)
+    if roles is None:
+        roles = {}
+        request.community_roles = roles
+
+    memo_key = (user_id, community_id)
+    if memo_key in roles:
+        return roles[memo_key]
+
+    key = acl_cache.acl_key('community', community_id, user_id)
+    cached = acl_cache.get_many([key])
+    if key in cached:
+        role = cached[key] or None
+    else:
+        role = CommunityMember.objects.filter(
+            community_id=community_id,
+            user_id=user_id,
+        ).values_list('role', flat=True).first()
+        acl_cache.set_many({key: role or acl_cache.NOT_A_MEMBER})
+
+    roles[memo_key] = role
+    return role
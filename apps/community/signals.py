@@ -0,0 +1,132 @@
+# community/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.db import transaction
+from src import acl_cache
+from . import timeline
+from .caches import category_cache
+from .models import Comment, Community, CommunityCategory, CommunityInvitation, CommunityMember, Post, PostLike
+from users.models import Profile
+from .counter_services import (
+    apply_post_counter_delta, bump_community_version, bump_member_communities_version,
+)
+from .discovery_services import (
+    apply_member_delta, is_default_invite, refresh_invite_code, sync_community,
+)
+
+
+# --- ACL CACHE INVALIDATION ---
+
+@receiver([post_save, post_delete], sender=CommunityMember)
+def invalidate_community_acl(sender, instance, **kwargs):
+    acl_cache.invalidate('community', instance.community_id, instance.user_id)
+
+
+# --- CATEGORY LIST ---
+
+@receiver([post_save, post_delete], sender=CommunityCategory)
+def invalidate_category_list(sender, instance, **kwargs):
+    category_cache.invalidate("all")
+
+
+# --- HOME TIMELINE ---
+
+@receiver(post_save, sender=CommunityMember)
+def rebuild_timeline_on_join(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: timeline.invalidate([instance.user_id], instance.community_id))
+
+
+@receiver(post_delete, sender=CommunityMember)
+def rebuild_timeline_on_leave(sender, instance, **kwargs):
+    transaction.on_commit(lambda: timeline.invalidate([instance.user_id], instance.community_id))
+
+
+# --- POST ENGAGEMENT COUNTERS ---
+
+def _deleted_with_parent(origin):
+    """True when the row is being removed by the cascade of a Post/Community delete."""
+    model = getattr(origin, 'model', type(origin))
+    return model in (Post, Community)
+
+
+@receiver(post_save, sender=PostLike)
+def count_like(sender, instance, created, **kwargs):
+    if created:
+        apply_post_counter_delta(instance.post_id, likes=1)
+
+
+@receiver(post_delete, sender=PostLike)
+def uncount_like(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        apply_post_counter_delta(instance.post_id, likes=-1)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        apply_post_counter_delta(instance.post_id, comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        apply_post_counter_delta(instance.post_id, comments=-1)
+
+
+# --- DISCOVERY INDEX ---
+
+@receiver(post_save, sender=Community)
+def sync_discovery_on_community_save(sender, instance, **kwargs):
+    sync_community(instance)
+
+
+@receiver(post_save, sender=CommunityMember)
+def count_member_on_join(sender, instance, created, **kwargs):
+    if created:
+        apply_member_delta(instance.community_id, 1)
+
+
+@receiver(post_delete, sender=CommunityMember)
+def count_member_on_leave(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        apply_member_delta(instance.community_id, -1)
+
+
+@receiver(post_save, sender=CommunityInvitation)
+def refresh_discovery_invite_on_create(sender, instance, created, **kwargs):
+    if created and is_default_invite(instance):
+        refresh_invite_code(instance.community_id)
+
+
+@receiver(post_delete, sender=CommunityInvitation)
+def refresh_discovery_invite_on_delete(sender, instance, origin=None, **kwargs):
+    if is_default_invite(instance) and not _deleted_with_parent(origin):
+        refresh_invite_code(instance.community_id)
+
+
+# --- VERSION COUNTER (ETags) ---
+
+@receiver(post_save, sender=Community)
+def bump_version_on_community_change(sender, instance, created, **kwargs):
+    if not created:
+        bump_community_version(instance.id)
+
+
+@receiver([post_save, post_delete], sender=CommunityMember)
+@receiver([post_save, post_delete], sender=Post)
+def bump_version(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        bump_community_version(instance.community_id)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def bump_version_on_comment_change(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        bump_community_version(instance.post.community_id)
+
+
+@receiver(post_save, sender=Profile)
+def bump_version_on_profile_change(sender, instance, created, **kwargs):
+    if not created:
+        bump_member_communities_version(instance.user_id)
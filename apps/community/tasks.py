@@ -0,0 +1,11 @@
+# community/tasks.py
+from celery import shared_task
+
+from .likes import flush_likes
+
+
+@shared_task(ignore_result=True)
+def flush_post_likes():
+    """Periodic write-behind of like toggles (CELERY_BEAT_SCHEDULE)."""
+    while flush_likes():
+        pass
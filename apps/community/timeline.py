@@ -0,0 +1,210 @@
+# community/timeline.py
+"""
+Home timeline: a per-user list of post ids, filled when a post is written.
+
+    fan_out_on_commit(post)  -> after commit, push the post into every member's timeline
+    invalidate(user_ids)     -> membership changed; the timeline is rebuilt on the next read
+    home_feed_queryset(user) -> posts for HomeActivityFeedView (keyset paginated by the view)
+
+A timeline is a sorted set (score = post timestamp) capped at
+HOME_TIMELINE_LENGTH entries:
+
+    RedisTimelineStore -> ZADD / ZREVRANGE on the django-redis connection
+
+Timelines need a store every worker shares: without the django-redis cache
+(e.g. per-worker LocMem) nothing is fanned out and the home feed is read
+from the member's communities directly (fan-out-on-read).
+
+Communities with HOME_TIMELINE_FANOUT_LIMIT members or more are not fanned out
+(one post would cost that many writes); their posts are read at request time
+instead (fan-out-on-read) and merged into the same queryset.
+"""
+import logging
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import CommunityMember, Post
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_TTL = 60 * 60 * 24 * 7
+MEMBER_COUNT_TTL = 60 * 5
+FANOUT_CHUNK_SIZE = 500
+
+# Redis timelines keep this member at rank 0 so that an empty timeline still exists
+_SENTINEL = "-"
+
+
+def timeline_key(user_id):
+    return f"community:timeline:{user_id}"
+
+
+def member_count_key(community_id):
+    return f"community:member_count:{community_id}"
+
+
+def timeline_length():
+    return getattr(settings, "HOME_TIMELINE_LENGTH", 500)
+
+
+def fanout_limit():
+    return getattr(settings, "HOME_TIMELINE_FANOUT_LIMIT", 5000)
+
+
+def _score(created_at):
+    return created_at.timestamp()
+
+
+class RedisTimelineStore:
+    def __init__(self, client):
+        self.client = client
+
+    def read(self, user_id):
+        """[(post_id, score)] newest first, or None when the timeline is not built."""
+        entries = self.client.zrevrange(timeline_key(user_id), 0, -1, withscores=True)
+        if not entries:
+            return None
+        self.client.expire(timeline_key(user_id), TIMELINE_TTL)
+        return [(member.decode(), score) for member, score in entries if member.decode() != _SENTINEL]
+
+    def replace(self, user_id, entries):
+        key = timeline_key(user_id)
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        pipe.zadd(key, {_SENTINEL: float("-inf"), **dict(entries)})
+        pipe.expire(key, TIMELINE_TTL)
+        pipe.execute()
+
+    def add(self, user_ids, post_id, score):
+        """Adds to the timelines that exist; unbuilt ones pick the post up on rebuild."""
+        keys = [timeline_key(user_id) for user_id in user_ids]
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(key)
+        existing = [key for key, exists in zip(keys, pipe.execute()) if exists]
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in existing:
+            pipe.zadd(key, {post_id: score})
+            # Rank 0 is the sentinel; drop everything past the newest N
+            pipe.zremrangebyrank(key, 1, -(timeline_length() + 1))
+        pipe.execute()
+
+    def delete(self, user_ids):
+        keys = [timeline_key(user_id) for user_id in user_ids]
+        if keys:
+            self.client.delete(*keys)
+
+
+def get_store():
+    """The shared timeline store, or None: the home feed is then read on request."""
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        from django_redis import get_redis_connection
+        return RedisTimelineStore(get_redis_connection("default"))
+    return None
+
+
+# --- COMMUNITY SIZE ---
+
+def large_community_ids(community_ids):
+    """The communities (of `community_ids`) too large to fan out; counts are cached briefly."""
+    keys = {member_count_key(community_id): community_id for community_id in community_ids}
+    counts = {keys[key]: count for key, count in cache.get_many(keys).items()}
+
+    missing = [community_id for community_id in community_ids if community_id not in counts]
+    if missing:
+        fresh = dict(
+            CommunityMember.objects.filter(community_id__in=missing)
+            .values("community_id").annotate(n=Count("id")).values_list("community_id", "n")
+        )
+        fresh = {community_id: fresh.get(community_id, 0) for community_id in missing}
+        cache.set_many({member_count_key(c): n for c, n in fresh.items()}, MEMBER_COUNT_TTL)
+        counts.update(fresh)
+
+    return {community_id for community_id, count in counts.items() if count >= fanout_limit()}
+
+
+# --- WRITE PATH ---
+
+def fan_out_post(post):
+    store = get_store()
+    if store is None or post.community_id in large_community_ids([post.community_id]):
+        return
+
+    post_id, score = str(post.id), _score(post.created_at)
+    member_ids = CommunityMember.objects.filter(community_id=post.community_id)\
+        .values_list("user_id", flat=True)
+
+    chunk = []
+    for user_id in member_ids.iterator(chunk_size=FANOUT_CHUNK_SIZE):
+        chunk.append(user_id)
+        if len(chunk) >= FANOUT_CHUNK_SIZE:
+            store.add(chunk, post_id, score)
+            chunk = []
+    if chunk:
+        store.add(chunk, post_id, score)
+
+
+def fan_out_on_commit(post):
+    def fan_out():
+        try:
+            fan_out_post(post)
+        except Exception:
+            # Best effort: the post is still served once the timeline is rebuilt
+            logger.exception("Could not fan out post %s", post.id)
+            get_store().delete(
+                CommunityMember.objects.filter(community_id=post.community_id).values_list("user_id", flat=True)
+            )
+
+    if get_store() is not None:
+        transaction.on_commit(fan_out)
+
+
+def invalidate(user_ids, community_id=None):
+    """Drops the timelines (rebuilt lazily) and the cached size of `community_id`."""
+    store = get_store()
+    if store is not None:
+        store.delete(list(user_ids))
+    if community_id is not None:
+        cache.delete(member_count_key(community_id))
+
+
+# --- READ PATH ---
+
+def rebuild(store, user_id, community_ids):
+    """Fills the timeline from the database (the fan-out-on-read query, run once)."""
+    rows = Post.objects.filter(community_id__in=community_ids)\
+        .order_by("-created_at", "-id").values_list("id", "created_at")[: timeline_length()]
+    entries = [(str(post_id), _score(created_at)) for post_id, created_at in rows]
+    store.replace(user_id, entries)
+    return entries
+
+
+def home_feed_queryset(user):
+    community_ids = list(
+        CommunityMember.objects.filter(user=user).values_list("community_id", flat=True)
+    )
+    store = get_store()
+    if store is None:
+        # No shared timelines: fan-out-on-read
+        return Post.objects.filter(community_id__in=community_ids)
+
+    large = large_community_ids(community_ids)
+    entries = store.read(user.id)
+    if entries is None:
+        entries = rebuild(store, user.id, [c for c in community_ids if c not in large])
+
+    feed = Q(id__in=[post_id for post_id, _ in entries])
+    if large:
+        feed |= Q(community_id__in=large)
+    if len(entries) >= timeline_length():
+        # Older posts were trimmed off the capped timeline: read them directly
+        oldest = datetime.fromtimestamp(entries[-1][1], tz=timezone.utc)
+        feed |= Q(created_at__lte=oldest)
+
+    # Membership is re-checked so a stale timeline never leaks a left community
+    return Post.objects.filter(feed, community_id__in=community_ids)
@@ -4,7 +4,8 @@ from rest_framework.routers import DefaultRouter
 from ..views.views import (
     NotificationListView, 
     MarkNotificationReadView, 
-    MarkAllReadView
+    MarkAllReadView,
+    UnreadCountView,
 )
 
 urlpatterns = [
@@ -16,4 +17,7 @@ urlpatterns = [
 
     # POST: Mark ALL notifications as read (e.g., "Mark all as read" button)
     path('mark-all-read/', MarkAllReadView.as_view(), name='mark-all-notifications-read'),
+
+    # GET: Unread badge count
+    path('unread-count/', UnreadCountView.as_view(), name='notification-unread-count'),
 ]
\ No newline at end of file
@@ -2,7 +2,7 @@
 from rest_framework import serializers
 from notifications.models import Notification
 from rest_framework import serializers
-from users.api.serializers.user_serializers import UserSerializer
+from users.api.serializers.user_serializers import UserSerializer, UserCardListSerializer
 
 class NotificationSerializer(serializers.ModelSerializer):
     actor = UserSerializer(read_only=True)
@@ -13,6 +13,7 @@ class NotificationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Notification
+        list_serializer_class = UserCardListSerializer
         fields = [
             'id', 
             'actor', 
@@ -22,6 +23,8 @@ class NotificationSerializer(serializers.ModelSerializer):
             'type', 
             'is_read', 
             'created_at',
+            'updated_at',
+            'event_count', # > 1 when a burst of events was merged into this row
             'target_type', # e.g., "task", "project", "comment"
             'target_id',   # Use this ID to link to the page (e.g. /tasks/{id})
         ]
\ No newline at end of file
@@ -12,29 +12,33 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from notifications.models import Notification
 from notifications.api import NotificationSerializer
+from notifications import unread_counter
 
 class NotificationListView(generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    # Unread first, then latest activity: a row that merged a new event
+    # (updated_at) moves back up (id breaks ties for the cursor)
+    cursor_ordering = ('is_read', '-updated_at', '-id')
 
     def get_queryset(self):
-        # Return unread first, then newest
-        return Notification.objects.filter(recipient=self.request.user).order_by('is_read', '-created_at')
+        return Notification.objects.filter(recipient=self.request.user)
 
 class MarkNotificationReadView(views.APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        try:
-            # Ensure user can only mark THEIR OWN notifications
-            notification = Notification.objects.get(pk=pk, recipient=request.user)
-            notification.is_read = True
-            notification.read_at = timezone.now()
-            notification.save()
-            return Response({"status": "marked as read"})
-        except Notification.DoesNotExist:
+        # Ensure user can only mark THEIR OWN notifications
+        notifications = Notification.objects.filter(pk=pk, recipient=request.user)
+
+        # Only an unread -> read transition moves the badge counter
+        if notifications.filter(is_read=False).update(is_read=True, read_at=timezone.now()):
+            unread_counter.count_read(request.user.id)
+        elif not notifications.exists():
             return Response({"error": "Notification not found"}, status=404)
 
+        return Response({"status": "marked as read"})
+
 class MarkAllReadView(views.APIView):
     permission_classes = [IsAuthenticated]
 
@@ -43,4 +47,13 @@ class MarkAllReadView(views.APIView):
             is_read=True, 
             read_at=timezone.now()
         )
-        return Response({"status": "all marked as read"})
\ No newline at end of file
+        unread_counter.reset(request.user.id)
+        return Response({"status": "all marked as read"})
+
+
+class UnreadCountView(views.APIView):
+    """Badge endpoint: served from the per-user counter, no list fetch."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({"unread_count": unread_counter.get_unread_count(request.user.id)})
\ No newline at end of file
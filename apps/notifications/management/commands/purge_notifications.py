@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from notifications.retention import DEFAULT_BATCH_SIZE, purge_notifications
+
+
+class Command(BaseCommand):
+    help = "Deletes read/unread notifications past their retention period, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--read-days", type=int, help="Retention for read notifications.")
+        parser.add_argument("--unread-days", type=int, help="Retention for unread notifications.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+
+    def handle(self, *args, **options):
+        metrics = purge_notifications(
+            read_days=options["read_days"],
+            unread_days=options["unread_days"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+
+        verb = "Would purge" if metrics["dry_run"] else "Purged"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {metrics['read_purged']} read and {metrics['unread_purged']} unread notification(s) "
+            f"(read > {metrics['read_days']}d, unread > {metrics['unread_days']}d, "
+            f"{metrics['batches']} batch(es), {metrics['duration_seconds']}s)."
+        ))
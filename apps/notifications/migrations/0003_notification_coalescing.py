@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:28
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    # AddField stamps every existing row with the migration time; the inbox
+    # orders by updated_at, so start them from their creation time
+    Notification = apps.get_model('notifications', 'Notification')
+    Notification.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0002_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='coalesce_key',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='event_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'coalesce_key', 'is_read'], name='notificatio_recipie_6d1579_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0003_notification_coalescing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', 'created_at'], name='notificatio_is_read_3a06ff_idx'),
+        ),
+    ]
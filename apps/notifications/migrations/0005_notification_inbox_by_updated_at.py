@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0004_notification_retention_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_recipie_684eac_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', '-updated_at'], name='notificatio_recipie_39c959_idx'),
+        ),
+    ]
@@ -44,10 +44,18 @@ class Notification(models.Model):
     read_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Coalescing: a burst of events about one project/task updates a single row
+    coalesce_key = models.CharField(max_length=100, blank=True, default='')
+    event_count = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient', 'is_read']), # Optimize "Unread" queries
+            # Unread counts + the inbox order (unread first, latest activity first)
+            models.Index(fields=['recipient', 'is_read', '-updated_at']),
+            models.Index(fields=['recipient', 'coalesce_key', 'is_read']),
+            models.Index(fields=['is_read', 'created_at']), # Retention purge
         ]
 
     def __str__(self):
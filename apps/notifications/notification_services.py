@@ -1,17 +1,67 @@
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from .models import Notification
+from .realtime import publish_on_commit
+from . import unread_counter
+
+logger = logging.getLogger(__name__)
+
+FANOUT_CHUNK_SIZE = 500
+
+
+def coalesce_key(category, coalesce_on):
+    """Events of one category about the same project/task share a row."""
+    return f"{category}:{coalesce_on.pk}" if coalesce_on is not None else ""
+
+
+def audience_user_ids(audience):
+    """
+    Recipients described as data, so a worker can resolve them later:
+        {"model": "workspace.WorkspaceMember", "filters": {"workspace_id": "..."}}
+    Optional "user_field" (default "user_id") and "exclude_user_id".
+    """
+    model = apps.get_model(audience["model"])
+    user_field = audience.get("user_field", "user_id")
+    user_ids = model.objects.filter(**audience["filters"]).values_list(user_field, flat=True)
+    if audience.get("exclude_user_id"):
+        user_ids = user_ids.exclude(**{user_field: audience["exclude_user_id"]})
+    return user_ids.order_by()
+
 
 class NotificationService:
     
     @staticmethod
-    def send_notification(recipient, actor, title, message, target_obj, category='system_alert', type='info'):
+    def send_notification(recipient, actor, title, message, target_obj, category='system_alert', type='info',
+                          coalesce_on=None):
         """
         Sends a single notification to one user.
+        coalesce_on: project/task to merge bursts into one row (see _merge_into_recent).
         """
         # 1. Safety Check: Don't notify users of their own actions
         if recipient == actor:
             return None 
 
+        if coalesce_on is not None:
+            return NotificationService._deliver([
+                Notification(
+                    recipient=recipient,
+                    actor=actor,
+                    title=title,
+                    message=message,
+                    target=target_obj,
+                    category=category,
+                    type=type,
+                    coalesce_key=coalesce_key(category, coalesce_on),
+                )
+            ])[0]
+
         # 2. Create the Notification
         notification = Notification.objects.create(
             recipient=recipient,
@@ -23,18 +73,34 @@ class NotificationService:
             type=type
         )
 
+        # 3. Badge counter + push to the recipient's open WebSocket (after commit)
+        unread_counter.count_new([notification])
+        publish_on_commit([notification])
+
         # --- FUTURE PROOFING ---
-        # This is where you would add:
-        # send_websocket_event(recipient.id, notification) 
         # send_email_alert(recipient.email, title, message)
         
         return notification
 
     @staticmethod
-    def send_bulk_notification(recipients, actor, title, message, target_obj, category='system_alert'):
+    def send_bulk_notification(recipients=None, actor=None, title='', message='', target_obj=None,
+                               category='system_alert', audience=None, coalesce_on=None):
         """
         Efficiently creates notifications for multiple users (e.g. whole team).
+
+        recipients: a small, already loaded list of users -> written right away.
+        audience:   a recipient query (see audience_user_ids) -> fanned out by a
+                    Celery job after the transaction commits, so large teams do
+                    not hold the request. Runs inline when CELERY_TASK_ALWAYS_EAGER
+                    or without a CELERY_BROKER_URL.
+        coalesce_on: project/task; repeated events about it within
+                    NOTIFICATION_COALESCE_WINDOW update the recipient's unread row
+                    (event_count + 1, latest actor) instead of adding one.
         """
+        key = coalesce_key(category, coalesce_on)
+        if audience is not None:
+            return NotificationService._enqueue_fan_out(audience, actor, title, message, target_obj, category, key)
+
         # Filter out the actor so they don't get notified
         valid_recipients = [u for u in recipients if u != actor]
         
@@ -52,9 +118,116 @@ class NotificationService:
                 message=message,
                 content_type=content_type,
                 object_id=target_obj.id,
-                category=category
+                category=category,
+                coalesce_key=key,
             ) for user in valid_recipients
         ]
         
         # bulk_create is much faster than looping .create()
-        return Notification.objects.bulk_create(notifications)
\ No newline at end of file
+        return NotificationService._deliver(notifications)
+
+    @staticmethod
+    def _enqueue_fan_out(audience, actor, title, message, target_obj, category, key=""):
+        audience = {**audience, "exclude_user_id": str(actor.pk) if actor else None}
+        payload = {
+            "actor_id": str(actor.pk) if actor else None,
+            "title": title,
+            "message": message,
+            "content_type_id": ContentType.objects.get_for_model(target_obj).id,
+            "object_id": str(target_obj.pk),
+            "category": category,
+            "coalesce_key": key,
+        }
+
+        if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False) or not getattr(settings, "CELERY_BROKER_URL", ""):
+            # Synchronous mode (tests / no broker): same transaction as the caller
+            return NotificationService.fan_out(audience, payload)
+
+        from .tasks import fan_out_notifications
+
+        def enqueue():
+            try:
+                fan_out_notifications.delay(audience, payload)
+            except Exception:
+                # The data is committed already: deliver now rather than lose the notifications
+                logger.exception("Could not enqueue notification fan-out, sending inline")
+                NotificationService.fan_out(audience, payload)
+
+        transaction.on_commit(enqueue, robust=True)
+        return None
+
+    @staticmethod
+    def fan_out(audience, payload, progress=None):
+        """
+        Streams the audience and writes its notifications in chunks.
+        `progress(sent, total)` is called after every chunk. Returns the number sent.
+        """
+        user_ids = audience_user_ids(audience)
+        total = user_ids.count()
+        sent = 0
+        chunk = []
+
+        for user_id in user_ids.iterator(chunk_size=FANOUT_CHUNK_SIZE):
+            chunk.append(Notification(recipient_id=user_id, **payload))
+            if len(chunk) >= FANOUT_CHUNK_SIZE:
+                NotificationService._deliver(chunk)
+                sent += len(chunk)
+                chunk = []
+                if progress:
+                    progress(sent, total)
+
+        if chunk:
+            NotificationService._deliver(chunk)
+            sent += len(chunk)
+            if progress:
+                progress(sent, total)
+
+        return sent
+
+    @staticmethod
+    def _deliver(notifications):
+        """bulk_create (or merge) + badge counters + realtime push (both after commit)."""
+        merged = []
+        if notifications and notifications[0].coalesce_key:
+            merged = NotificationService._merge_into_recent(notifications)
+            merged_recipients = {n.recipient_id for n in merged}
+            notifications = [n for n in notifications if n.recipient_id not in merged_recipients]
+
+        created = Notification.objects.bulk_create(notifications) if notifications else []
+        # Merged rows were already unread -> only new rows move the badge
+        unread_counter.count_new(created)
+        publish_on_commit(created + merged)
+        return created + merged
+
+    @staticmethod
+    def _merge_into_recent(notifications):
+        """
+        One UPDATE folds the event into each recipient's unread row with the same
+        coalesce_key created within the window (anchored to created_at, so a
+        steady stream still starts a new row every window). Returns the merged rows.
+        """
+        sample = notifications[0]
+        now = timezone.now()
+        window = getattr(settings, "NOTIFICATION_COALESCE_WINDOW", 60 * 10)
+
+        ids = list(
+            Notification.objects.filter(
+                recipient_id__in=[n.recipient_id for n in notifications],
+                coalesce_key=sample.coalesce_key,
+                is_read=False,
+                created_at__gte=now - timedelta(seconds=window),
+            ).values_list("pk", flat=True)
+        )
+        if not ids:
+            return []
+
+        Notification.objects.filter(pk__in=ids).update(
+            event_count=F("event_count") + 1,
+            actor_id=sample.actor_id,
+            title=sample.title,
+            message=sample.message,
+            content_type_id=sample.content_type_id,
+            object_id=sample.object_id,
+            updated_at=now,
+        )
+        return list(Notification.objects.filter(pk__in=ids))
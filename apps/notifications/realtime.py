@@ -0,0 +1,134 @@
+# notifications/realtime.py
+"""
+Push channel for new notifications.
+
+NotificationService publishes every notification (after commit) to the
+recipient's channel; the WebSocket endpoint in src/asgi.py subscribes to it.
+
+    RedisBroker    -> Redis pub/sub, shared by every worker process (production)
+    InMemoryBroker -> single process only (tests, local runs without Redis)
+
+The broker is chosen by NOTIFICATIONS_BROKER_URL (a redis:// URL, or empty).
+"""
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def channel_name(user_id):
+    return f"notifications:{user_id}"
+
+
+def notification_payload(notification):
+    """Small, query-free representation (clients fetch details from the REST API)."""
+    return {
+        "event": "notification",
+        "notification": {
+            "id": str(notification.id),
+            "actor_id": str(notification.actor_id) if notification.actor_id else None,
+            "title": notification.title,
+            "message": notification.message,
+            "category": notification.category,
+            "type": notification.type,
+            "is_read": notification.is_read,
+            "event_count": notification.event_count,
+            "created_at": notification.created_at.isoformat() if notification.created_at else None,
+            "target_id": str(notification.object_id),
+        },
+    }
+
+
+class InMemoryBroker:
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(str(user_id), ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        """Yields an async iterator of raw JSON messages for one user."""
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(str(user_id), set()).add(entry)
+
+        async def messages():
+            while True:
+                yield await entry[1].get()
+
+        try:
+            yield messages()
+        finally:
+            with self._lock:
+                self._subscribers.get(str(user_id), set()).discard(entry)
+
+
+class RedisBroker:
+    def __init__(self, url):
+        import redis
+
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, user_id, message):
+        self._client.publish(channel_name(user_id), json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel_name(user_id))
+
+        async def messages():
+            async for item in pubsub.listen():
+                data = item["data"]
+                yield data.decode() if isinstance(data, bytes) else data
+
+        try:
+            yield messages()
+        finally:
+            await pubsub.unsubscribe(channel_name(user_id))
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        url = getattr(settings, "NOTIFICATIONS_BROKER_URL", None)
+        _broker = RedisBroker(url) if url else InMemoryBroker()
+    return _broker
+
+
+def publish_on_commit(notifications):
+    """Pushes the notifications once they are committed (never for rolled back rows)."""
+    messages = [(n.recipient_id, notification_payload(n)) for n in notifications]
+    if not messages:
+        return
+
+    def publish():
+        broker = get_broker()
+        for user_id, message in messages:
+            try:
+                broker.publish(user_id, message)
+            except Exception:
+                # Push is best effort: clients still see the row on the next fetch
+                logger.exception("Could not publish notification to %s", user_id)
+
+    transaction.on_commit(publish)
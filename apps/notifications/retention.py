@@ -0,0 +1,74 @@
+# notifications/retention.py
+"""
+Retention policy for the Notification table.
+
+    read   notifications older than NOTIFICATION_RETENTION_READ_DAYS   -> deleted
+    unread notifications older than NOTIFICATION_RETENTION_UNREAD_DAYS -> deleted
+
+Rows are removed in primary-key batches, each in its own short transaction,
+so the job never holds long locks. Runs daily from Celery beat
+(notifications.tasks.purge_old_notifications) or via
+`manage.py purge_notifications [--dry-run]`.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification
+from . import unread_counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def expired_notifications(read_days, unread_days, now=None):
+    now = now or timezone.now()
+    return {
+        "read": Notification.objects.filter(is_read=True, created_at__lt=now - timedelta(days=read_days)),
+        "unread": Notification.objects.filter(is_read=False, created_at__lt=now - timedelta(days=unread_days)),
+    }
+
+
+def _purge_batches(queryset, batch_size, invalidate_counters):
+    purged = batches = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by().values_list("pk", "recipient_id")[:batch_size])
+            if not rows:
+                break
+            Notification.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+
+        if invalidate_counters:
+            # Deleted unread rows change the badge of their recipients
+            unread_counter.invalidate({recipient_id for _, recipient_id in rows})
+
+        purged += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+    return purged, batches
+
+
+def purge_notifications(read_days=None, unread_days=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Applies the retention policy. Returns the run metrics."""
+    read_days = read_days or getattr(settings, "NOTIFICATION_RETENTION_READ_DAYS", 30)
+    unread_days = unread_days or getattr(settings, "NOTIFICATION_RETENTION_UNREAD_DAYS", 90)
+    started = time.monotonic()
+
+    metrics = {"dry_run": dry_run, "read_days": read_days, "unread_days": unread_days, "batches": 0}
+    for state, queryset in expired_notifications(read_days, unread_days).items():
+        if dry_run:
+            metrics[f"{state}_purged"] = queryset.count()
+            continue
+        purged, batches = _purge_batches(queryset, batch_size, invalidate_counters=state == "unread")
+        metrics[f"{state}_purged"] = purged
+        metrics["batches"] += batches
+
+    metrics["duration_seconds"] = round(time.monotonic() - started, 3)
+    logger.info("Notification retention run: %s", metrics)
+    return metrics
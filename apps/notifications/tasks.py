@@ -0,0 +1,24 @@
+# notifications/tasks.py
+from celery import shared_task
+
+from .notification_services import NotificationService
+
+
+@shared_task(bind=True)
+def fan_out_notifications(self, audience, payload):
+    """Background fan-out for NotificationService.send_bulk_notification(audience=...)."""
+
+    def progress(sent, total):
+        if self.request.id:
+            self.update_state(state="PROGRESS", meta={"sent": sent, "total": total})
+
+    sent = NotificationService.fan_out(audience, payload, progress=progress)
+    return {"sent": sent}
+
+
+@shared_task
+def purge_old_notifications():
+    """Daily retention run (CELERY_BEAT_SCHEDULE); the metrics are the task result."""
+    from .retention import purge_notifications
+
+    return purge_notifications()
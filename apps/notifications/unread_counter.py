@@ -0,0 +1,91 @@
+# notifications/unread_counter.py
+"""
+Per-user unread counter for the notification badge.
+
+The count lives in the cache and is adjusted by the write paths (incr on new
+notifications, decr/reset when marked read). A missing key is rebuilt lazily
+from an indexed COUNT (recipient, is_read). A notification committed between
+that COUNT and the rebuilt key is missed; the short TTL heals such drift
+within minutes.
+
+Only a cache shared by every worker (django-redis) can be adjusted like this:
+with a per-process cache (LocMem) the other workers would keep their own
+stale copy. The counter is then not cached and every read is the indexed
+COUNT (UNREAD_COUNT_CACHE_ENABLED overrides).
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Notification
+
+UNREAD_COUNT_TIMEOUT = 60 * 5
+
+
+def enabled():
+    setting = getattr(settings, "UNREAD_COUNT_CACHE_ENABLED", None)
+    if setting is not None:
+        return setting
+    return settings.CACHES["default"]["BACKEND"].startswith("django_redis")
+
+
+def _key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def _count(user_id):
+    return Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+
+
+def get_unread_count(user_id):
+    if not enabled():
+        return _count(user_id)
+    count = cache.get(_key(user_id))
+    if count is None:
+        count = _count(user_id)
+        cache.add(_key(user_id), count, timeout=UNREAD_COUNT_TIMEOUT)
+    return count
+
+
+def _incr(user_id, amount):
+    try:
+        cache.incr(_key(user_id), amount)
+    except ValueError:
+        # Not cached -> the next read counts from the DB anyway
+        pass
+
+
+def count_new(notifications):
+    """+1 per new unread notification and recipient, once the rows are committed."""
+    per_user = Counter(n.recipient_id for n in notifications if not n.is_read)
+    if per_user and enabled():
+        transaction.on_commit(lambda: [_incr(user_id, amount) for user_id, amount in per_user.items()])
+
+
+def count_read(user_id, amount=1):
+    if not enabled():
+        return
+
+    def apply():
+        try:
+            if cache.decr(_key(user_id), amount) < 0:
+                cache.delete(_key(user_id))
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
+
+
+def reset(user_id):
+    if not enabled():
+        return
+    transaction.on_commit(lambda: cache.set(_key(user_id), 0, timeout=UNREAD_COUNT_TIMEOUT))
+
+
+def invalidate(user_ids):
+    """Drop counters that can no longer be adjusted precisely (e.g. bulk deletes)."""
+    if not enabled():
+        return
+    cache.delete_many([_key(user_id) for user_id in user_ids])
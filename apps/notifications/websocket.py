@@ -0,0 +1,62 @@
+# notifications/websocket.py
+"""
+Raw ASGI WebSocket endpoint: ws(s)://<host>/ws/notifications/?token=<access token>
+
+Authenticates with a SimpleJWT access token (browsers cannot set headers on a
+WebSocket handshake, hence the query string), then forwards every message of
+the user's realtime channel as a text frame.
+"""
+import asyncio
+from urllib.parse import parse_qs
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .realtime import get_broker
+
+WEBSOCKET_PATH = "/ws/notifications/"
+CLOSE_UNAUTHORIZED = 4401
+
+
+def authenticate(scope):
+    """User id from the ?token= access token, or None."""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    token = (query.get("token") or [None])[0]
+    if not token:
+        return None
+    try:
+        return AccessToken(token).get(api_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+async def notifications_websocket(scope, receive, send):
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+
+    user_id = authenticate(scope)
+    if user_id is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    async with get_broker().subscribe(user_id) as messages:
+        await send({"type": "websocket.accept"})
+
+        async def forward():
+            async for text in messages:
+                await send({"type": "websocket.send", "text": text})
+
+        async def wait_for_disconnect():
+            while True:
+                event = await receive()
+                if event["type"] == "websocket.disconnect":
+                    return
+
+        tasks = [asyncio.ensure_future(forward()), asyncio.ensure_future(wait_for_disconnect())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
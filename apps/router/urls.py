@@ -5,6 +5,7 @@ from apps.workspace.api.routes import workspace_urls, project_urls
 from apps.community.api.routes import community_urls, posts_urls
 from apps.users.api.routes import auth_urls, user_urls, settings_urls
 from apps.notifications.api.routes import urls as notifications_url
+from apps.search.api.routes import urls as search_url
 
 urlpatterns = [
     # auth urls
@@ -23,6 +24,7 @@ urlpatterns = [
 
     path('settings/', include(settings_urls)),
     path('notifications/', include(notifications_url)),
+    path('search/', include(search_url)),
     path('user/', include(user_urls)),
 
 ]
\ No newline at end of file
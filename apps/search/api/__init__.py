@@ -0,0 +1 @@
+from .serializers.serializers import SearchResultSerializer
@@ -0,0 +1,8 @@
+# search/api/routes/urls.py
+from django.urls import path
+from ..views.views import SearchView
+
+urlpatterns = [
+    # GET: ?q=<terms> (&kind=task,project,task_comment,post,post_comment)
+    path('', SearchView.as_view(), name='search'),
+]
@@ -0,0 +1,29 @@
+# search/api/serializers/serializers.py
+from rest_framework import serializers
+from search.models import SearchDocument
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source='object_id', read_only=True)
+    workspace_id = serializers.SerializerMethodField()
+    # Annotated by the search backend
+    rank = serializers.FloatField(read_only=True)
+    highlight = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = SearchDocument
+        fields = [
+            'kind',         # task, project, task_comment, post, post_comment
+            'id',           # id of the matched object
+            'parent_id',    # task of a task comment / post of a post comment
+            'title',
+            'highlight',    # matched text with <mark>...</mark> around the terms
+            'rank',
+            'workspace_id',
+            'project_id',
+            'community_id',
+            'created_at',
+        ]
+
+    def get_workspace_id(self, obj):
+        return obj.project.workspace_id if obj.project_id else None
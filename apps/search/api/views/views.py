@@ -0,0 +1,40 @@
+# search/api/views/views.py
+from django.db.models import Exists, OuterRef
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+
+from community.models import CommunityMember
+from workspace.models import ProjectAccess
+from search.backends import get_backend
+from search.models import SearchDocument
+from search.api import SearchResultSerializer
+
+
+def visible_documents(user):
+    """Documents of projects the user can see (ProjectAccess) and communities they belong to."""
+    projects = ProjectAccess.objects.filter(user=user, project_id=OuterRef('project_id'))
+    communities = CommunityMember.objects.filter(user=user, community_id=OuterRef('community_id'))
+    return SearchDocument.objects.filter(Exists(projects) | Exists(communities))
+
+
+class SearchView(generics.ListAPIView):
+    """
+    ENDPOINT: /api/v1/search/?q=<terms>&kind=task,post
+    USAGE: Ranked full-text search over everything the user can see.
+    """
+    serializer_class = SearchResultSerializer
+    permission_classes = [IsAuthenticated]
+    # Best match first (id breaks ties for the cursor)
+    cursor_ordering = ('-rank', '-id')
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({"q": "A search query is required."})
+
+        documents = visible_documents(self.request.user).select_related('project')
+        kinds = [kind for kind in self.request.query_params.get('kind', '').split(',') if kind]
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        return get_backend().search(documents, query)
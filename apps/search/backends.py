@@ -0,0 +1,91 @@
+# search/backends.py
+"""
+Full-text matching, ranking and highlighting of SearchDocument querysets.
+
+    PostgresBackend -> `search_vector @@ websearch_to_tsquery(...)`, ts_rank_cd, ts_headline
+    SqliteBackend   -> FTS5 MATCH, bm25, snippet (tests / local runs)
+
+`search(queryset, query)` filters to the matching documents and annotates
+`rank` (higher is better) and `highlight` (matched terms wrapped in <mark>).
+The databases return the raw document text, so they mark the terms with
+sentinel characters instead; HighlightField escapes the text and only then
+turns the sentinels into <mark> tags.
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import BooleanField, FloatField, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+# Private-use code points: never produced by escape(), so safe to swap after it
+SENTINEL_START, SENTINEL_STOP = "\ue000", "\ue001"
+
+
+class HighlightField(TextField):
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return escape(value).replace(SENTINEL_START, HIGHLIGHT_START).replace(SENTINEL_STOP, HIGHLIGHT_STOP)
+
+
+class PostgresBackend:
+    config = "english"
+
+    def search(self, queryset, query):
+        tsquery = f"websearch_to_tsquery('{self.config}', %s)"
+        options = f"StartSel={SENTINEL_START}, StopSel={SENTINEL_STOP}, MaxFragments=2, MaxWords=30, MinWords=10"
+        return queryset.filter(
+            RawSQL(f"search_document.search_vector @@ {tsquery}", [query], output_field=BooleanField())
+        ).annotate(
+            # float8 so the value round-trips exactly through the pagination cursor
+            rank=RawSQL(
+                f"ts_rank_cd(search_document.search_vector, {tsquery})::float8",
+                [query], output_field=FloatField(),
+            ),
+            highlight=RawSQL(
+                f"ts_headline('{self.config}', search_document.title || ' ' || search_document.body, {tsquery}, %s)",
+                [query, options], output_field=HighlightField(),
+            ),
+        )
+
+
+class SqliteBackend:
+    def match_expression(self, query):
+        """User input as an FTS5 query: every word must match (no operators)."""
+        return " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+
+        def per_row(column):
+            return (
+                f"(SELECT {column} FROM search_document_fts "
+                f"WHERE search_document_fts MATCH %s AND rowid = search_document.id)"
+            )
+
+        return queryset.filter(
+            RawSQL(
+                "search_document.id IN (SELECT rowid FROM search_document_fts WHERE search_document_fts MATCH %s)",
+                [match], output_field=BooleanField(),
+            )
+        ).annotate(
+            # bm25 is lower-is-better; title matches weigh double
+            rank=RawSQL(per_row("-bm25(search_document_fts, 2.0, 1.0)"), [match], output_field=FloatField()),
+            highlight=RawSQL(
+                per_row("snippet(search_document_fts, -1, %s, %s, '…', 24)"),
+                [SENTINEL_START, SENTINEL_STOP, match], output_field=HighlightField(),
+            ),
+        )
+
+
+def get_backend():
+    if connection.vendor == "postgresql":
+        return PostgresBackend()
+    if connection.vendor == "sqlite":
+        return SqliteBackend()
+    raise ImproperlyConfigured(f"Search has no backend for {connection.vendor}.")
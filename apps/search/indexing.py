@@ -0,0 +1,103 @@
+# search/indexing.py
+"""
+Writes SearchDocument rows for the indexed models.
+
+    index_object(instance)   -> insert/refresh the row of one object (on save)
+    remove_object(instance)  -> drop it, plus its comments' rows for tasks/posts
+    rebuild_search_index()   -> full rebuild (management command / repair)
+"""
+from django.db import transaction
+
+from community.models import Comment as PostComment, Post
+from workspace.models import Comment as TaskComment, Project, Task
+
+from .models import SearchDocument
+
+BATCH_SIZE = 1000
+
+
+def _task(task):
+    return dict(title=task.title, body=task.description, project_id=task.project_id,
+                created_at=task.created_at)
+
+
+def _project(project):
+    return dict(title=project.title, body=project.description, project_id=project.id,
+                created_at=project.created_at)
+
+
+def _task_comment(comment):
+    return dict(body=comment.content, project_id=comment.task.project_id,
+                parent_id=comment.task_id, created_at=comment.created_at)
+
+
+def _post(post):
+    return dict(body=post.content, community_id=post.community_id, created_at=post.created_at)
+
+
+def _post_comment(comment):
+    return dict(body=comment.content, community_id=comment.post.community_id,
+                parent_id=comment.post_id, created_at=comment.created_at)
+
+
+# model -> (kind, fields of its document)
+INDEXED_MODELS = {
+    Task: ('task', _task),
+    Project: ('project', _project),
+    TaskComment: ('task_comment', _task_comment),
+    Post: ('post', _post),
+    PostComment: ('post_comment', _post_comment),
+}
+
+
+def index_object(instance):
+    kind, fields = INDEXED_MODELS[type(instance)]
+    values = fields(instance)
+    values['title'] = values.get('title', '')[:200]
+    # One UPDATE in the common case (an edit), INSERT for new objects
+    if not SearchDocument.objects.filter(kind=kind, object_id=instance.pk).update(**values):
+        SearchDocument.objects.create(kind=kind, object_id=instance.pk, **values)
+
+
+def move_task_comments(task):
+    """A task changed project: its comments are now scoped by the new one."""
+    SearchDocument.objects.filter(kind='task_comment', parent_id=task.pk)\
+        .update(project_id=task.project_id)
+
+
+def remove_object(instance):
+    kind, _ = INDEXED_MODELS[type(instance)]
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+    if kind in ('task', 'post'):
+        SearchDocument.objects.filter(parent_id=instance.pk).delete()
+
+
+def _documents():
+    for model, (kind, fields) in INDEXED_MODELS.items():
+        objects = model.objects.all()
+        if model is TaskComment:
+            objects = objects.select_related('task')
+        elif model is PostComment:
+            objects = objects.select_related('post')
+
+        for instance in objects.iterator(chunk_size=BATCH_SIZE):
+            values = fields(instance)
+            values['title'] = values.get('title', '')[:200]
+            yield SearchDocument(kind=kind, object_id=instance.pk, **values)
+
+
+@transaction.atomic
+def rebuild_search_index():
+    """Returns the number of documents written."""
+    SearchDocument.objects.all().delete()
+
+    count, batch = 0, []
+    for document in _documents():
+        batch.append(document)
+        if len(batch) >= BATCH_SIZE:
+            SearchDocument.objects.bulk_create(batch)
+            count, batch = count + len(batch), []
+    if batch:
+        SearchDocument.objects.bulk_create(batch)
+        count += len(batch)
+    return count
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from search.indexing import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the SearchDocument table from tasks, projects, posts and comments."
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} document(s)."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('community', '0008_community_discovery'),
+        ('workspace', '0009_activitylog_update_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('project', 'Project'), ('task_comment', 'Task Comment'), ('post', 'Post'), ('post_comment', 'Post Comment')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('parent_id', models.UUIDField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('body', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('community', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='community.community')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='workspace.project')),
+            ],
+            options={
+                'db_table': 'search_document',
+                'indexes': [models.Index(fields=['parent_id'], name='search_docu_parent__27ac6c_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE search_document ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_document_vector_gin ON search_document USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_document_vector_gin",
+    "ALTER TABLE search_document DROP COLUMN IF EXISTS search_vector",
+]
+
+# External-content FTS5 table; the triggers keep it in step with search_document
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE search_document_fts USING fts5(
+        title, body, content='search_document', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER search_document_ai AFTER INSERT ON search_document BEGIN
+        INSERT INTO search_document_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_ad AFTER DELETE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_au AFTER UPDATE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_document_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    "INSERT INTO search_document_fts(search_document_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_document_ai",
+    "DROP TRIGGER IF EXISTS search_document_ad",
+    "DROP TRIGGER IF EXISTS search_document_au",
+    "DROP TABLE IF EXISTS search_document_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
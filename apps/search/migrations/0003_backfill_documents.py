@@ -0,0 +1,49 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_documents(apps, schema_editor):
+    # Mirrors search.indexing on the historical models: the index starts with every existing object
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    Task = apps.get_model('workspace', 'Task')
+    Project = apps.get_model('workspace', 'Project')
+    TaskComment = apps.get_model('workspace', 'Comment')
+    Post = apps.get_model('community', 'Post')
+    PostComment = apps.get_model('community', 'Comment')
+
+    sources = [
+        ('task', Task.objects.all(), lambda o: dict(
+            title=o.title, body=o.description, project_id=o.project_id, created_at=o.created_at)),
+        ('project', Project.objects.all(), lambda o: dict(
+            title=o.title, body=o.description, project_id=o.id, created_at=o.created_at)),
+        ('task_comment', TaskComment.objects.select_related('task'), lambda o: dict(
+            body=o.content, project_id=o.task.project_id, parent_id=o.task_id, created_at=o.created_at)),
+        ('post', Post.objects.all(), lambda o: dict(
+            body=o.content, community_id=o.community_id, created_at=o.created_at)),
+        ('post_comment', PostComment.objects.select_related('post'), lambda o: dict(
+            body=o.content, community_id=o.post.community_id, parent_id=o.post_id, created_at=o.created_at)),
+    ]
+
+    SearchDocument.objects.all().delete()
+    for kind, objects, fields in sources:
+        batch = []
+        for instance in objects.iterator(chunk_size=BATCH_SIZE):
+            values = fields(instance)
+            values['title'] = values.get('title', '')[:200]
+            batch.append(SearchDocument(kind=kind, object_id=instance.pk, **values))
+            if len(batch) >= BATCH_SIZE:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1 @@
+from .document import SearchDocument
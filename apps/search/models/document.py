@@ -0,0 +1,61 @@
+from django.db import models
+
+from community.models import Community
+from workspace.models import Project
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable row per task, project, task comment, post and post comment.
+
+    Besides the text it holds the scope used for access checks: `project` for
+    workspace content (checked against ProjectAccess), `community` for posts
+    and their comments (checked against CommunityMember).
+
+    The full-text structure is vendor specific and created by the migration:
+        PostgreSQL -> generated `search_vector` tsvector column + GIN index
+        SQLite     -> `search_document_fts` FTS5 table synced by triggers
+    Rows are kept current by search/signals.py.
+    """
+
+    KIND_CHOICES = (
+        ('task', 'Task'),
+        ('project', 'Project'),
+        ('task_comment', 'Task Comment'),
+        ('post', 'Post'),
+        ('post_comment', 'Post Comment'),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    # Task of a task comment / post of a post comment (for linking)
+    parent_id = models.UUIDField(null=True, blank=True)
+
+    title = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True)
+
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    community = models.ForeignKey(
+        Community,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'search_document'
+        unique_together = ('kind', 'object_id')
+        indexes = [
+            models.Index(fields=['parent_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
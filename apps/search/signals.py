@@ -0,0 +1,47 @@
+# search/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from community.models import Comment as PostComment, Community, Post
+from workspace.models import Comment as TaskComment, Project, Task, Workspace
+
+from .indexing import index_object, move_task_comments, remove_object
+
+
+def _deleted_with(origin, *models):
+    model = getattr(origin, 'model', type(origin))
+    return model in models
+
+
+# Documents are removed by their FK cascade (project/community) or by
+# remove_object of the parent task/post; only direct deletes need a query.
+CASCADES = {
+    Task: (Project, Workspace),
+    Project: (Workspace,),
+    TaskComment: (Task, Project, Workspace),
+    Post: (Community,),
+    PostComment: (Post, Community),
+}
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=TaskComment)
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=PostComment)
+def index_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_object(instance)
+    if sender is Task and getattr(instance, '_loaded_project_id', instance.project_id) != instance.project_id:
+        move_task_comments(instance)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=TaskComment)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=PostComment)
+def remove_on_delete(sender, instance, origin=None, **kwargs):
+    if not _deleted_with(origin, *CASCADES[sender]):
+        remove_object(instance)
@@ -1,4 +1,6 @@
-from .serializers.user_serializers import UserSerializer, AccountUserSerializer
+from .serializers.user_serializers import (
+    UserSerializer, AccountUserSerializer, UserCardField, UserCardListSerializer
+)
 from .serializers.profile_serializers import AccountProfileAvatarSerializer, AccountProfileSerializer
 from .serializers.auth_serializers import (
     CustomRegisterSerializer
@@ -1,24 +1,76 @@
 # serializers.py
 from rest_framework import serializers
+from rest_framework.fields import get_attribute
 from users.models.user import User
+from users.user_cards import card_id, load_cards, related_user
+
 from django.utils import timezone
 import uuid
 
-class UserSerializer(serializers.ModelSerializer):
-    avatar = serializers.SerializerMethodField()
-    username = serializers.CharField(source='profile.username', read_only=True)
+
+class UserCardMixin:
+    """
+    A nested user rendered from its card (users/user_cards.py).
+
+    As a field it hands over the FK id, or the related user when the view
+    already loaded it, so rendering never fetches the user/profile rows itself.
+    """
+
+    def get_attribute(self, instance):
+        *path, name = self.source_attrs
+        owner = get_attribute(instance, path)
+        return related_user(owner, name) if owner is not None else None
+
+    def get_card(self, user):
+        return load_cards(self.context, [user]).get(card_id(user))
+
+
+class UserCardListSerializer(serializers.ListSerializer):
+    """Loads the cards of every user nested in the page in one batch, then renders it."""
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, "all") else data)
+        load_cards(self.context, [user for item in items for user in user_card_users(self.child, item)])
+        return super().to_representation(items)
+
+
+def user_card_users(serializer, instance):
+    """The users (or ids) whose cards rendering `instance` with `serializer` needs."""
+    if hasattr(serializer, "get_user_card_ids"):
+        return serializer.get_user_card_ids(instance)
+    if isinstance(serializer, UserCardMixin):
+        return [instance]
+    return [
+        field.get_attribute(instance)
+        for field in serializer.fields.values()
+        if isinstance(field, UserCardMixin)
+    ]
+
+
+class UserSerializer(UserCardMixin, serializers.Serializer):
+    """A nested user: {id, email, username, avatar}, rendered from its (batched) card."""
 
     class Meta:
-        model = User
-        fields = ['id', 'email', 'username', 'avatar']
-    
-    def get_avatar(self, obj):
-        if hasattr(obj, 'profile') and obj.profile.avatar:
-            return obj.profile.avatar.url
-        return None
+        list_serializer_class = UserCardListSerializer
+
+    def to_representation(self, instance):
+        return self.get_card(instance)
+
+
+class UserCardField(UserCardMixin, serializers.Field):
+    """One value of a nested user's card, e.g. UserCardField(source="actor", card_field="username")."""
+
+    def __init__(self, card_field, **kwargs):
+        self.card_field = card_field
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        card = self.get_card(value)
+        return card[self.card_field] if card else None
+
 
 class AccountUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', ]
-    
\ No newline at end of file
@@ -8,78 +8,52 @@ from django.utils import timezone
 from users.models import Profile
 
 
-# catching
-from django.core.cache import cache
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
+# caching
+from src.cache_aside import CachedRetrieveMixin
+from users.caches import account_cache, profile_cache, public_profile_cache
 
 # rate limiting
 from rest_framework.throttling import ScopedRateThrottle
 
-class PublicUserProfileView(generics.RetrieveAPIView):
+class PublicUserProfileView(CachedRetrieveMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = AccountProfileSerializer
     lookup_field = "username"
+    cache_aside = public_profile_cache
 
     queryset = Profile.objects.select_related("user")
 
-    @method_decorator(cache_page(60 * 10))  # SAFE
-    def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+    def get_cache_parts(self):
+        return [self.kwargs["username"]]
 
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(CachedRetrieveMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = AccountProfileSerializer
     throttle_classes = [ScopedRateThrottle]
     throttle_scope = 'sensitive_action'
+    cache_aside = profile_cache
 
     def get_object(self):
         return self.request.user.profile
 
-    def get(self, request, *args, **kwargs):
-        cache_key = f"user_profile:{request.user.id}"
+    def get_cache_parts(self):
+        return [self.request.user.id]
 
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
 
-        response = super().get(request, *args, **kwargs)
 
-        cache.set(cache_key, response.data, timeout=300)
-        return response
-
-    def put(self, request, *args, **kwargs):
-        response = super().put(request, *args, **kwargs)
-        cache.delete(f"user_profile:{request.user.id}")
-        return response
-
-
-
-class UserAccountView(generics.RetrieveUpdateAPIView):
+class UserAccountView(CachedRetrieveMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = AccountUserSerializer
     
     throttle_classes = [ScopedRateThrottle]
     throttle_scope = 'sensitive_action'
+    cache_aside = account_cache
 
     def get_object(self):
         return self.request.user
 
-    def get(self, request, *args, **kwargs):
-        cache_key = f"user_account:{request.user.id}"
-
-        data = cache.get(cache_key)
-        if data:
-            return Response(data)
-
-        response = super().get(request, *args, **kwargs)
-        cache.set(cache_key, response.data, 300)
-        return response
-
-    def put(self, request, *args, **kwargs):
-        response = super().put(request, *args, **kwargs)
-        cache.delete(f"user_account:{request.user.id}")
-        return response
+    def get_cache_parts(self):
+        return [self.request.user.id]
 
 
 class UserProfileAvatarView(generics.UpdateAPIView):
@@ -107,9 +81,7 @@ class UserAccountDeleteView(generics.DestroyAPIView):
         return self.request.user
 
     def delete(self, request, *args, **kwargs):
-        user = request.user
-        cache.delete(f"user_profile:{user.id}")
-        cache.delete(f"user_account:{user.id}")
-        user.delete()
+        # Cached profile/account entries are dropped by the delete signals
+        request.user.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
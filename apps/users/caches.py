@@ -0,0 +1,13 @@
+# users/caches.py
+"""
+Cached user reads (see src/cache_aside.py). Invalidated by users/signals.py
+and by the writes of the cached views themselves.
+"""
+from src.cache_aside import CacheAside
+
+# own profile / account, keyed by user id
+profile_cache = CacheAside("users:profile", timeout=60 * 5)
+account_cache = CacheAside("users:account", timeout=60 * 5)
+
+# public profile, keyed by username
+public_profile_cache = CacheAside("users:public_profile", timeout=60 * 10)
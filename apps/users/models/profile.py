@@ -36,3 +36,10 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.user.email}'s Profile"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored username so signals can drop the old public profile
+        instance._loaded_username = instance.__dict__.get("username")
+        return instance
+
@@ -1,9 +1,9 @@
-
-
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from .caches import account_cache, profile_cache, public_profile_cache
 from .models import Profile
+from . import user_cards
 
 User = get_user_model()
 
@@ -11,3 +11,31 @@ User = get_user_model()
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
+
+
+# --- CACHE INVALIDATION ---
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_caches(sender, instance, **kwargs):
+    # Username / avatar changes (avatar uploads are Profile saves too)
+    user_cards.invalidate([instance.user_id])
+    profile_cache.invalidate(instance.user_id)
+    for username in {instance.username, getattr(instance, "_loaded_username", None)}:
+        if username:
+            public_profile_cache.invalidate(username)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_account_caches(sender, instance, created=False, update_fields=None, **kwargs):
+    if created:
+        return
+    account_cache.invalidate(instance.pk)
+    # Both profile payloads embed the email; logins only touch last_login
+    if update_fields is None or "email" in update_fields:
+        user_cards.invalidate([instance.pk])
+        profile_cache.invalidate(instance.pk)
+        username = Profile.objects.filter(user_id=instance.pk).values_list("username", flat=True).first()
+        if username:
+            public_profile_cache.invalidate(username)
@@ -0,0 +1,94 @@
+# users/user_cards.py
+"""
+User cards: the {id, email, username, avatar} rendered wherever a user is nested.
+
+    get_cards(users)            -> {user_id: card} for User objects and/or ids
+    load_cards(context, users)  -> same, memoized in the serializer context
+    related_user(obj, "author") -> the loaded user if select_related, else the FK id
+    invalidate(user_ids)        -> drops cards (Profile / User saves, avatar uploads)
+
+Users already loaded with their profile (select_related) are rendered as they
+are. Everyone else is resolved with one get_many on the hot two-tier cache
+and one query for the misses, so a page costs the same whatever the number
+of rows.
+"""
+from django.db import transaction
+
+from src.metrics import record_cache
+from src.two_tier_cache import get_hot_cache
+from .models import Profile, User
+
+CARD_TIMEOUT = 60 * 60
+
+
+def card_key(user_id):
+    return f"users:card:{user_id}"
+
+
+def card_id(user):
+    """The card dict key of a User object or id."""
+    return str(getattr(user, "pk", user))
+
+
+def related_user(obj, name):
+    field = obj._meta.get_field(name)
+    if field.is_cached(obj):
+        return getattr(obj, name)
+    return getattr(obj, field.attname)
+
+
+def _card(user_id, email, username, avatar):
+    avatar_url = Profile._meta.get_field("avatar").storage.url(avatar) if avatar else None
+    return {"id": str(user_id), "email": email, "username": username, "avatar": avatar_url}
+
+
+def _card_from_user(user):
+    profile = getattr(user, "profile", None)
+    return _card(
+        user.pk, user.email,
+        profile.username if profile else None,
+        profile.avatar.name if profile and profile.avatar else None,
+    )
+
+
+def get_cards(users):
+    cards, user_ids = {}, set()
+    for user in users:
+        if user is None:
+            continue
+        if isinstance(user, User) and User.profile.is_cached(user):
+            cards[str(user.pk)] = _card_from_user(user)
+        else:
+            user_ids.add(card_id(user))
+
+    user_ids -= cards.keys()
+    if not user_ids:
+        return cards
+
+    cached = get_hot_cache().get_many([card_key(user_id) for user_id in user_ids])
+    cards.update({user_id: cached[card_key(user_id)] for user_id in user_ids if card_key(user_id) in cached})
+
+    missing = user_ids - cards.keys()
+    record_cache(hits=len(user_ids) - len(missing), misses=len(missing))
+    if missing:
+        rows = User.objects.filter(pk__in=missing).values_list("id", "email", "profile__username", "profile__avatar")
+        loaded = {str(row[0]): _card(*row) for row in rows}
+        get_hot_cache().set_many({card_key(user_id): card for user_id, card in loaded.items()}, timeout=CARD_TIMEOUT)
+        cards.update(loaded)
+    return cards
+
+
+def load_cards(context, users):
+    """Cards for `users`, memoized in context['user_cards'] for the rest of the render."""
+    cards = context.setdefault("user_cards", {})
+    users = [user for user in users if user is not None and card_id(user) not in cards]
+    if users:
+        cards.update(get_cards(users))
+    return cards
+
+
+def invalidate(user_ids):
+    """Drops the cards now, and again once the current transaction commits."""
+    keys = [card_key(user_id) for user_id in user_ids]
+    get_hot_cache().delete_many(keys)
+    transaction.on_commit(lambda: get_hot_cache().delete_many(keys))
@@ -0,0 +1,92 @@
+# workspace/access_services.py
+from django.db.models import Q
+from .models import Project, ProjectAccess, WorkspaceMember
+from .permissions.membership import ADMIN_ROLES
+
+
+BATCH_SIZE = 1000
+
+
+def _apply(workspace_id, current, desired):
+    """
+    Diffs two sets of (user_id, project_id) pairs:
+    deletes rows that should no longer exist and inserts the missing ones.
+    """
+    removed = current - desired
+    if removed:
+        by_project = {}
+        for user_id, project_id in removed:
+            by_project.setdefault(project_id, []).append(user_id)
+        for project_id, user_ids in by_project.items():
+            ProjectAccess.objects.filter(project_id=project_id, user_id__in=user_ids).delete()
+
+    added = desired - current
+    if added:
+        ProjectAccess.objects.bulk_create(
+            [
+                ProjectAccess(user_id=user_id, project_id=project_id, workspace_id=workspace_id)
+                for user_id, project_id in added
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+
+def sync_project_access(project):
+    """
+    Recomputes every access row of one project.
+    Called when a project is created or its visibility changes.
+    """
+    members = WorkspaceMember.objects.filter(workspace_id=project.workspace_id)
+    if project.visibility != 'public':
+        members = members.filter(
+            Q(role__in=ADMIN_ROLES) | Q(user__projectmember__project_id=project.id)
+        )
+
+    desired = {(user_id, project.id) for user_id in members.values_list('user_id', flat=True)}
+    current = {
+        (user_id, project.id)
+        for user_id in ProjectAccess.objects.filter(project_id=project.id).values_list('user_id', flat=True)
+    }
+
+    _apply(project.workspace_id, current, desired)
+
+
+def sync_user_access(workspace_id, user_id, project_id=None):
+    """
+    Recomputes the access rows of one user inside a workspace
+    (optionally limited to a single project).
+    Called when a workspace or project membership changes.
+    """
+    role = WorkspaceMember.objects.filter(
+        workspace_id=workspace_id, user_id=user_id
+    ).values_list('role', flat=True).first()
+
+    projects = Project.objects.filter(workspace_id=workspace_id)
+    existing = ProjectAccess.objects.filter(workspace_id=workspace_id, user_id=user_id)
+    if project_id:
+        projects = projects.filter(id=project_id)
+        existing = existing.filter(project_id=project_id)
+
+    if role is None:
+        projects = projects.none()
+    elif role not in ADMIN_ROLES:
+        projects = projects.filter(Q(visibility='public') | Q(members__user_id=user_id))
+
+    desired = {(user_id, pk) for pk in projects.values_list('id', flat=True)}
+    current = {(user_id, pk) for pk in existing.values_list('project_id', flat=True)}
+
+    _apply(workspace_id, current, desired)
+
+
+def rebuild_project_access(workspace_id=None):
+    """Full rebuild (management command / repair). Returns the number of projects synced."""
+    projects = Project.objects.all()
+    if workspace_id:
+        projects = projects.filter(workspace_id=workspace_id)
+
+    count = 0
+    for project in projects.only('id', 'workspace_id', 'visibility').iterator():
+        sync_project_access(project)
+        count += 1
+    return count
@@ -0,0 +1,94 @@
+# workspace/activity_services.py
+"""
+Single entry point for ActivityLog writes.
+
+    record_activity(workspace_id, actor, 'complete_task', task.id, task.title)
+
+Entries are buffered until the surrounding transaction commits and written
+with one bulk_create. Inside a transaction an event is kept once per
+(workspace, target, action): recording it again (e.g. from a signal and from
+the service) only replaces the actor/text, so every event lands exactly once.
+A rolled back transaction drops its buffer.
+
+With defer=True (or ACTIVITY_LOG_ASYNC) the entries are handed to a Celery
+worker instead of being inserted in the request.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import ActivityLog
+from .counter_services import bump_workspace_version
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def _current_buffer():
+    """Buffer of the current outermost atomic block (a new block = a new buffer)."""
+    block = connection.atomic_blocks[0]
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None or buffer["block"] is not block:
+        # Previous buffer belonged to a block that never committed (rollback)
+        buffer = {"block": block, "entries": {}}
+        _local.buffer = buffer
+    return buffer
+
+
+def record_activity(workspace_id, actor, action_type, target_id, target_text, defer=None):
+    if defer is None:
+        defer = getattr(settings, "ACTIVITY_LOG_ASYNC", False)
+
+    entry = {
+        "workspace_id": str(workspace_id),
+        "actor_id": str(actor.pk if hasattr(actor, "pk") else actor),
+        "action_type": action_type,
+        "target_id": str(target_id) if target_id else None,
+        "target_text": str(target_text)[:200],
+        "defer": defer,
+    }
+
+    if not connection.in_atomic_block:
+        _dispatch([entry])
+        return
+
+    key = (entry["workspace_id"], entry["target_id"], action_type)
+    _current_buffer()["entries"][key] = entry  # last write wins
+    # Registered on every call: callbacks of a rolled back savepoint are dropped,
+    # the first one that survives drains the buffer, the rest find it empty.
+    transaction.on_commit(_flush_buffer, robust=True)
+
+
+def _flush_buffer():
+    buffer = getattr(_local, "buffer", None)
+    _local.buffer = None
+    if buffer and buffer["entries"]:
+        _dispatch(list(buffer["entries"].values()))
+
+
+def _dispatch(entries):
+    deferred, immediate = [], []
+    for entry in entries:
+        (deferred if entry.pop("defer") else immediate).append(entry)
+
+    if deferred:
+        from .tasks import write_activity_logs
+        write_activity_logs.delay(deferred)
+    if immediate:
+        write_activity_entries(immediate)
+
+
+def write_activity_entries(entries, bump_versions=False):
+    """
+    One INSERT for the whole batch. Entries written with the request belong to
+    a write that bumped the workspace version already; a deferred batch
+    (bump_versions=True) lands later and refreshes the dashboards itself.
+    """
+    ActivityLog.objects.bulk_create([ActivityLog(**entry) for entry in entries])
+
+    if bump_versions:
+        for workspace_id in {entry["workspace_id"] for entry in entries}:
+            bump_workspace_version(workspace_id)
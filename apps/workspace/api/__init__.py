@@ -4,7 +4,8 @@ from .serializers.project_serializers import (
     TaskSerializer,
     CommentSerializer,
     ProjectMemberSerializer,
-    TaskWriteSerializer
+    TaskWriteSerializer,
+    TaskBulkUpdateSerializer,
 )
 from .serializers.workspace_serializers import (
     WorkspaceSerializer,
@@ -6,6 +6,7 @@ from ..views.project_views import (
     ProjectViewSet,
     TaskListCreateView,
     TaskRetrieveUpdateView,
+    TaskBulkUpdateView,
     ProjectMemberView,
     StartTaskView,
     CompleteTaskView,
@@ -39,6 +40,11 @@ urlpatterns = [
         TaskListCreateView.as_view(),
         name="project-tasks"
     ),
+    path(
+        "workspaces/<uuid:workspace_id>/projects/<uuid:project_id>/tasks/bulk/",
+        TaskBulkUpdateView.as_view(),
+        name="project-tasks-bulk"
+    ),
     path(
         "workspaces/<uuid:workspace_id>/projects/<uuid:project_id>/tasks/<uuid:task_id>/",
         TaskRetrieveUpdateView.as_view(),
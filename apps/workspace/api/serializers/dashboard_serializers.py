@@ -1,37 +1,44 @@
 # workspace/serializers.py
 from rest_framework import serializers
 from workspace.models import Workspace, WorkspaceMember, WorkspaceInvitation, WorkspaceChannel, Project, Task, ActivityLog
-from users.api.serializers.user_serializers import UserSerializer 
+from users.api.serializers.user_serializers import UserSerializer, UserCardField, UserCardListSerializer
+from users.user_cards import card_id, load_cards, related_user
 
 class DashboardMemberSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
         model = WorkspaceMember
+        list_serializer_class = UserCardListSerializer
         fields = ['id', 'user', 'role']
 
 class DashboardProjectSerializer(serializers.ModelSerializer):
-    # Calculate progress percentage on the fly
+    # Progress from the denormalized Project counters (no per-row COUNT)
     progress = serializers.SerializerMethodField()
     collaborators = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
+        list_serializer_class = UserCardListSerializer
         fields = ['id', 'title', 'status', 'updated_at', 'progress', 'collaborators']
 
     def get_progress(self, obj):
-        total = obj.total_tasks
-        completed = obj.completed_tasks
+        total = obj.task_count
+        completed = obj.completed_count
         if total == 0: return 0
         return int((completed / total) * 100)
 
+    def get_user_card_ids(self, obj):
+        # First 4 members for the UI avatars (uses the prefetched members)
+        return [related_user(m, "user") for m in obj.members.all()[:4]]
+
     def get_collaborators(self, obj):
-        # Return first 3 members for the UI avatars
-        members = obj.members.select_related('user')[:4]
+        users = self.get_user_card_ids(obj)
+        cards = load_cards(self.context, users)
         return [{
             "user": {
-                "username": m.user.profile.username, 
-                "avatar": m.user.profile.avatar.url if m.user.profile.avatar else None}
-        } for m in members]
+                "username": cards[card_id(user)]["username"],
+                "avatar": cards[card_id(user)]["avatar"]}
+        } for user in users]
 
 class DashboardTaskSerializer(serializers.ModelSerializer):
     project_title = serializers.CharField(source='project.title', read_only=True)
@@ -41,9 +48,10 @@ class DashboardTaskSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'priority', 'due_date', 'project_title', 'status']
 
 class ActivityLogSerializer(serializers.ModelSerializer):
-    actor_name = serializers.CharField(source='actor.profile.username')
-    actor_avatar = serializers.ImageField(source='actor.profile.avatar', read_only=True)
+    actor_name = UserCardField(source='actor', card_field='username')
+    actor_avatar = UserCardField(source='actor', card_field='avatar')
 
     class Meta:
         model = ActivityLog
+        list_serializer_class = UserCardListSerializer
         fields = ['id', 'actor_name', 'actor_avatar', 'action_type', 'target_text', 'created_at']
\ No newline at end of file
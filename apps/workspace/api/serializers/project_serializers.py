@@ -1,9 +1,11 @@
 # serializers.py
 from rest_framework import serializers
-from users.api import UserSerializer
+from users.api import UserSerializer, UserCardField, UserCardListSerializer
 from workspace.models import Workspace, Project, Task, Comment, ProjectMember, WorkspaceMember
 from django.utils import timezone
 from rest_framework.validators import UniqueTogetherValidator
+from workspace.permissions.membership import resolve_membership
+from src.sparse_fields import SparseFieldsetMixin
 
 
 class ProjectMemberSerializer(serializers.ModelSerializer):
@@ -12,6 +14,7 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ProjectMember
+        list_serializer_class = UserCardListSerializer
         fields = [
             "id",
             "project",
@@ -31,6 +34,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = UserCardListSerializer
         fields = [
             "id",
             "author",
@@ -41,18 +45,15 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "author", "created_at")
 
 
-class TaskSerializer(serializers.ModelSerializer):
-    started_by = serializers.CharField(
-        source="started_by.profile.username", read_only=True
-    )
-    assigned_to = serializers.CharField(
-        source="assigned_to.profile.username", read_only=True
-    )
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    started_by = UserCardField(card_field="username")
+    assigned_to = UserCardField(card_field="username")
     due_date = serializers.DateField(required=False, allow_null=True)
     comments = CommentSerializer(many=True, read_only=True)
 
     class Meta:
         model = Task
+        list_serializer_class = UserCardListSerializer
         fields = "__all__"
         read_only_fields = (
             "id",
@@ -62,7 +63,32 @@ class TaskSerializer(serializers.ModelSerializer):
             "completed_at",
             "started_by",
         )
+        # Only nested on detail or with ?expand=comments
+        expandable_fields = ("comments",)
         
+def validate_assignee(serializer, value):
+    """
+    Check if the User is a valid assignee.
+    Valid = Explicit Project Member OR Workspace Admin/Owner.
+    """
+    if not value:
+        return None
+
+    view_kwargs = serializer.context['view'].kwargs
+    membership = resolve_membership(
+        serializer.context['request'],
+        view_kwargs.get('workspace_id'),
+        view_kwargs.get('project_id'),
+        user_id=value,
+    )
+
+    # 1. Explicit Project Member OR 2. Workspace Admin/Owner
+    if membership.is_project_member or membership.is_admin:
+        return value
+
+    raise serializers.ValidationError("The assigned user is not a member of this project.")
+
+
 class TaskWriteSerializer(serializers.ModelSerializer):
     # We accept a UUID string for the user ID
     assign_user_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
@@ -77,38 +103,7 @@ class TaskWriteSerializer(serializers.ModelSerializer):
         )
 
     def validate_assign_user_id(self, value):
-        """
-        Check if the User is a valid assignee.
-        Valid = Explicit Project Member OR Workspace Admin/Owner.
-        """
-        if not value:
-            return None
-
-        project_id = self.context['view'].kwargs.get('project_id')
-        
-        # 1. Check if they are an explicit Project Member
-        is_project_member = ProjectMember.objects.filter(
-            project_id=project_id, 
-            user_id=value
-        ).exists()
-
-        if is_project_member:
-            return value
-
-        # 2. Check if they are a Workspace Admin/Owner
-        # We need to find the workspace ID first
-        project = Project.objects.get(id=project_id)
-        
-        is_workspace_admin = WorkspaceMember.objects.filter(
-            workspace=project.workspace,
-            user_id=value,
-            role__in=['admin', 'owner'] # Allow admins and owners
-        ).exists()
-
-        if is_workspace_admin:
-            return value
-
-        raise serializers.ValidationError("The assigned user is not a member of this project.")
+        return validate_assignee(self, value)
 
     def create(self, validated_data):
         # 1. Extract the custom field
@@ -123,18 +118,42 @@ class TaskWriteSerializer(serializers.ModelSerializer):
 
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """One change set applied to many tasks of a project (see bulk_update_tasks_service)."""
+
+    MAX_TASKS = 500
+
+    task_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=MAX_TASKS)
+    status = serializers.ChoiceField(choices=Task.StatusChoices.choices, required=False)
+    priority = serializers.ChoiceField(choices=Task.PriorityChoices.choices, required=False)
+    due_date = serializers.DateField(required=False, allow_null=True)
+    assign_user_id = serializers.UUIDField(required=False, allow_null=True)
+
+    def validate_assign_user_id(self, value):
+        return validate_assignee(self, value)
+
+    def validate(self, attrs):
+        if not self.get_changes(attrs):
+            raise serializers.ValidationError("Nothing to update.")
+        return attrs
+
+    def get_changes(self, attrs=None):
+        attrs = self.validated_data if attrs is None else attrs
+        changes = {field: attrs[field] for field in ("status", "priority", "due_date") if field in attrs}
+        if "assign_user_id" in attrs:
+            changes["assigned_to_id"] = attrs["assign_user_id"]
+        return changes
+
+
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     tasks = TaskSerializer(many=True, read_only=True)
-    task_count = serializers.SerializerMethodField()
-    completed_count = serializers.SerializerMethodField()
-    created_by = serializers.CharField(
-        source="created_by.profile.username", read_only=True
-    )
+    created_by = UserCardField(card_field="username")
     members = ProjectMemberSerializer(many=True, read_only=True)
     user_permission = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
+        list_serializer_class = UserCardListSerializer
         fields = [
             "id",
             "title",
@@ -155,13 +174,11 @@ class ProjectSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "tasks",
+            "task_count",
+            "completed_count",
         )
-
-    def get_task_count(self, obj):
-        return obj.tasks.count()
-
-    def get_completed_count(self, obj):
-        return obj.tasks.filter(status=Task.StatusChoices.COMPLETED).count()
+        # Only nested on detail or with ?expand=tasks,members,tasks.comments
+        expandable_fields = ("tasks", "members")
 
     
     def get_user_permission(self, obj):
@@ -169,6 +186,15 @@ class ProjectSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             return None
 
+        # Annotated by ProjectViewSet.get_queryset (no query per project)
+        if hasattr(obj, "user_permission_value"):
+            if obj.user_permission_value is None:
+                return None
+            return {
+                "permission": obj.user_permission_value,
+                "joined_at": obj.user_joined_at,
+            }
+
         member = obj.members.filter(user=request.user).first()
         if not member:
             return None
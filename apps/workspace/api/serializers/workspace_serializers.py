@@ -1,12 +1,13 @@
 from rest_framework import serializers
 from users.models import User
 from workspace.models import Workspace, WorkspaceMember, WorkspaceInvitation, WorkspaceChannel
-from users.api import UserSerializer
+from users.api import UserSerializer, UserCardListSerializer
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 
 from notifications.notification_services import NotificationService
+from workspace.permissions.membership import resolve_membership
 
 User = get_user_model()
 
@@ -42,6 +43,7 @@ class WorkspaceMemberSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = WorkspaceMember
+        list_serializer_class = UserCardListSerializer
         fields = ['id', 'user', 'role', 'joined_at']
 
 
@@ -54,6 +56,7 @@ class WorkspaceSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Workspace
+        list_serializer_class = UserCardListSerializer
         fields = [
             'id',
             'name',
@@ -78,11 +81,7 @@ class WorkspaceSerializer(serializers.ModelSerializer):
     def get_user_role(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            membership = WorkspaceMember.objects.filter(
-                workspace=obj,
-                user=request.user
-            ).first()
-            return membership.role if membership else None
+            return resolve_membership(request, obj.id).role
         return None
 
     def get_logo(self, obj):
@@ -105,6 +104,7 @@ class WorkspaceInvitationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = WorkspaceInvitation
+        list_serializer_class = UserCardListSerializer
         fields = [
             'id',
             'workspace',
@@ -2,73 +2,32 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
 
-from workspace.models import Workspace, Project, Task, ActivityLog, WorkspaceMember
-from workspace.api import (
-    DashboardProjectSerializer, 
-    DashboardTaskSerializer, 
-    ActivityLogSerializer,
-    DashboardMemberSerializer
-)
+from src.conditional import ConditionalGetMixin
+from workspace.dashboard_services import get_workspace_dashboard
 from workspace.permissions.permissions import (
     IsWorkspaceMemberOrAdmin,
 )
+from workspace.permissions.membership import resolve_membership, resolve_workspace_version
 
-class WorkspaceDashboardView(APIView):
+class WorkspaceDashboardView(ConditionalGetMixin, APIView):
     permission_classes = [
         IsAuthenticated,
         IsWorkspaceMemberOrAdmin
     ]
 
-    def get(self, request, workspace_id):
-        user = request.user
-        workspace = get_object_or_404(Workspace, id=workspace_id)
+    def get_etag_version(self):
+        # Same version keys the dashboard cache; memoized with the membership lookup
+        return resolve_workspace_version(self.request, self.kwargs['workspace_id'])
 
-        # 1. Verify Membership
-        if not WorkspaceMember.objects.filter(workspace=workspace, user=user).exists():
+    def get(self, request, workspace_id):
+        # 1. Verify Membership (memoized by the permission class)
+        if not resolve_membership(request, workspace_id).is_member:
             return Response({"error": "Access denied"}, status=403)
 
-        # 2. Get Active Projects
-        # We annotate (calculate) task counts directly in the database
-        projects_queryset = Project.objects.filter(
-            workspace=workspace, 
-            status__in=['active', 'planning']
-        ).annotate(
-            total_tasks=Count('tasks'),
-            completed_tasks=Count('tasks', filter=Q(tasks__status='completed'))
-        ).order_by('-updated_at')[:4]
-
-        # 3. Get "My Priorities" (Tasks assigned to ME)
-        my_tasks_queryset = Task.objects.filter(
-            project__workspace=workspace,
-            assigned_to=user,
-            status__in=['pending', 'in_progress']
-        ).select_related('project').order_by('due_date', '-created_at')[:5]
-
-        # 4. Get Recent Activity
-        activity_queryset = ActivityLog.objects.filter(
-            workspace=workspace
-        ).select_related('actor').order_by('-created_at')[:10]
-
-        # 5. Get Recent Members (For the "Team" widget)
-        members_queryset = WorkspaceMember.objects.filter(
-            workspace=workspace
-        ).select_related('user').order_by('-joined_at')[:5]
-
-        # 6. Serialize Everything
-        data = {
-            "workspace_name": workspace.name,
-            "workspace_logo": workspace.logo.url if workspace.logo else None,
-            "workspace_description": workspace.description,
-            "total_members": WorkspaceMember.objects.filter(workspace=workspace).count(),
-            "total_projects": Project.objects.filter(workspace=workspace).count(),
-            "total_tasks": Task.objects.filter(project__workspace=workspace).count(),
-            "active_projects": DashboardProjectSerializer(projects_queryset, many=True).data,
-            "my_tasks": DashboardTaskSerializer(my_tasks_queryset, many=True).data,
-            "activities": ActivityLogSerializer(activity_queryset, many=True).data,
-            "recent_members": DashboardMemberSerializer(members_queryset, many=True).data
-        }
+        # 2. Build (or reuse) the dashboard -> a handful of aggregated queries, cached per user
+        data = get_workspace_dashboard(workspace_id, request.user, version=resolve_workspace_version(request, workspace_id))
+        if data is None:
+            return Response({"error": "Workspace not found"}, status=404)
 
-        return Response(data)
\ No newline at end of file
+        return Response(data)
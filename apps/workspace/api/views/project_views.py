@@ -13,6 +13,9 @@ from workspace.permissions.permissions import (
     IsProjectCollaboratorOrWorkspaceAdmin, 
     IsTaskCollaboratorOrProjectAdmin
 )
+from workspace.permissions.membership import resolve_membership, resolve_workspace_version
+from src.conditional import ConditionalGetMixin
+from src.sparse_fields import SparseFieldsetViewMixin
 
 from workspace.models import (
     Project, 
@@ -29,6 +32,7 @@ from workspace.api import (
     ProjectWriteSerializer,
     TaskSerializer,
     TaskWriteSerializer,
+    TaskBulkUpdateSerializer,
     CommentSerializer,
     ProjectMemberSerializer
 )
@@ -38,45 +42,74 @@ from workspace.workspace_services import (
     start_task_service, 
     create_comment_service,
     complete_task_service,
-    add_project_member_service
+    add_project_member_service,
+    bulk_update_tasks_service,
 )
-from django.db.models import Q
+from django.db.models import Q, OuterRef, Prefetch, Subquery
+
+
+# Prefetches for the nested relations, only applied when they are expanded
+TASK_PREFETCH = Prefetch(
+    'tasks',
+    queryset=Task.objects.select_related('started_by__profile', 'assigned_to__profile').order_by('-created_at'),
+)
+COMMENT_PREFETCH = Prefetch('comments', queryset=Comment.objects.select_related('author__profile'))
 
 
 # ----------------------- PROJECT -----------------------
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
 
     permission_classes = [
         IsAuthenticated, 
         IsProjectCollaboratorOrWorkspaceAdmin
     ]
 
+    expand_prefetches = {
+        'members': [Prefetch('members', queryset=ProjectMember.objects.select_related('user__profile'))],
+        'tasks': [TASK_PREFETCH],
+        'tasks.comments': [
+            Prefetch('tasks__comments', queryset=Comment.objects.select_related('author__profile'))
+        ],
+    }
+
     def get_serializer_class(self):
         if self.action in ["create"]:
             return ProjectWriteSerializer
         return ProjectSerializer
 
+    def get_etag_version(self):
+        # Every project/task/member/comment write bumps Workspace.version
+        if self.action == "list":
+            return resolve_workspace_version(self.request, self.kwargs.get("workspace_id"))
+        return None
+
     def get_queryset(self):
         workspace_id = self.kwargs.get("workspace_id")
         user = self.request.user
 
-        try:
-            membership = getattr(self.request, 'workspace_memberships', None) or \
-                WorkspaceMember.objects.get(workspace_id=workspace_id, user=user)
-        except WorkspaceMember.DoesNotExist:
-            return Project.objects.all()
+        # Already resolved by the permission class -> no extra query
+        membership = resolve_membership(self.request, workspace_id)
+        if not membership.is_member:
+            return Project.objects.none()
         
-        base_qs = Project.objects.filter(workspace_id=workspace_id)
+        # The caller's own project permission, for ProjectSerializer.user_permission
+        my_membership = ProjectMember.objects.filter(project=OuterRef('pk'), user=user)
+        base_qs = self.prefetch_expansions(
+            Project.objects.filter(workspace_id=workspace_id)
+            .select_related('created_by__profile')
+            .annotate(
+                user_permission_value=Subquery(my_membership.values('permission')[:1]),
+                user_joined_at=Subquery(my_membership.values('created_at')[:1]),
+            )
+        )
         
         # Admins see everything
-        if membership.role in ['owner', 'admin']:
+        if membership.is_admin:
             return base_qs
         
         # Members see Public + Their Projects
-        return base_qs.filter(
-            Q(visibility='public') | 
-            Q(members__user=user)
-        ).distinct()
+        # (precomputed in ProjectAccess -> one indexed join, no DISTINCT)
+        return base_qs.filter(access_entries__user=user)
 
     def perform_create(self, serializer):
         workspace_id = self.kwargs.get("workspace_id")
@@ -89,11 +122,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
         )
 
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(SparseFieldsetViewMixin, generics.ListCreateAPIView):
     permission_classes = [
         IsTaskCollaboratorOrProjectAdmin
     ]
 
+    expand_prefetches = {'comments': [COMMENT_PREFETCH]}
+    cursor_ordering = ('-created_at', '-id')
+
     def get_serializer_class(self):
         # "self.action" does not exist in Generic Views, use request.method
         if self.request.method == 'POST':
@@ -104,10 +140,12 @@ class TaskListCreateView(generics.ListCreateAPIView):
         # Optimization: Fetch workspace/project ONCE to validate existence, 
         # but you don't need to fetch them just to filter the tasks if you trust the IDs.
         # Ideally, validate hierarchy:
-        return Task.objects.filter(
-            project__id=self.kwargs["project_id"], 
-            project__workspace_id=self.kwargs["workspace_id"]
-        ).order_by("-created_at")
+        return self.prefetch_expansions(
+            Task.objects.filter(
+                project__id=self.kwargs["project_id"], 
+                project__workspace_id=self.kwargs["workspace_id"]
+            ).select_related('started_by__profile', 'assigned_to__profile')
+        )
 
     def perform_create(self, serializer):
         workspace_id = self.kwargs.get("workspace_id")
@@ -121,21 +159,21 @@ class TaskListCreateView(generics.ListCreateAPIView):
         task = serializer.save(project=project, created_by=user)
 
         # 2. Notifications (Refined)
-        # We perform this AFTER save to ensure the task actually exists
-        members = project.members.all().select_related('user') # Optimization
-        recipient_users = [m.user for m in members if m.user != user] # Exclude self
-        
-        if recipient_users:
-            NotificationService.send_bulk_notification(
-                recipients=recipient_users,
-                actor=user,
-                title="New Task Added",
-                message=f"New task '{task.title}' added to project '{project.title}'.",
-                target_obj=task, # Point to the task, not the project
-                category='task_added',
-            )
+        # Project members (except the creator), fanned out after commit
+        NotificationService.send_bulk_notification(
+            audience={
+                "model": "workspace.ProjectMember",
+                "filters": {"project_id": str(project.id)},
+            },
+            actor=user,
+            title="New Task Added",
+            message=f"New task '{task.title}' added to project '{project.title}'.",
+            target_obj=task, # Point to the task, not the project
+            category='task_added',
+            coalesce_on=project, # Bulk imports -> one "N new tasks" row per member
+        )
 
-class TaskRetrieveUpdateView(generics.RetrieveUpdateDestroyAPIView):
+class TaskRetrieveUpdateView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [
         IsAuthenticated,
@@ -144,41 +182,54 @@ class TaskRetrieveUpdateView(generics.RetrieveUpdateDestroyAPIView):
 
     lookup_field = "id"
     lookup_url_kwarg = "task_id"
+    expand_prefetches = {'comments': [COMMENT_PREFETCH]}
 
     def get_queryset(self):
-        workspace_id = self.kwargs.get("workspace_id")
-        project_id = self.kwargs.get("project_id")
-        user = self.request.user
-
-        workspace = get_object_or_404(Workspace, id=workspace_id)
-        project = get_object_or_404(Project, id=project_id, workspace=workspace)
-
-
-        return Task.objects.filter(project=project)
+        # Validates the workspace -> project -> task hierarchy in the same query
+        # that loads the task (a wrong workspace/project simply 404s).
+        return self.prefetch_expansions(
+            Task.objects.filter(
+                project_id=self.kwargs.get("project_id"),
+                project__workspace_id=self.kwargs.get("workspace_id"),
+            ).select_related('project', 'started_by__profile', 'assigned_to__profile')
+        )
 
     def perform_update(self, serializer):
-        workspace_id = self.kwargs.get("workspace_id")
-        project_id = self.kwargs.get("project_id")
-        task_id = self.kwargs.get("task_id")
-        user = self.request.user
+        # get_object() already validated the hierarchy and the permissions
+        serializer.save(project=serializer.instance.project)
 
-        workspace = get_object_or_404(Workspace, id=workspace_id)
-        project = get_object_or_404(Project, id=project_id, workspace=workspace)
-        task = get_object_or_404(Task, id=task_id, project=project)
+    def perform_destroy(self, instance):
+        instance.delete()
 
 
-        serializer.save(project=project)
+class TaskBulkUpdateView(APIView):
+    """
+    POST .../projects/<project_id>/tasks/bulk/
+    {"task_ids": [...], "status": ..., "priority": ..., "due_date": ..., "assign_user_id": ...}
+    One permission check and one UPDATE for the whole batch.
+    """
+    permission_classes = [
+        IsAuthenticated,
+        IsProjectCollaboratorOrWorkspaceAdmin
+    ]
 
-    def perform_destroy(self, instance):
-        workspace_id = self.kwargs.get("workspace_id")
-        project_id = self.kwargs.get("project_id")
-        user = self.request.user
+    def post(self, request, workspace_id, project_id):
+        # Membership was resolved (with the project permission) by the permission class
+        if not resolve_membership(request, workspace_id, project_id).can_write_project():
+            raise PermissionDenied("You need write access to this project.")
 
-        workspace = get_object_or_404(Workspace, id=workspace_id)
-        project = get_object_or_404(Project, id=project_id, workspace=workspace)
+        project = get_object_or_404(Project, id=project_id, workspace_id=workspace_id)
 
+        serializer = TaskBulkUpdateSerializer(data=request.data, context={'request': request, 'view': self})
+        serializer.is_valid(raise_exception=True)
 
-        instance.delete()
+        updated = bulk_update_tasks_service(
+            user=request.user,
+            project=project,
+            task_ids=serializer.validated_data['task_ids'],
+            changes=serializer.get_changes(),
+        )
+        return Response({"updated": len(updated), "task_ids": updated})
 
 
 # ----------------------- PROJECT MEMBERS -----------------------
@@ -198,17 +249,11 @@ class ProjectMemberView(generics.ListCreateAPIView):
         workspace_id = self.kwargs.get("workspace_id")
         project_id = self.kwargs.get("project_id")
         
-        is_admin = WorkspaceMember.objects.filter(
-            workspace_id=workspace_id,
-            user=request.user,
-            role__in=["owner", "admin", "moderator"]
-        ).exists()
-        
-        if not is_admin:
+        if not resolve_membership(request, workspace_id, project_id).is_admin:
             raise PermissionDenied("Only admins can add members.")
 
         # 2. Get Data
-        project = get_object_or_404(Project, id=project_id)
+        project = get_object_or_404(Project, id=project_id, workspace_id=workspace_id)
         
         # We manually validate using the serializer to get the 'user_id' cleanly
         serializer = self.get_serializer(data=request.data)
@@ -226,10 +271,11 @@ class ProjectMemberView(generics.ListCreateAPIView):
              target_user = get_object_or_404(User, id=request.data.get('user_id'))
 
         # 3. Additional Validation
-        if not WorkspaceMember.objects.filter(workspace_id=workspace_id, user=target_user).exists():
+        target_membership = resolve_membership(request, workspace_id, project_id, user_id=target_user.id)
+        if not target_membership.is_member:
             return Response({"user": "User is not in this workspace."}, status=400)
             
-        if ProjectMember.objects.filter(project=project, user=target_user).exists():
+        if target_membership.is_project_member:
             return Response({"detail": "User is already in project."}, status=400)
 
         # 4. Service Call
@@ -298,12 +344,13 @@ class CommentListCreateView(generics.ListCreateAPIView):
         IsAuthenticated, 
         IsProjectCollaboratorOrWorkspaceAdmin
     ]
+    cursor_ordering = ('created_at', 'id')
     
     def get_queryset(self):
         # We don't need the service for GET, just standard optimization
         return Comment.objects.filter(
             task_id=self.kwargs.get("task_id")
-        ).select_related('author').order_by("created_at")
+        ).select_related('author__profile')
 
     def perform_create(self, serializer):
         # Get the Task object
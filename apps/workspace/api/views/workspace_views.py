@@ -11,6 +11,8 @@ from rest_framework.exceptions import NotFound
 from workspace.permissions.permissions import (
     IsWorkspaceMemberOrAdmin,
 )
+from workspace.permissions.membership import resolve_membership, resolve_workspace_version
+from src.conditional import ConditionalGetMixin
 
 from workspace.models import (
     Workspace,
@@ -36,7 +38,7 @@ from notifications.notification_services import NotificationService
 User = get_user_model()
 
     
-class WorkspaceViewSet(viewsets.ModelViewSet):
+class WorkspaceViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     permission_classes = [
         IsAuthenticated,
         IsWorkspaceMemberOrAdmin
@@ -47,6 +49,16 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
             return CreateWorkspaceSerializer
         return WorkspaceSerializer
 
+    def get_cursor_ordering(self):
+        if self.action == "members":
+            return ("joined_at", "id")
+        return ("-created_at", "-id")
+
+    def get_etag_version(self):
+        if self.action == "members":
+            return resolve_workspace_version(self.request, self.kwargs["pk"])
+        return None
+
     def get_queryset(self):
         user = self.request.user
         return Workspace.objects.filter(
@@ -74,10 +86,11 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
 
         members = WorkspaceMember.objects.filter(
             workspace=workspace
-        ).select_related("user")
+        ).select_related("user__profile")
 
-        serializer = WorkspaceMemberSerializer(members, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(members)
+        serializer = WorkspaceMemberSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 class CreateWorkspaceInvitationView(generics.CreateAPIView):
     serializer_class = CreateWorkspaceInvitationSerializer
@@ -99,16 +112,12 @@ class CreateWorkspaceInvitationView(generics.CreateAPIView):
         workspace = get_object_or_404(Workspace, id=workspace_id)
         
         # Check permissions: Is the requester an Admin or Owner?
-        try:
-            member = WorkspaceMember.objects.get(
-                workspace=workspace,
-                user=self.request.user
-            )
-            if member.role not in ["owner", "admin"]:
-                # We raise a PermissionDenied or return Response (GenericAPIView prefers exceptions usually)
-                raise serializers.ValidationError({"detail": "Only admins can invite users."})
-        except WorkspaceMember.DoesNotExist:
-             raise serializers.ValidationError({"detail": "You are not a member of this workspace."})
+        member = resolve_membership(self.request, workspace.id)
+        if not member.is_member:
+            raise serializers.ValidationError({"detail": "You are not a member of this workspace."})
+        if not member.is_admin:
+            # We raise a PermissionDenied or return Response (GenericAPIView prefers exceptions usually)
+            raise serializers.ValidationError({"detail": "Only admins can invite users."})
 
         # Save with the missing fields that aren't in the request body
         serializer.save(
@@ -133,19 +142,15 @@ class RemoveWorkspaceMemberView(generics.DestroyAPIView):
         workspace = get_object_or_404(Workspace, id=workspace_id)
         
         # 1. Get the member record of the requester (You)
-        try:
-            requester_membership = WorkspaceMember.objects.get(
-                workspace=workspace, 
-                user=request.user
-            )
-        except WorkspaceMember.DoesNotExist:
+        requester_membership = resolve_membership(request, workspace.id)
+        if not requester_membership.is_member:
             return Response(
                 {"error": "You are not a member of this workspace."}, 
                 status=status.HTTP_403_FORBIDDEN
             )
 
         # 2. Check if requester has permission (Admin/Owner only)
-        if requester_membership.role not in ['owner', 'admin']:
+        if not requester_membership.is_admin:
             return Response(
                 {"error": "Only admins and owners can remove members."}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -202,12 +207,8 @@ class LeaveWorkspaceView(generics.DestroyAPIView):
         workspace = get_object_or_404(Workspace, id=workspace_id)
         
         # 1. Find the membership for the current user
-        try:
-            membership = WorkspaceMember.objects.get(
-                workspace=workspace,
-                user=request.user
-            )
-        except WorkspaceMember.DoesNotExist:
+        membership = resolve_membership(request, workspace.id)
+        if not membership.is_member:
             return Response(
                 {"error": "You are not a member of this workspace."}, 
                 status=status.HTTP_404_NOT_FOUND
@@ -223,7 +224,7 @@ class LeaveWorkspaceView(generics.DestroyAPIView):
             )
 
         # 3. Process the leave action
-        membership.delete()
+        WorkspaceMember.objects.filter(workspace=workspace, user=request.user).delete()
 
         return Response(
             {"message": f"You have successfully left {workspace.name}."},
@@ -316,13 +317,11 @@ class WorkspaceImageUploadView(generics.UpdateAPIView):
         workspace = get_object_or_404(Workspace, id=workspace_id)
 
         # Only owner/admin
-        member = get_object_or_404(
-            WorkspaceMember,
-            workspace=workspace,
-            user=self.request.user,
-        )
+        member = resolve_membership(self.request, workspace.id)
+        if not member.is_member:
+            raise NotFound("You are not a member of this workspace.")
 
-        if member.role not in ["owner", "admin"]:
+        if not member.is_admin:
             raise permissions.PermissionDenied(
                 "You do not have permission to update this workspace."
             )
@@ -341,13 +340,11 @@ class WorkspaceMemberRoleView(APIView):
     def post(self, request, workspace_id, user_id):
         workspace = get_object_or_404(Workspace, id=workspace_id)
 
-        requester = get_object_or_404(
-            WorkspaceMember,
-            workspace=workspace,
-            user=request.user,
-        )
+        requester = resolve_membership(request, workspace.id)
+        if not requester.is_member:
+            raise NotFound("You are not a member of this workspace.")
 
-        if requester.role not in ["owner", "admin"]:
+        if not requester.is_admin:
             return Response(
                 {"error": "Only admins can update roles."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,114 @@
+# workspace/counter_services.py
+import threading
+
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Project, Task, Workspace
+
+
+def apply_task_counter_delta(project_id, tasks=0, completed=0):
+    """Atomically shifts the denormalized counters of one project (single UPDATE with F())."""
+    changes = {}
+    if tasks:
+        changes['task_count'] = F('task_count') + tasks
+    if completed:
+        changes['completed_count'] = F('completed_count') + completed
+    if changes:
+        Project.objects.filter(pk=project_id).update(**changes)
+
+
+_local = threading.local()
+
+
+def bump_workspace_version(workspace_id, project_id=None):
+    """
+    Marks the workspace (and project) as changed. Dashboard cache keys and
+    ETags are derived from these versions.
+
+    Inside a transaction the ids are only collected: every write of a
+    workspace would otherwise take the lock of its one Workspace row until
+    commit. They are bumped once, after the commit (one UPDATE with F() per
+    table); outside a transaction right away.
+    """
+    if not connection.in_atomic_block:
+        _bump_versions({workspace_id}, {project_id} - {None})
+        return
+
+    block = connection.atomic_blocks[0]
+    pending = getattr(_local, "pending", None)
+    if pending is None or pending["block"] is not block:
+        # Previous ids belonged to a block that never committed (rollback)
+        pending = {"block": block, "workspaces": set(), "projects": set()}
+        _local.pending = pending
+    pending["workspaces"].add(workspace_id)
+    if project_id:
+        pending["projects"].add(project_id)
+    # Registered on every call: callbacks of a rolled back savepoint are dropped,
+    # the first one that survives bumps everything, the rest find nothing left.
+    transaction.on_commit(_flush_pending_versions, robust=True)
+
+
+def _flush_pending_versions():
+    pending = getattr(_local, "pending", None)
+    _local.pending = None
+    if pending:
+        _bump_versions(pending["workspaces"], pending["projects"])
+
+
+def _bump_versions(workspace_ids, project_ids):
+    if workspace_ids:
+        Workspace.objects.filter(pk__in=workspace_ids).update(version=F('version') + 1)
+    if project_ids:
+        Project.objects.filter(pk__in=project_ids).update(version=F('version') + 1)
+
+
+def bump_member_workspaces_version(user_id):
+    """Every workspace `user_id` belongs to (their name/avatar is shown there)."""
+    Workspace.objects.filter(members__user_id=user_id).update(version=F('version') + 1)
+
+
+def get_workspace_version(workspace_id):
+    return Workspace.objects.filter(pk=workspace_id).values_list('version', flat=True).first()
+
+
+def _actual_counts():
+    tasks = Task.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    return {
+        'actual_tasks': Coalesce(
+            Subquery(tasks.annotate(c=Count('*')).values('c'), output_field=IntegerField()), 0
+        ),
+        'actual_completed': Coalesce(
+            Subquery(
+                tasks.filter(status=Task.StatusChoices.COMPLETED).annotate(c=Count('*')).values('c'),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+    }
+
+
+def reconcile_task_counters(project_ids=None, dry_run=False):
+    """
+    Recounts tasks for every project whose counters drifted and fixes them.
+    Returns the list of (project_id, stored, actual) tuples that were out of sync.
+    """
+    projects = Project.objects.all()
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+
+    drifted = list(
+        projects.annotate(**_actual_counts())
+        .filter(~Q(task_count=F('actual_tasks')) | ~Q(completed_count=F('actual_completed')))
+        .values_list('pk', 'task_count', 'completed_count', 'actual_tasks', 'actual_completed')
+    )
+
+    if not dry_run:
+        for pk, _, _, actual_tasks, actual_completed in drifted:
+            Project.objects.filter(pk=pk).update(task_count=actual_tasks, completed_count=actual_completed)
+
+    return [
+        (pk, (task_count, completed_count), (actual_tasks, actual_completed))
+        for pk, task_count, completed_count, actual_tasks, actual_completed in drifted
+    ]
@@ -0,0 +1,98 @@
+# workspace/dashboard_services.py
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Workspace, WorkspaceMember, Project, ProjectMember, Task, ActivityLog
+from .counter_services import get_workspace_version
+from .api import (
+    DashboardProjectSerializer,
+    DashboardTaskSerializer,
+    ActivityLogSerializer,
+    DashboardMemberSerializer,
+)
+from src.cache_aside import CacheAside
+
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 5
+
+# Keyed on Workspace.version -> never invalidated, old versions just expire
+dashboard_cache = CacheAside("workspace:dashboard", timeout=DASHBOARD_CACHE_TIMEOUT)
+
+
+# --- BUILD ---
+
+def _count(queryset, group_field):
+    """Correlated COUNT(*) subquery, so every total is computed in the workspace query."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_field).annotate(c=Count('*')).values('c'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def build_workspace_dashboard(workspace_id, user):
+    # 1. Workspace + all totals in one query
+    workspace = Workspace.objects.filter(id=workspace_id).annotate(
+        total_members=_count(WorkspaceMember.objects.filter(workspace=OuterRef('pk')), 'workspace'),
+        total_projects=_count(Project.objects.filter(workspace=OuterRef('pk')), 'workspace'),
+        total_tasks=Coalesce(Sum('projects__task_count'), 0),
+    ).first()
+
+    if workspace is None:
+        return None
+
+    # 2. Active Projects (+ collaborators with their profiles in one prefetch)
+    projects_queryset = Project.objects.filter(
+        workspace=workspace,
+        status__in=['active', 'planning']
+    ).prefetch_related(
+        Prefetch('members', queryset=ProjectMember.objects.select_related('user__profile'))
+    ).order_by('-updated_at')[:4]
+
+    # 3. "My Priorities" (Tasks assigned to ME)
+    my_tasks_queryset = Task.objects.filter(
+        project__workspace=workspace,
+        assigned_to=user,
+        status__in=['pending', 'in_progress']
+    ).select_related('project').order_by('due_date', '-created_at')[:5]
+
+    # 4. Recent Activity
+    activity_queryset = ActivityLog.objects.filter(
+        workspace=workspace
+    ).select_related('actor__profile').order_by('-created_at')[:10]
+
+    # 5. Recent Members (For the "Team" widget)
+    members_queryset = WorkspaceMember.objects.filter(
+        workspace=workspace
+    ).select_related('user__profile').order_by('-joined_at')[:5]
+
+    return {
+        "workspace_name": workspace.name,
+        "workspace_logo": workspace.logo.url if workspace.logo else None,
+        "workspace_description": workspace.description,
+        "total_members": workspace.total_members,
+        "total_projects": workspace.total_projects,
+        "total_tasks": workspace.total_tasks,
+        "active_projects": DashboardProjectSerializer(projects_queryset, many=True).data,
+        "my_tasks": DashboardTaskSerializer(my_tasks_queryset, many=True).data,
+        "activities": ActivityLogSerializer(activity_queryset, many=True).data,
+        "recent_members": DashboardMemberSerializer(members_queryset, many=True).data,
+    }
+
+
+def get_workspace_dashboard(workspace_id, user, version=None):
+    """
+    Cached per (workspace, user) under Workspace.version: every change inside
+    the workspace bumps it (bump_workspace_version), so all per-user dashboards
+    go stale at once without having to know which users have one cached.
+    """
+    if version is None:
+        version = get_workspace_version(workspace_id)
+    if version is None:
+        return None
+    return dashboard_cache.get_or_set(
+        workspace_id, version, user.id,
+        compute=lambda: build_workspace_dashboard(workspace_id, user),
+    )
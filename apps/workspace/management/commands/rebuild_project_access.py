@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from workspace.access_services import rebuild_project_access
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the ProjectAccess table (who can see which project) from memberships and visibility."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workspace", help="Only rebuild the projects of this workspace id.")
+
+    def handle(self, *args, **options):
+        count = rebuild_project_access(workspace_id=options.get("workspace"))
+        self.stdout.write(self.style.SUCCESS(f"Synced access for {count} project(s)."))
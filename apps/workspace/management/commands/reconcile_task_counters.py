@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from workspace.counter_services import reconcile_task_counters
+
+
+class Command(BaseCommand):
+    help = "Repairs drift in the denormalized Project.task_count / completed_count counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report drifted projects.")
+
+    def handle(self, *args, **options):
+        drifted = reconcile_task_counters(dry_run=options["dry_run"])
+
+        for pk, stored, actual in drifted:
+            self.stdout.write(f"{pk}: stored tasks/completed={stored}, actual={actual}")
+
+        verb = "Found" if options["dry_run"] else "Fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} drifted project(s)."))
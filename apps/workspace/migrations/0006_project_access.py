@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def backfill_project_access(apps, schema_editor):
+    Project = apps.get_model('workspace', 'Project')
+    WorkspaceMember = apps.get_model('workspace', 'WorkspaceMember')
+    ProjectAccess = apps.get_model('workspace', 'ProjectAccess')
+
+    for project in Project.objects.only('id', 'workspace_id', 'visibility').iterator():
+        members = WorkspaceMember.objects.filter(workspace_id=project.workspace_id)
+        if project.visibility != 'public':
+            members = members.filter(
+                Q(role__in=['owner', 'admin']) | Q(user__projectmember__project_id=project.id)
+            )
+        ProjectAccess.objects.bulk_create(
+            [
+                ProjectAccess(user_id=user_id, project_id=project.id, workspace_id=project.workspace_id)
+                for user_id in set(members.values_list('user_id', flat=True))
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0005_alter_activitylog_action_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_entries', to='workspace.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_access', to=settings.AUTH_USER_MODEL)),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='workspace.workspace')),
+            ],
+            options={
+                'db_table': 'project_access',
+                'indexes': [models.Index(fields=['user', 'workspace', 'project'], name='project_acc_user_id_5daaac_idx')],
+                'unique_together': {('user', 'project')},
+            },
+        ),
+        migrations.RunPython(backfill_project_access, migrations.RunPython.noop),
+    ]
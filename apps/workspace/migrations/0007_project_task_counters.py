@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:17
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_task_counters(apps, schema_editor):
+    Project = apps.get_model('workspace', 'Project')
+    Task = apps.get_model('workspace', 'Task')
+
+    tasks = Task.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    Project.objects.update(
+        task_count=Coalesce(
+            Subquery(tasks.annotate(c=Count('*')).values('c'), output_field=IntegerField()), 0
+        ),
+        completed_count=Coalesce(
+            Subquery(
+                tasks.filter(status='completed').annotate(c=Count('*')).values('c'),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0006_project_access'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
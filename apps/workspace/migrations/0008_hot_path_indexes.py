@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0007_project_task_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['workspace', 'created_at'], name='workspace_a_workspa_93e3cf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at'], name='workspace_c_task_id_12e1bb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'created_at'], name='tasks_project_6157fb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status', 'due_date'], name='tasks_assigne_b239d4_idx'),
+        ),
+    ]
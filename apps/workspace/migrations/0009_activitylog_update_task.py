@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0008_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='action_type',
+            field=models.CharField(choices=[('create_project', 'Created Project'), ('add_project_member', 'Added Project Member'), ('create_task', 'Created Task'), ('start_task', 'Started Task'), ('complete_task', 'Completed Task'), ('update_task', 'Updated Task'), ('comment', 'Commented')], max_length=20),
+        ),
+    ]
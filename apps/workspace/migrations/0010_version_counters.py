@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0009_activitylog_update_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+    ]
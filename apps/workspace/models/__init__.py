@@ -1,3 +1,3 @@
 from .workspace import Workspace, WorkspaceMember, WorkspaceChannel, WorkspaceInvitation, ActivityLog
-from .project import Project, ProjectMember
+from .project import Project, ProjectMember, ProjectAccess
 from .task import Task, Comment
\ No newline at end of file
@@ -37,6 +37,14 @@ class Project(models.Model):
     )
     visibility = models.CharField(max_length=10, choices=VISIBILITY_CHOICES, default='private')
 
+    # Denormalized counters, maintained by workspace/signals.py on Task changes
+    # (repair drift with `manage.py reconcile_task_counters`)
+    task_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+
+    # Incremented by writes to the project, its tasks, members and comments
+    version = models.PositiveBigIntegerField(default=1)
+
     created_by = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -54,6 +62,13 @@ class Project(models.Model):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored visibility so signals can tell when it changes
+        instance._loaded_visibility = instance.__dict__.get("visibility")
+        return instance
+
 
 class ProjectMember(models.Model):
     PERMISSION_CHOICES = (
@@ -83,3 +98,43 @@ class ProjectMember(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.project} - {self.permission}"
+
+
+class ProjectAccess(models.Model):
+    """
+    Materialized "who can see which project" table.
+
+    One row per (user, project) the user is allowed to see:
+    - every project for workspace owners/admins
+    - public projects for every workspace member
+    - private projects for their explicit members
+
+    Kept current by workspace/signals.py (see access_services.py), so
+    listing "projects I can see" is a single indexed join without DISTINCT.
+    """
+
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="access_entries",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="project_access",
+    )
+    workspace = models.ForeignKey(
+        Workspace,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+
+    class Meta:
+        db_table = "project_access"
+        unique_together = ("user", "project")
+        indexes = [
+            models.Index(fields=["user", "workspace", "project"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.project_id}"
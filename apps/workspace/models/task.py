@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 import uuid
 
@@ -73,16 +73,35 @@ class Task(models.Model):
     class Meta:
         db_table = "tasks"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "status", "created_at"]),  # Project board / status columns
+            models.Index(fields=["assigned_to", "status", "due_date"]),  # "My priorities"
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so signals can keep the project counters in sync
+        instance._loaded_status = instance.__dict__.get("status")
+        instance._loaded_project_id = instance.__dict__.get("project_id")
+        return instance
+
     def save(self, *args, **kwargs):
         if self.status == self.StatusChoices.COMPLETED and not self.completed_at:
             self.completed_at = timezone.now()
         elif self.status != self.StatusChoices.COMPLETED and self.completed_at:
             self.completed_at = None
-        super().save(*args, **kwargs)
+
+        # Atomic so the Project counter update (post_save) commits together with the task
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+        # post_save receivers compare against the previous state, refresh it only now
+        self._loaded_status = self.status
+        self._loaded_project_id = self.project_id
 
 
 class Comment(models.Model):
@@ -107,6 +126,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["task", "created_at"]),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.task.title}"
@@ -25,6 +25,10 @@ class Workspace(models.Model):
         default='private'
     )
 
+    # Incremented by every write inside the workspace (workspace/signals.py);
+    # drives the dashboard cache key and the ETags of workspace endpoints
+    version = models.PositiveBigIntegerField(default=1)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -124,6 +128,7 @@ class ActivityLog(models.Model):
         ('create_task', 'Created Task'),
         ('start_task', 'Started Task'),
         ('complete_task', 'Completed Task'),
+        ('update_task', 'Updated Task'),
         ('comment', 'Commented'),
     )
 
@@ -142,6 +147,9 @@ class ActivityLog(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['workspace', 'created_at']),  # Dashboard activity feed
+        ]
 
     def __str__(self):
         return f"{self.actor.username} - {self.action_type}"
\ No newline at end of file
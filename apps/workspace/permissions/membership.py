@@ -0,0 +1,195 @@
+from django.db.models import OuterRef, Subquery
+from src import acl_cache
+from ..models import Workspace, WorkspaceMember, ProjectMember
+
+
+ADMIN_ROLES = ('owner', 'admin')
+
+
+class Membership:
+    """
+    The resolved access of one user inside a workspace (and optionally a project).
+
+    - workspace_role: 'owner' / 'admin' / 'member' / 'guest' or None (not a member)
+    - project_permission: 'read' / 'write' or None (not a project member)
+    """
+
+    __slots__ = ('workspace_role', 'project_permission')
+
+    def __init__(self, workspace_role=None, project_permission=None):
+        self.workspace_role = workspace_role
+        self.project_permission = project_permission
+
+    @property
+    def role(self):
+        # Same attribute name as WorkspaceMember.role so older call sites keep working
+        return self.workspace_role
+
+    @property
+    def is_member(self):
+        return self.workspace_role is not None
+
+    @property
+    def is_admin(self):
+        return self.workspace_role in ADMIN_ROLES
+
+    @property
+    def is_project_member(self):
+        return self.project_permission is not None
+
+    def can_view_project(self, visibility):
+        if not self.is_member:
+            return False
+        if self.is_admin or self.is_project_member:
+            return True
+        return visibility == 'public'
+
+    def can_write_project(self):
+        return self.is_admin or self.project_permission == 'write'
+
+
+class MembershipResolver:
+    """
+    Loads workspace role + project permission for a user in ONE query and
+    memoizes the result for the lifetime of the request.
+
+    Every permission class, view and serializer that needs to know
+    "what can this user do here?" should go through this instead of
+    querying WorkspaceMember / ProjectMember directly.
+
+    Behind the per-request memo sits the shared ACL cache (src.acl_cache,
+    on with django-redis only), so most requests resolve membership without
+    touching the database.
+    When it does query, Workspace.version comes along in the same row
+    (see workspace_version()).
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._cache = {}
+        self._versions = {}
+
+    def get(self, workspace_id, project_id=None, user_id=None):
+        user_id = str(user_id or self.user.id)
+        workspace_id = str(workspace_id)
+        project_id = str(project_id) if project_id else None
+
+        key = (user_id, workspace_id, project_id)
+        if key in self._cache:
+            return self._cache[key]
+
+        workspace_key = (user_id, workspace_id, None)
+
+        # Not a workspace member -> cannot be a project member either, skip the query
+        if project_id and workspace_key in self._cache and not self._cache[workspace_key].is_member:
+            self._cache[key] = self._cache[workspace_key]
+            return self._cache[key]
+
+        # Workspace-only lookups can reuse any project lookup already done for this workspace
+        if project_id is None:
+            for (cached_user, cached_workspace, _), membership in self._cache.items():
+                if cached_user == user_id and cached_workspace == workspace_id:
+                    self._cache[key] = Membership(membership.workspace_role)
+                    return self._cache[key]
+
+        membership = self._load(workspace_id, project_id, user_id)
+        self._cache[key] = membership
+        if project_id:
+            self._cache.setdefault(workspace_key, Membership(membership.workspace_role))
+        return membership
+
+    def workspace_version(self, workspace_id):
+        """
+        Workspace.version as of this request (ETags, dashboard cache keys).
+        Free after a membership query; one pk lookup after an ACL cache hit.
+        """
+        workspace_id = str(workspace_id)
+        if workspace_id not in self._versions:
+            self._versions[workspace_id] = (
+                Workspace.objects.filter(pk=workspace_id).values_list('version', flat=True).first()
+            )
+        return self._versions[workspace_id]
+
+    def _load(self, workspace_id, project_id, user_id):
+        workspace_key = acl_cache.acl_key("workspace", workspace_id, user_id)
+        project_key = acl_cache.acl_key("project", project_id, user_id) if project_id else None
+
+        cached = acl_cache.get_many([k for k in (workspace_key, project_key) if k])
+        membership = self._from_cache(cached, workspace_key, project_key, workspace_id)
+        if membership is not None:
+            return membership
+
+        membership = self._query(workspace_id, project_id, user_id)
+
+        entries = {workspace_key: membership.workspace_role or acl_cache.NOT_A_MEMBER}
+        if project_key and membership.is_member:
+            # The workspace is stored with the permission so a project can never be
+            # "reached" through a different workspace URL than the one it belongs to.
+            entries[project_key] = f"{workspace_id}|{membership.project_permission or ''}"
+        acl_cache.set_many(entries)
+
+        return membership
+
+    def _from_cache(self, cached, workspace_key, project_key, workspace_id):
+        if workspace_key not in cached:
+            return None
+
+        role = cached[workspace_key] or None
+        if role is None or project_key is None:
+            return Membership(role)
+
+        if project_key not in cached:
+            return None
+
+        cached_workspace, _, permission = cached[project_key].partition("|")
+        if cached_workspace != workspace_id:
+            return None
+        return Membership(role, permission or None)
+
+    def _query(self, workspace_id, project_id, user_id):
+        queryset = WorkspaceMember.objects.filter(workspace_id=workspace_id, user_id=user_id)
+
+        if project_id:
+            queryset = queryset.annotate(
+                project_permission=Subquery(
+                    ProjectMember.objects.filter(
+                        project_id=project_id,
+                        project__workspace_id=OuterRef('workspace_id'),
+                        user_id=user_id,
+                    ).values('permission')[:1]
+                )
+            )
+            row = queryset.values_list('role', 'project_permission', 'workspace__version').first()
+        else:
+            row = queryset.values_list('role', 'workspace__version').first()
+            row = (row[0], None, row[1]) if row else None
+
+        if not row:
+            return Membership()
+        role, permission, version = row
+        self._versions.setdefault(workspace_id, version)
+        return Membership(role, permission)
+
+
+def get_membership_resolver(request):
+    """Returns the resolver attached to this request, creating it on first use."""
+    resolver = getattr(request, 'workspace_memberships', None)
+    if resolver is None:
+        resolver = MembershipResolver(request.user)
+        request.workspace_memberships = resolver
+    return resolver
+
+
+def resolve_workspace_version(request, workspace_id):
+    """Shortcut for get_membership_resolver(request).workspace_version(...)."""
+    return get_membership_resolver(request).workspace_version(workspace_id)
+
+
+def resolve_membership(request, workspace_id, project_id=None, user_id=None):
+    """
+    Shortcut for get_membership_resolver(request).get(...).
+
+    Pass `user_id` to check someone other than the requester
+    (e.g. validating an assignee); it is memoized the same way.
+    """
+    return get_membership_resolver(request).get(workspace_id, project_id, user_id)
@@ -1,6 +1,5 @@
 from rest_framework import permissions
-from django.shortcuts import get_object_or_404
-from ..models import WorkspaceMember, ProjectMember, Workspace
+from .membership import resolve_membership
 
 class IsWorkspaceMemberOrAdmin(permissions.BasePermission):
     """
@@ -24,22 +23,16 @@ class IsWorkspaceMemberOrAdmin(permissions.BasePermission):
             return True
 
         # Check if user is a member of this workspace
-        return WorkspaceMember.objects.filter(
-            workspace_id=workspace_id, 
-            user=request.user
-        ).exists()
+        return resolve_membership(request, workspace_id).is_member
 
     def has_object_permission(self, request, view, obj):
         # This is called when view.get_object() runs.
         # 'obj' is the actual Workspace instance.
 
-        # 1. Verify Membership again (Safeguard)
-        membership = WorkspaceMember.objects.filter(
-            workspace=obj, 
-            user=request.user
-        ).first()
+        # 1. Verify Membership again (Safeguard, memoized so no extra query)
+        membership = resolve_membership(request, obj.id)
 
-        if not membership:
+        if not membership.is_member:
             return False
 
         # 2. Safe Methods (GET, HEAD, OPTIONS) -> Allow any member
@@ -47,7 +40,7 @@ class IsWorkspaceMemberOrAdmin(permissions.BasePermission):
             return True
 
         # 3. Unsafe Methods (PUT, DELETE) -> Must be Admin or Owner
-        return membership.role in ['admin', 'owner']
+        return membership.is_admin
 
 
 class IsProjectCollaboratorOrWorkspaceAdmin(permissions.BasePermission):
@@ -66,12 +59,10 @@ class IsProjectCollaboratorOrWorkspaceAdmin(permissions.BasePermission):
         workspace_id = view.kwargs.get('workspace_id')
         
         if workspace_id:
-            is_workspace_member = WorkspaceMember.objects.filter(
-                workspace_id=workspace_id, 
-                user=request.user
-            ).exists()
-            
-            if not is_workspace_member:
+            # Resolve the project permission in the same query when the URL names a project,
+            # so has_object_permission / the view body get it for free.
+            project_id = view.kwargs.get('project_id') or view.kwargs.get('pk')
+            if not resolve_membership(request, workspace_id, project_id).is_member:
                 return False
                 
         return True
@@ -79,18 +70,15 @@ class IsProjectCollaboratorOrWorkspaceAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         # 'obj' here is the PROJECT instance
         
-        # Fetch the user's role in the PARENT workspace
-        workspace_membership = WorkspaceMember.objects.filter(
-            workspace=obj.workspace,
-            user=request.user
-        ).first()
+        # Fetch the user's role in the PARENT workspace (+ project permission)
+        membership = resolve_membership(request, obj.workspace_id, obj.id)
 
-        if not workspace_membership:
+        if not membership.is_member:
             return False
 
         # 1. ADMIN/OWNER OVERRIDE
         # If user is Workspace Admin/Owner, they can do ANYTHING to the project
-        if workspace_membership.role in ['admin', 'owner']:
+        if membership.is_admin:
             return True
 
         # 2. WRITE Access (Update/Delete Project)
@@ -100,20 +88,8 @@ class IsProjectCollaboratorOrWorkspaceAdmin(permissions.BasePermission):
             return False
 
         # 3. READ Access (Viewing the project)
-        # Check if they are explicitly added to the project
-        is_project_collaborator = ProjectMember.objects.filter(
-            project=obj,
-            user=request.user
-        ).exists()
-
         # Allow access if they are a collaborator OR if the project is visible to the whole workspace
-        if is_project_collaborator:
-            return True
-            
-        if obj.visibility == 'public':
-            return True
-
-        return False
+        return membership.can_view_project(obj.visibility)
 
 class IsTaskCollaboratorOrProjectAdmin(permissions.BasePermission):
     """
@@ -137,31 +113,22 @@ class IsTaskCollaboratorOrProjectAdmin(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # 'obj' is the TASK instance
-        project = obj.project
-        workspace = project.workspace
+        workspace_id = view.kwargs.get('workspace_id') or obj.project.workspace_id
 
-        # 1. Fetch Workspace Membership (The absolute prerequisite)
-        workspace_member = WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=request.user
-        ).first()
+        # 1. Fetch Workspace Membership + Project Membership (one memoized query)
+        membership = resolve_membership(request, workspace_id, obj.project_id)
 
-        if not workspace_member:
+        if not membership.is_member:
             return False
 
         # 2. ADMIN/OWNER OVERRIDE (Workspace Level)
         # If user is Workspace Admin/Owner, they have full control over tasks.
-        if workspace_member.role in ['admin', 'owner']:
+        if membership.is_admin:
             return True
 
         # 3. Check Project Membership
         # User must be explicitly added to the project to interact with tasks
-        project_member = ProjectMember.objects.filter(
-            project=project,
-            user=request.user
-        ).first()
-
-        if not project_member:
+        if not membership.is_project_member:
             return False
 
         # 4. READ Access (Safe Methods: GET, HEAD, OPTIONS)
@@ -171,5 +138,4 @@ class IsTaskCollaboratorOrProjectAdmin(permissions.BasePermission):
 
         # 5. WRITE Access (Unsafe Methods: PUT, PATCH, DELETE)
         # Check if the project member specifically has 'write' permission.
-        # NOTE: Adjust 'permission' to whatever field name you use (e.g., 'role', 'access_level')
-        return project_member.permission == 'write'
\ No newline at end of file
+        return membership.project_permission == 'write'
\ No newline at end of file
@@ -1,5 +1,6 @@
 from rest_framework import permissions
-from ..models import WorkspaceMember, Workspace
+from ..models import Workspace
+from .membership import resolve_membership
 
 
 
@@ -33,13 +34,10 @@ class IsWorkspaceMember(permissions.BasePermission):
 
         workspace = obj if isinstance(obj, Workspace) else obj.workspace
 
-        if workspace.owner == request.user:
+        if workspace.owner_id == request.user.id:
             return True
 
-        return WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=request.user
-        ).exists()
+        return resolve_membership(request, workspace.id).is_member
 
 
 class IsWorkspaceAdmin(permissions.BasePermission):
@@ -63,14 +61,10 @@ class IsWorkspaceAdmin(permissions.BasePermission):
         workspace = get_workspace_from_obj(obj)
 
         # Workspace owner always has admin rights
-        if workspace.owner == request.user:
+        if workspace.owner_id == request.user.id:
             return True
 
-        return WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=request.user,
-            role="admin"
-        ).exists()
+        return resolve_membership(request, workspace.id).is_admin
 
 
 class IsWorkspaceOwner(permissions.BasePermission):
@@ -91,4 +85,4 @@ class IsWorkspaceOwner(permissions.BasePermission):
             return True
 
         workspace = get_workspace_from_obj(obj)
-        return workspace.owner == request.user
+        return workspace.owner_id == request.user.id
@@ -1,35 +1,150 @@
 # workspace/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Project, Task, ActivityLog, WorkspaceMember
+from src import acl_cache
+from users.models import Profile
+from .models import Comment, Project, Task, Workspace, WorkspaceMember, ProjectMember
+from .access_services import sync_project_access, sync_user_access
+from .counter_services import (
+    apply_task_counter_delta, bump_member_workspaces_version, bump_workspace_version, reconcile_task_counters,
+)
+from .activity_services import record_activity
+
+# Services record the same events with the acting user; record_activity keeps
+# one entry per (target, action) per transaction, so nothing is logged twice.
 
 @receiver(post_save, sender=Task)
 def log_task_activity(sender, instance, created, **kwargs):
+    workspace_id = instance.project.workspace_id
     if created:
-        ActivityLog.objects.create(
-            workspace=instance.project.workspace,
-            actor=instance.created_by,
-            action_type='create_task',
-            target_id=instance.id,
-            target_text=instance.title
-        )
-    elif instance.status == 'completed' and instance.completed_at:
-        # Avoid duplicate logs if saved multiple times
-        ActivityLog.objects.create(
-            workspace=instance.project.workspace,
-            actor=instance.assigned_to or instance.created_by, # Fallback
-            action_type='complete_task',
-            target_id=instance.id,
-            target_text=instance.title
-        )
+        record_activity(workspace_id, instance.created_by, 'create_task', instance.id, instance.title)
+    elif instance.status == 'completed' and getattr(instance, '_loaded_status', None) != 'completed':
+        # Only on the transition, not on every later save of a completed task
+        actor = instance.assigned_to or instance.created_by  # Fallback
+        record_activity(workspace_id, actor, 'complete_task', instance.id, instance.title)
 
 @receiver(post_save, sender=Project)
 def log_project_creation(sender, instance, created, **kwargs):
     if created:
-        ActivityLog.objects.create(
-            workspace=instance.workspace,
-            actor=instance.created_by,
-            action_type='create_project',
-            target_id=instance.id,
-            target_text=instance.title
-        )
\ No newline at end of file
+        record_activity(instance.workspace_id, instance.created_by, 'create_project', instance.id, instance.title)
+
+
+# --- ACL CACHE INVALIDATION ---
+
+@receiver([post_save, post_delete], sender=WorkspaceMember)
+def invalidate_workspace_acl(sender, instance, **kwargs):
+    acl_cache.invalidate('workspace', instance.workspace_id, instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=ProjectMember)
+def invalidate_project_acl(sender, instance, **kwargs):
+    acl_cache.invalidate('project', instance.project_id, instance.user_id)
+
+
+# --- PROJECT ACCESS TABLE ---
+
+def _deleted_with_parent(origin, *parents):
+    """True when the row is being removed by the cascade of a Project/Workspace (or `parents`) delete."""
+    model = getattr(origin, 'model', type(origin))
+    return model in (Project, Workspace, *parents)
+
+
+@receiver(post_save, sender=Project)
+def sync_access_on_project_save(sender, instance, created, **kwargs):
+    if created or instance.visibility != getattr(instance, '_loaded_visibility', None):
+        sync_project_access(instance)
+        instance._loaded_visibility = instance.visibility
+
+
+@receiver(post_save, sender=WorkspaceMember)
+def sync_access_on_workspace_member_save(sender, instance, **kwargs):
+    sync_user_access(instance.workspace_id, instance.user_id)
+
+
+@receiver(post_delete, sender=WorkspaceMember)
+def sync_access_on_workspace_member_delete(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        sync_user_access(instance.workspace_id, instance.user_id)
+
+
+@receiver(post_save, sender=ProjectMember)
+def sync_access_on_project_member_save(sender, instance, **kwargs):
+    sync_user_access(instance.project.workspace_id, instance.user_id, project_id=instance.project_id)
+
+
+@receiver(post_delete, sender=ProjectMember)
+def sync_access_on_project_member_delete(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        sync_user_access(instance.project.workspace_id, instance.user_id, project_id=instance.project_id)
+
+
+# --- PROJECT TASK COUNTERS ---
+# Task.save() wraps the write in a transaction and post_delete runs inside the
+# deletion transaction, so the counters always commit together with the task.
+
+def _is_completed(status):
+    return 1 if status == Task.StatusChoices.COMPLETED else 0
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_task_save(sender, instance, created, **kwargs):
+    if created:
+        apply_task_counter_delta(instance.project_id, tasks=1, completed=_is_completed(instance.status))
+    elif not hasattr(instance, '_loaded_status'):
+        # Instance not loaded from the DB -> previous state unknown, recount
+        reconcile_task_counters(project_ids=[instance.project_id])
+    elif instance._loaded_project_id != instance.project_id:
+        apply_task_counter_delta(instance._loaded_project_id, tasks=-1, completed=-_is_completed(instance._loaded_status))
+        apply_task_counter_delta(instance.project_id, tasks=1, completed=_is_completed(instance.status))
+    else:
+        delta = _is_completed(instance.status) - _is_completed(instance._loaded_status)
+        apply_task_counter_delta(instance.project_id, completed=delta)
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_task_delete(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        apply_task_counter_delta(instance.project_id, tasks=-1, completed=-_is_completed(instance.status))
+
+
+# --- VERSION COUNTERS (dashboard cache, ETags) ---
+# Cascades from a Workspace/Project delete are skipped: the rows being
+# bumped are going away too.
+
+@receiver(post_save, sender=Workspace)
+def bump_version_on_workspace_change(sender, instance, created, **kwargs):
+    if not created:
+        bump_workspace_version(instance.id)
+
+
+@receiver(post_save, sender=Project)
+def bump_version_on_project_change(sender, instance, created, **kwargs):
+    bump_workspace_version(instance.workspace_id, None if created else instance.id)
+
+
+@receiver(post_delete, sender=Project)
+@receiver([post_save, post_delete], sender=WorkspaceMember)
+def bump_version(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        bump_workspace_version(instance.workspace_id)
+
+
+@receiver([post_save, post_delete], sender=Task)
+@receiver([post_save, post_delete], sender=ProjectMember)
+def bump_version_on_project_child_change(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin):
+        bump_workspace_version(instance.project.workspace_id, instance.project_id)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def bump_version_on_comment_change(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin, Task):
+        task = instance.task
+        bump_workspace_version(task.project.workspace_id, task.project_id)
+
+
+@receiver(post_save, sender=Profile)
+def bump_version_on_profile_change(sender, instance, created, **kwargs):
+    # Names/avatars appear in member lists and dashboards
+    if not created:
+        bump_member_workspaces_version(instance.user_id)
@@ -0,0 +1,10 @@
+# workspace/tasks.py
+from celery import shared_task
+
+from .activity_services import write_activity_entries
+
+
+@shared_task(ignore_result=True)
+def write_activity_logs(entries):
+    """Deferred ActivityLog batch (see activity_services.record_activity)."""
+    write_activity_entries(entries, bump_versions=True)
@@ -1,7 +1,13 @@
 # workspace/services.py
+from collections import Counter
 from django.db import transaction
-from .models import Task, ActivityLog, Project, ProjectMember, WorkspaceMember, Comment
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from .models import Task, Project, ProjectMember, Comment
+from .activity_services import record_activity
+from .counter_services import apply_task_counter_delta, bump_workspace_version
 from notifications.notification_services import NotificationService
+from users.models import User
 from django.utils import timezone
 
 
@@ -22,26 +28,23 @@ def create_project_service(user, workspace, project_data):
         )
 
         # 3. Log Activity
-        ActivityLog.objects.create(
-            workspace=workspace,
-            actor=user,
-            action_type='create_project',
-            target_id=project.id,
-            target_text=project.title
+        record_activity(
+            workspace.id,
+            user,
+            'create_project',
+            project.id,
+            project.title,
         )
 
         # 4. Notify All Workspace Members (If configured to do so)
         # Usually, we only notify everyone if the project is PUBLIC.
         if project.visibility == 'public':
-            # Get all user objects in this workspace (excluding the creator)
-            members = WorkspaceMember.objects.filter(
-                workspace=workspace
-            ).exclude(user=user).select_related('user')
-            
-            recipients = [m.user for m in members]
-
+            # Every workspace member (except the creator), fanned out after commit
             NotificationService.send_bulk_notification(
-                recipients=recipients,
+                audience={
+                    "model": "workspace.WorkspaceMember",
+                    "filters": {"workspace_id": str(workspace.id)},
+                },
                 actor=user,
                 title="New Project Created",
                 message=f"{user.profile.username} created a new project: {project.title}",
@@ -62,12 +65,12 @@ def start_task_service(user, task):
         task.save()
 
         # 2. Log Activity
-        ActivityLog.objects.create(
-            workspace=task.project.workspace,
-            actor=user,
-            action_type='start_task',
-            target_id=task.id,
-            target_text=task.title
+        record_activity(
+            task.project.workspace_id,
+            user,
+            'start_task',
+            task.id,
+            task.title,
         )
         
         # 3. Notification (Optional: Notify Creator if different from Starter)
@@ -92,12 +95,12 @@ def complete_task_service(user, task):
         task.completed_at = timezone.now()
         task.save()
 
-        ActivityLog.objects.create(
-            workspace=task.project.workspace,
-            actor=user,
-            action_type='complete_task',
-            target_id=task.id,
-            target_text=task.title
+        record_activity(
+            task.project.workspace_id,
+            user,
+            'complete_task',
+            task.id,
+            task.title,
         )
 
         # Notify Creator (if it wasn't them)
@@ -126,12 +129,12 @@ def add_project_member_service(actor, project, target_user, role='read'):
         )
 
         # 2. Log Activity
-        ActivityLog.objects.create(
-            workspace=project.workspace,
-            actor=actor,
-            action_type='add_project_member',
-            target_id=project.id,
-            target_text=f"{target_user.profile.username} to {project.title}"
+        record_activity(
+            project.workspace_id,
+            actor,
+            'add_project_member',
+            project.id,
+            f"{target_user.profile.username} to {project.title}",
         )
 
         # 3. Notify the New Member
@@ -157,12 +160,12 @@ def create_comment_service(user, task, content):
         )
 
         # 2. Log Activity
-        ActivityLog.objects.create(
-            workspace=task.project.workspace,
-            actor=user,
-            action_type='comment',
-            target_id=task.id,
-            target_text=f"Comment on {task.title}"
+        record_activity(
+            task.project.workspace_id,
+            user,
+            'comment',
+            task.id,
+            f"Comment on {task.title}",
         )
 
         # 3. Notify Relevant People (Assignee + Creator)
@@ -180,7 +183,98 @@ def create_comment_service(user, task, content):
                 title="New Comment",
                 message=f"{user.profile.username} commented on {task.title}",
                 target_obj=task,
-                category='comment_mention'
+                category='comment_mention',
+                coalesce_on=task, # Busy threads -> one row per task
             )
             
-    return comment
\ No newline at end of file
+    return comment
+
+# --- BULK TASK SERVICES ---
+
+def _bulk_activity_action(new_status, old_status):
+    if new_status == Task.StatusChoices.COMPLETED and old_status != new_status:
+        return 'complete_task'
+    if new_status == Task.StatusChoices.IN_PROGRESS and old_status != new_status:
+        return 'start_task'
+    return 'update_task'
+
+
+def bulk_update_tasks_service(user, project, task_ids, changes):
+    """
+    Applies one change set (status / priority / due_date / assigned_to_id) to many
+    tasks of a project with a single UPDATE, then does the bookkeeping Task.save()
+    and its signals would have done per task: counters, activity, notifications.
+    Returns the ids of the updated tasks.
+    """
+    status = changes.get('status')
+    completed = Task.StatusChoices.COMPLETED
+
+    with transaction.atomic():
+        # 1. Previous state of the affected tasks (locked until commit)
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(project=project, id__in=task_ids)
+            .values('id', 'title', 'status', 'assigned_to_id', 'created_by_id')
+        )
+        if not tasks:
+            return []
+        ids = [t['id'] for t in tasks]
+
+        # 2. One UPDATE (keeps completed_at consistent like Task.save does)
+        now = timezone.now()
+        update = dict(changes, updated_at=now)
+        if status == completed:
+            update['completed_at'] = Coalesce('completed_at', Value(now))
+        elif status is not None:
+            update['completed_at'] = None
+        Task.objects.filter(id__in=ids).update(**update)
+
+        # 3. Project counters
+        if status is not None:
+            was_completed = sum(1 for t in tasks if t['status'] == completed)
+            apply_task_counter_delta(
+                project.id, completed=(len(tasks) if status == completed else 0) - was_completed
+            )
+
+        # 4. Activity (buffered -> one bulk_create on commit)
+        for t in tasks:
+            record_activity(project.workspace_id, user, _bulk_activity_action(status, t['status']), t['id'], t['title'])
+
+        # 5. One coalesced notification per recipient
+        assigned = Counter()
+        if changes.get('assigned_to_id'):
+            assignee_id = changes['assigned_to_id']
+            assigned[assignee_id] = sum(1 for t in tasks if t['assigned_to_id'] != assignee_id)
+        finished = Counter(
+            t['created_by_id'] for t in tasks
+            if status == completed and t['status'] != completed and t['created_by_id']
+        )
+        _notify_bulk_change(user, project, assigned, finished)
+
+    bump_workspace_version(project.workspace_id, project.id)
+    return ids
+
+
+def _notify_bulk_change(user, project, assigned, finished):
+    recipient_ids = {pk for pk, n in (assigned + finished).items() if n and pk != user.id}
+    if not recipient_ids:
+        return
+
+    username = user.profile.username
+    for recipient in User.objects.filter(id__in=recipient_ids):
+        # Both changes for the same person go into a single message
+        parts = []
+        if assigned[recipient.id]:
+            parts.append(f"assigned you {assigned[recipient.id]} task(s)")
+        if finished[recipient.id]:
+            parts.append(f"completed {finished[recipient.id]} of your task(s)")
+
+        NotificationService.send_notification(
+            recipient=recipient,
+            actor=user,
+            title="Tasks Updated",
+            message=f"{username} {' and '.join(parts)} in {project.title}",
+            target_obj=project,
+            category='task_assigned' if assigned[recipient.id] else 'task_completed',
+            coalesce_on=project,
+        )
@@ -0,0 +1,67 @@
+"""
+Cross-request cache of membership roles.
+
+    (user, workspace) -> role
+    (user, project)   -> permission
+    (user, community) -> role
+
+Entries live in the hot two-tier cache (per-worker LRU over django-redis,
+see src/two_tier_cache.py) and are dropped by the post_save / post_delete
+signals of the membership models, so a role change is visible on the very
+next request in every worker. Non-members are cached as well
+(NOT_A_MEMBER) because "access denied" lookups are just as frequent.
+
+That only holds for a cache shared by every worker: with a per-process cache
+(LocMem) an invalidation would miss the other workers, which would keep
+granting a removed member's role until the entry expires. The cache is
+therefore off unless the default cache is django-redis (ACL_CACHE_ENABLED
+overrides), and roles are then only memoized per request.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .metrics import record_cache
+from .two_tier_cache import get_hot_cache
+
+
+ACL_CACHE_TIMEOUT = getattr(settings, "ACL_CACHE_TIMEOUT", 60 * 10)
+
+NOT_A_MEMBER = ""
+
+
+def enabled():
+    setting = getattr(settings, "ACL_CACHE_ENABLED", None)
+    if setting is not None:
+        return setting
+    return settings.CACHES["default"]["BACKEND"].startswith("django_redis")
+
+
+def acl_key(scope, object_id, user_id):
+    return f"acl:{scope}:{object_id}:{user_id}"
+
+
+def get_many(keys):
+    """Returns {key: value} for the keys that are cached."""
+    if not enabled():
+        return {}
+    found = get_hot_cache().get_many(keys)
+    record_cache(hits=len(found), misses=len(keys) - len(found))
+    return found
+
+
+def set_many(mapping):
+    if not enabled():
+        return
+    get_hot_cache().set_many(mapping, timeout=ACL_CACHE_TIMEOUT)
+
+
+def invalidate(scope, object_id, user_id):
+    """
+    Drops one cached entry now, and again once the current transaction
+    commits (a reader in between would otherwise re-cache the old role).
+    """
+    if not enabled():
+        return
+    key = acl_key(scope, object_id, user_id)
+    get_hot_cache().delete(key)
+    transaction.on_commit(lambda: get_hot_cache().delete(key))
@@ -3,6 +3,10 @@ ASGI config for src project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+HTTP goes to Django; WebSocket connections on /ws/notifications/ are served by
+the realtime notification endpoint (run under an ASGI server, e.g.
+uvicorn or gunicorn with uvicorn workers).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +17,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.settings.prod')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up (needs settings + apps)
+from notifications.websocket import WEBSOCKET_PATH, notifications_websocket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        if scope["path"] == WEBSOCKET_PATH:
+            return await notifications_websocket(scope, receive, send)
+        # Unknown socket route: refuse the handshake
+        await receive()
+        return await send({"type": "websocket.close", "code": 4404})
+    return await django_application(scope, receive, send)
@@ -0,0 +1,142 @@
+"""
+Cache-aside for views and services.
+
+    profile_cache = CacheAside("users:profile", timeout=300)
+
+    profile_cache.get_or_set(user_id, compute=build)  -> cached or freshly built value
+    profile_cache.invalidate(user_id)                 -> drops one entry (now and on commit)
+    profile_cache.invalidate_all()                    -> bumps the namespace version
+
+Keys are `cache:{namespace}:v{version}:{parts}`. The namespace version lives
+in the cache as well, so invalidate_all() orphans every entry of the namespace
+at once (they simply expire).
+
+Entries are stored as (value, fresh_until) and kept `stale_timeout` seconds
+past freshness. Against stampedes, one caller per key recomputes, chosen by a
+lock taken with cache.add():
+    - stale entry   -> the lock winner recomputes, everyone else is served the
+                       stale value meanwhile (stale-while-revalidate)
+    - missing entry -> the lock winner computes, the others wait for its result
+                       (up to `lock_timeout`) instead of all hitting the database
+
+CachedRetrieveMixin plugs this into DRF retrieve views. Writes made outside
+those views invalidate from model signals (e.g. users/signals.py).
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .metrics import record_cache
+from .two_tier_cache import get_hot_cache
+
+
+class CacheAside:
+    def __init__(self, namespace, timeout=300, stale_timeout=60, lock_timeout=5, wait_interval=0.05, hot=False):
+        self.namespace = namespace
+        self.hot = hot
+        self.timeout = timeout
+        self.stale_timeout = stale_timeout
+        self.lock_timeout = lock_timeout
+        self.wait_interval = wait_interval
+
+    @property
+    def cache(self):
+        # hot=True: the per-worker two-tier cache (src/two_tier_cache.py)
+        return get_hot_cache() if self.hot else cache
+
+    # --- KEYS ---
+
+    def _version_key(self):
+        return f"cache:{self.namespace}:version"
+
+    def key(self, *parts):
+        version = self.cache.get(self._version_key(), 1)
+        return f"cache:{self.namespace}:v{version}:" + ":".join(str(part) for part in parts)
+
+    @staticmethod
+    def _lock_key(key):
+        return f"{key}:lock"
+
+    # --- READ ---
+
+    def get_or_set(self, *parts, compute):
+        key = self.key(*parts)
+        entry = self.cache.get(key)
+        record_cache(hits=entry is not None, misses=entry is None)
+
+        if entry is not None:
+            value, fresh_until = entry
+            if fresh_until > time.time() or not self._acquire(key):
+                return value
+            return self._refresh(key, compute)
+
+        if self._acquire(key):
+            return self._refresh(key, compute)
+        return self._wait(key, compute)
+
+    def _acquire(self, key):
+        return self.cache.add(self._lock_key(key), 1, timeout=self.lock_timeout)
+
+    def _refresh(self, key, compute):
+        try:
+            value = compute()
+            self.cache.set(key, (value, time.time() + self.timeout), timeout=self.timeout + self.stale_timeout)
+        finally:
+            self.cache.delete(self._lock_key(key))
+        return value
+
+    def _wait(self, key, compute):
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.wait_interval)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry[0]
+            # The winner failed (or was invalidated) without storing anything
+            if self.cache.get(self._lock_key(key)) is None:
+                break
+        return compute()
+
+    # --- INVALIDATE ---
+
+    def invalidate(self, *parts):
+        """
+        Drops one entry now, and again once the current transaction commits
+        (a reader in between would otherwise re-cache the old value).
+        """
+        key = self.key(*parts)
+        self.cache.delete(key)
+        transaction.on_commit(lambda: self.cache.delete(key))
+
+    def invalidate_all(self):
+        try:
+            self.cache.incr(self._version_key())
+        except ValueError:
+            self.cache.add(self._version_key(), 2, timeout=None)
+
+
+class CachedRetrieveMixin:
+    """
+    Serves GET through `cache_aside`, keyed by get_cache_parts().
+    Any successful write through the same view drops that entry.
+    """
+
+    cache_aside = None
+
+    def get_cache_parts(self):
+        raise NotImplementedError
+
+    def retrieve(self, request, *args, **kwargs):
+        def compute():
+            return super(CachedRetrieveMixin, self).retrieve(request, *args, **kwargs).data
+
+        return Response(self.cache_aside.get_or_set(*self.get_cache_parts(), compute=compute))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in SAFE_METHODS and status.is_success(response.status_code):
+            self.cache_aside.invalidate(*self.get_cache_parts())
+        return super().finalize_response(request, response, *args, **kwargs)
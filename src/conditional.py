@@ -0,0 +1,70 @@
+"""
+Conditional GET (ETag / If-None-Match) driven by version counters.
+
+Views return the version of the data they serve from `get_etag_version()`
+(e.g. Workspace.version, which every write inside the workspace increments);
+None disables the ETag for that request. The ETag hashes the version with the
+view, the user and the full path (page, cursor, fields...), so it changes
+whenever the response could.
+
+A matching If-None-Match is answered with 304 right after authentication and
+the permission checks, before the handler runs its queries or serializers.
+"""
+import hashlib
+
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class NotModified(Exception):
+    pass
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+class ConditionalGetMixin:
+    etag = None
+
+    def get_etag_version(self):
+        return None
+
+    def compute_etag(self, request, version):
+        raw = ":".join([
+            type(self).__name__,
+            str(getattr(self, "action", None) or ""),
+            str(version),
+            str(request.user.pk),
+            request.get_full_path(),
+        ])
+        return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        version = self.get_etag_version()
+        if version is None:
+            return
+        self.etag = self.compute_etag(request, version)
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and self.etag in {_strip_weak(tag) for tag in parse_etags(if_none_match)}:
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": self.etag})
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag and response.status_code in (200, 304):
+            response["ETag"] = self.etag
+            # Per-user content: browsers may keep it, but must revalidate
+            response["Cache-Control"] = "private, no-cache"
+        return response
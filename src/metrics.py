@@ -0,0 +1,254 @@
+"""
+Per-endpoint request metrics in the Prometheus text format.
+
+MetricsMiddleware records, per resolved URL name (`view`):
+
+    http_requests_total{view, method, status}   counter
+    http_request_duration_seconds{view}         histogram
+    db_queries_total{view}                      counter (execute_wrapper on every connection)
+    db_query_duration_seconds_total{view}       counter
+    cache_hits_total{view} / cache_misses_total{view}
+                                                lookups reported by the cache helpers
+                                                (record_cache: cache-aside, ACL, user cards)
+
+Each worker aggregates in memory (a dict update under a lock per request)
+and, with METRICS_DIR set, writes its totals to `METRICS_DIR/metrics-<pid>.json`
+at most every METRICS_FLUSH_INTERVAL seconds. GET /metrics merges the files of
+every worker sharing the directory (files of exited workers are removed, so
+a restart does not count them twice); without METRICS_DIR it reports the
+serving process only. METRICS_TOKEN is required as a Bearer token; without
+one the endpoint is a 404, except with DEBUG.
+"""
+import contextvars
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+COUNTERS = {
+    "http_requests_total": ("Requests served.", ("view", "method", "status")),
+    "db_queries_total": ("Database queries run while serving requests.", ("view",)),
+    "db_query_duration_seconds_total": ("Time spent in database queries.", ("view",)),
+    "cache_hits_total": ("Cache lookups that found the entry.", ("view",)),
+    "cache_misses_total": ("Cache lookups that did not find the entry.", ("view",)),
+}
+HISTOGRAM = "http_request_duration_seconds"
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # execute_wrapper: every query of the request goes through here
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+def record_cache(hits=0, misses=0):
+    """Called by the cache helpers; a no-op outside a measured request."""
+    stats = _current.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+class Registry:
+    """Totals of this process: {metric: {labels: value}} and {labels: [bucket counts..., sum, count]}."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {name: {} for name in COUNTERS}
+        self.histogram = {}
+        self.last_flush = 0.0
+
+    def observe(self, view, method, status, duration, stats):
+        with self.lock:
+            self._inc("http_requests_total", (view, method, str(status)), 1)
+            self._inc("db_queries_total", (view,), stats.queries)
+            self._inc("db_query_duration_seconds_total", (view,), stats.db_time)
+            self._inc("cache_hits_total", (view,), stats.cache_hits)
+            self._inc("cache_misses_total", (view,), stats.cache_misses)
+
+            row = self.histogram.setdefault((view,), [0] * (len(DURATION_BUCKETS) + 2))
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    row[i] += 1
+            row[-2] += duration
+            row[-1] += 1
+
+    def _inc(self, name, labels, value):
+        if value:
+            series = self.counters[name]
+            series[labels] = series.get(labels, 0) + value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": {name: [[list(k), v] for k, v in series.items()] for name, series in self.counters.items()},
+                "histogram": [[list(k), list(v)] for k, v in self.histogram.items()],
+            }
+
+    # --- SHARED DIRECTORY ---
+
+    def maybe_flush(self, directory):
+        now = time.monotonic()
+        if now - self.last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 5):
+            return
+        self.last_flush = now
+        self.flush(directory)
+
+    def flush(self, directory):
+        path = os.path.join(directory, f"metrics-{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+
+def merge(snapshots):
+    counters = {name: {} for name in COUNTERS}
+    histogram = {}
+    for snapshot in snapshots:
+        for name, series in snapshot["counters"].items():
+            for labels, value in series:
+                counters[name][tuple(labels)] = counters[name].get(tuple(labels), 0) + value
+        for labels, row in snapshot["histogram"]:
+            total = histogram.setdefault(tuple(labels), [0] * len(row))
+            for i, value in enumerate(row):
+                total[i] += value
+    return counters, histogram
+
+
+def collect():
+    """Totals of every worker writing to METRICS_DIR (this one live), else of this process."""
+    directory = getattr(settings, "METRICS_DIR", "")
+    own = REGISTRY.snapshot()
+    if not directory:
+        return merge([own])
+
+    snapshots = [own]
+    for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+        pid = _file_pid(path)
+        if pid == os.getpid():
+            continue
+        if pid is None or not _is_running(pid):
+            # An exited worker: its totals went with it (a restart starts from zero)
+            _remove(path)
+            continue
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # being replaced / unreadable: next scrape
+    return merge(snapshots)
+
+
+def _file_pid(path):
+    try:
+        return int(os.path.basename(path)[len("metrics-"):-len(".json")])
+    except ValueError:
+        return None
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # someone else's process
+    return True
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _labels(names, values, **extra):
+    pairs = list(zip(names, values)) + list(extra.items())
+    body = ",".join('{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"')) for name, value in pairs)
+    return "{" + body + "}"
+
+
+def render(counters, histogram):
+    lines = []
+    for name, (help_text, label_names) in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for labels, value in sorted(counters[name].items()):
+            lines.append(f"{name}{_labels(label_names, labels)} {value}")
+
+    lines += [f"# HELP {HISTOGRAM} Request latency.", f"# TYPE {HISTOGRAM} histogram"]
+    for labels, row in sorted(histogram.items()):
+        for bound, count in zip(DURATION_BUCKETS, row):
+            lines.append(f"{HISTOGRAM}_bucket{_labels(('view',), labels, le=bound)} {count}")
+        lines.append(f'{HISTOGRAM}_bucket{_labels(("view",), labels, le="+Inf")} {row[-1]}')
+        lines.append(f"{HISTOGRAM}_sum{_labels(('view',), labels)} {row[-2]}")
+        lines.append(f"{HISTOGRAM}_count{_labels(('view',), labels)} {row[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+# --- MIDDLEWARE / ENDPOINT ---
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name or match.route) if match else "<unresolved>"
+        if view != "metrics":
+            REGISTRY.observe(view, request.method, response.status_code, time.perf_counter() - start, stats)
+            directory = getattr(settings, "METRICS_DIR", "")
+            if directory:
+                REGISTRY.maybe_flush(directory)
+        return response
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token and not settings.DEBUG:
+        raise Http404
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponseForbidden()
+    return HttpResponse(render(*collect()), content_type="text/plain; version=0.0.4; charset=utf-8")
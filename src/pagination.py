@@ -0,0 +1,151 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are cut with a WHERE on the ordering columns instead of OFFSET, so a page
+costs the same at row 40 000 as at row 0 and a cursor stays valid while new
+rows are inserted in front of it. The cursor is an opaque base64 token holding
+the ordering values of the last row served.
+
+Views choose the order with `cursor_ordering` (or `get_cursor_ordering()`);
+it must end with a unique column (`id`) to be a total order. Only concrete
+columns of the listed model (or annotations, e.g. a search rank) are supported.
+Cursor values are converted back with each column's to_python(), so a
+tampered or stale cursor (e.g. from another `sort`) is a 404, not a 500.
+"""
+import base64
+import json
+from datetime import date, datetime
+from uuid import UUID
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        size = request.query_params.get(self.page_size_query_param)
+        if size is None and request.user.is_authenticated:
+            # Per-user preference (UserSettings.items_per_page)
+            try:
+                size = request.user.settings.items_per_page
+            except ObjectDoesNotExist:
+                size = None
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            size = settings.REST_FRAMEWORK.get("PAGE_SIZE") or 20
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset, view):
+        if hasattr(view, "get_cursor_ordering"):
+            return tuple(view.get_cursor_ordering())
+        if getattr(view, "cursor_ordering", None):
+            return tuple(view.cursor_ordering)
+
+        field_names = {f.name for f in queryset.model._meta.concrete_fields}
+        if "created_at" in field_names:
+            return ("-created_at", "-id")
+        return ("-id",)
+
+    # --- CURSOR ---
+
+    def encode_cursor(self, row, ordering):
+        values = [_encode_value(getattr(row, field.lstrip("-"))) for field in ordering]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _ordering_field(queryset, name):
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return queryset.query.annotations[name].output_field
+
+    def decode_cursor(self, request, ordering, queryset):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            values = [
+                self._ordering_field(queryset, field.lstrip("-")).to_python(value)
+                for field, value in zip(ordering, values)
+            ]
+            # Ordering columns are NOT NULL; `col < NULL` is not a valid lookup
+            if any(value is None for value in values):
+                raise ValueError
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound("Invalid cursor.")
+        return values
+
+    def _after(self, ordering, values):
+        """
+        Rows strictly after the cursor in `ordering`:
+        (a > x) OR (a = x AND b > y) OR ... with < for descending columns.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    # --- PAGINATION ---
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(queryset, view)
+
+        queryset = queryset.order_by(*ordering)
+        cursor = self.decode_cursor(request, ordering, queryset)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(ordering, cursor))
+
+        # One extra row tells whether there is a next page (no COUNT(*))
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        self.next_cursor = self.encode_cursor(rows[-1], ordering) if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -58,6 +58,7 @@ INSTALLED_APPS = [
     "workspace",
     "community",
     'notifications',
+    'search',
     'router',
 
 ]
@@ -95,6 +96,8 @@ cloudinary.config(
 )
 
 MIDDLEWARE = [
+    # First, so latency and query counts cover the whole stack
+    "src.metrics.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
 
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -123,6 +126,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+
+    # Keyset pagination on (created_at, id); page size follows UserSettings.items_per_page
+    "DEFAULT_PAGINATION_CLASS": "src.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
     
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',  # For guests (not logged in)
@@ -232,6 +239,45 @@ DEFAULT_FROM_EMAIL = 'onboarding@resend.dev'  # Or your verified domain
 
 
 # CELERY SETTINGS
-CELERY_BROKER_URL = 'redis://redis:6379/0'
-CELERY_RESULT_BACKEND = 'redis://redis:6379/0'
+# Empty broker: no worker is deployed; NotificationService then fans out synchronously
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL", ""))
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+# Run tasks inline (tests / no worker); NotificationService also fans out synchronously then
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "False") == "True"
+
+# Realtime notification push (Redis pub/sub); empty -> in-process broker
+NOTIFICATIONS_BROKER_URL = os.getenv("REDIS_URL", "")
+
+# Notification retention (notifications/retention.py), run daily by Celery beat
+NOTIFICATION_RETENTION_READ_DAYS = 30
+NOTIFICATION_RETENTION_UNREAD_DAYS = 90
+CELERY_BEAT_SCHEDULE = {
+    "purge-old-notifications": {
+        "task": "notifications.tasks.purge_old_notifications",
+        "schedule": 60 * 60 * 24,
+    },
+    # Write-behind of like toggles (community/likes.py); only used with django-redis
+    "flush-post-likes": {
+        "task": "community.tasks.flush_post_likes",
+        "schedule": 15,
+    },
+}
+
+# Seconds during which repeated events about one project/task merge into one notification
+NOTIFICATION_COALESCE_WINDOW = 60 * 10
+
+# Write ActivityLog batches from a Celery worker instead of the request
+ACTIVITY_LOG_ASYNC = False
+
+# Home feed timelines (community/timeline.py): entries kept per user, and the
+# community size from which posts are read at request time instead of fanned out
+HOME_TIMELINE_LENGTH = 500
+HOME_TIMELINE_FANOUT_LIMIT = 5000
 
+# Per-endpoint metrics (src/metrics.py) on /metrics. Workers of one host share
+# METRICS_DIR to report together; METRICS_TOKEN protects the endpoint (without
+# it /metrics is only served with DEBUG)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_FLUSH_INTERVAL = 5
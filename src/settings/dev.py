@@ -53,9 +53,18 @@ CACHES = {
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         },
-    }
+    },
+    # Per-worker LRU over "default" (src/two_tier_cache.py)
+    "hot": {
+        "BACKEND": "src.two_tier_cache.TwoTierCache",
+        "OPTIONS": {"SHARED_CACHE": "default", "LOCAL_TIMEOUT": 30, "LOCAL_MAX_ENTRIES": 5000},
+    },
 }
 
+# Celery worker and beat from docker-compose
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
 
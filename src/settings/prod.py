@@ -31,12 +31,28 @@ STORAGES = {
 }
 
 
-# Free-tier friendly cache
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+# Shared Redis when available (LocMem is per worker: free-tier fallback only)
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            },
+        },
+        # Per-worker LRU over "default" for hot, rarely changing entries
+        "hot": {
+            "BACKEND": "src.two_tier_cache.TwoTierCache",
+            "OPTIONS": {"SHARED_CACHE": "default", "LOCAL_TIMEOUT": 30, "LOCAL_MAX_ENTRIES": 5000},
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
     }
-}
 
 LOGGING = {
     "version": 1,
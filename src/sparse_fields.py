@@ -0,0 +1,99 @@
+"""
+Sparse fieldsets and on-demand nesting for DRF serializers.
+
+    ?fields=id,title           -> only these top-level fields
+    ?expand=tasks,tasks.comments
+
+Serializers declare their heavy relations in `Meta.expandable_fields`; those
+are left out of list responses unless requested via ?expand (dotted paths reach
+into nested serializers). Detail responses expand everything the view knows how
+to prefetch. Serializers used without a view context keep full nesting.
+"""
+
+
+def parse_query_list(request, param):
+    """`?param=a,b&param=c` -> {'a', 'b', 'c'}"""
+    values = set()
+    for raw in request.query_params.getlist(param):
+        values.update(part.strip() for part in raw.split(",") if part.strip())
+    return values
+
+
+class SparseFieldsetMixin:
+    """Serializer side: drops unrequested expandable fields and applies ?fields at the root."""
+
+    def _field_path(self):
+        names = []
+        node = self
+        while node is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return ".".join(reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expand = self.context.get("expand")
+        if expand is None:
+            return fields
+
+        path = self._field_path()
+        prefix = f"{path}." if path else ""
+
+        for name in getattr(self.Meta, "expandable_fields", ()):
+            if f"{prefix}{name}" not in expand:
+                fields.pop(name, None)
+
+        # ?fields only narrows the root representation
+        only = self.context.get("fields")
+        if only and not path:
+            for name in list(fields):
+                if name not in only:
+                    fields.pop(name)
+
+        return fields
+
+
+class SparseFieldsetViewMixin:
+    """
+    View side: resolves the expansions for the request and prefetches only those.
+
+    `expand_prefetches` maps an expand path to the lookups it needs
+    (strings or Prefetch objects), e.g. {'tasks': [...], 'tasks.comments': [...]}.
+    """
+
+    expand_prefetches = {}
+
+    def is_detail_request(self):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        return lookup in self.kwargs
+
+    def get_expansions(self):
+        if not hasattr(self, "_expansions"):
+            if self.is_detail_request():
+                expand = set(self.expand_prefetches)
+            else:
+                requested = parse_query_list(self.request, "expand")
+                # Fields asked for explicitly count as expanded too
+                requested |= parse_query_list(self.request, "fields")
+                expand = set()
+                for path in requested:
+                    # "tasks.comments" implies "tasks"
+                    parts = path.split(".")
+                    expand.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+            self._expansions = expand
+        return self._expansions
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand"] = self.get_expansions()
+        context["fields"] = parse_query_list(self.request, "fields")
+        return context
+
+    def prefetch_expansions(self, queryset):
+        expand = self.get_expansions()
+        lookups = []
+        for path, path_lookups in self.expand_prefetches.items():
+            if path in expand:
+                lookups.extend(path_lookups)
+        return queryset.prefetch_related(*lookups) if lookups else queryset
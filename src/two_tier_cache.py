@@ -0,0 +1,271 @@
+"""
+Two-tier cache: a bounded in-process LRU in front of the shared cache.
+
+    CACHES["hot"] = {
+        "BACKEND": "src.two_tier_cache.TwoTierCache",
+        "OPTIONS": {"SHARED_CACHE": "default", "LOCAL_TIMEOUT": 30, "LOCAL_MAX_ENTRIES": 5000},
+    }
+
+Reads are served from the worker's own LRU when possible and fall back to
+the shared cache (Redis), filling the LRU. Writes go to the shared cache,
+drop the local copy and publish the key on a Redis pub/sub channel; every
+worker listens on it and drops its copy, so invalidations reach all of them
+within milliseconds. LOCAL_TIMEOUT bounds staleness if a message is missed
+(a listener that reconnects clears its LRU).
+
+Meant for hot, rarely changing entries (categories, user cards, ACL entries).
+Counters and locks keep using the default cache directly. get_hot_cache()
+falls back to the default cache where no "hot" alias is configured.
+"""
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+HOT_CACHE_ALIAS = "hot"
+
+_MISSING = object()
+
+
+def get_hot_cache():
+    alias = HOT_CACHE_ALIAS if HOT_CACHE_ALIAS in settings.CACHES else DEFAULT_CACHE_ALIAS
+    return caches[alias]
+
+
+class LocalLRU:
+    """Process-wide LRU of pickled values with a per-entry deadline."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation: a fill started before one is discarded
+        self.generation = 0
+        self.pid = None
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            pickled, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout, generation=None):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (pickled, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# One LRU per alias (and size: settings may be overridden) and process,
+# shared by the per-thread backend instances
+_locals = {}
+_locals_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = options.get("SHARED_CACHE", DEFAULT_CACHE_ALIAS)
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 30)
+        self.channel = options.get("CHANNEL", f"cache:invalidate:{name}")
+        max_entries = options.get("LOCAL_MAX_ENTRIES", 5000)
+        with _locals_lock:
+            self.local = _locals.setdefault((name, max_entries), LocalLRU(max_entries))
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    # --- READ ---
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._ensure_listener()
+        value = self.local.get(local_key)
+        if value is not _MISSING:
+            return value
+
+        generation = self.local.generation
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self.local.set(local_key, value, self.local_timeout, generation)
+        return value
+
+    def get_many(self, keys, version=None):
+        self._ensure_listener()
+        found, remote = {}, []
+        for key in keys:
+            value = self.local.get(self.make_and_validate_key(key, version=version))
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+
+        if remote:
+            generation = self.local.generation
+            fetched = self.shared.get_many(remote, version=version)
+            for key, value in fetched.items():
+                self.local.set(self.make_and_validate_key(key, version=version), value, self.local_timeout, generation)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    # --- WRITE (shared first, then drop the local copies everywhere) ---
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._ensure_listener()
+        self.shared.set(key, value, timeout, version=version)
+        self._invalidated([key], version)
+        self.local.set(self.make_and_validate_key(key, version=version), value, self._local_timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._invalidated([key], version)
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        self._ensure_listener()
+        failed = self.shared.set_many(data, timeout, version=version)
+        self._invalidated(list(data), version)
+        for key, value in data.items():
+            if key not in failed:
+                self.local.set(self.make_and_validate_key(key, version=version), value, self._local_timeout(timeout))
+        return failed
+
+    def delete(self, key, version=None):
+        deleted = self.shared.delete(key, version=version)
+        self._invalidated([key], version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        self.shared.delete_many(keys, version=version)
+        self._invalidated(list(keys), version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.shared.incr(key, delta, version=version)
+        self._invalidated([key], version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def clear(self):
+        self.shared.clear()
+        self.local.clear()
+        self._publish(["*"])
+
+    # --- INVALIDATION ---
+
+    def _invalidated(self, keys, version):
+        local_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        self.local.delete_many(local_keys)
+        self._publish(local_keys)
+
+    def _redis(self):
+        if not settings.CACHES[self.shared_alias]["BACKEND"].startswith("django_redis"):
+            return None  # single-process shared cache (LocMem): nobody to tell
+        from django_redis import get_redis_connection
+        return get_redis_connection(self.shared_alias)
+
+    def _publish(self, local_keys):
+        client = self._redis()
+        if client is None:
+            return
+        message = json.dumps({"origin": _process_id(), "keys": local_keys})
+        try:
+            client.publish(self.channel, message)
+        except Exception:
+            # The entry is already gone from the shared cache; others expire it by LOCAL_TIMEOUT
+            logger.exception("Could not publish cache invalidation on %s", self.channel)
+
+    def handle_message(self, data):
+        message = json.loads(data)
+        if message["origin"] == _process_id():
+            return
+        if "*" in message["keys"]:
+            self.local.clear()
+        else:
+            self.local.delete_many(message["keys"])
+
+    def _ensure_listener(self):
+        pid = os.getpid()
+        if self.local.pid == pid:
+            return
+        with _locals_lock:
+            if self.local.pid == pid:
+                return
+            # New process (or forked worker): inherited entries missed the messages since
+            self.local.clear()
+            self.local.pid = pid
+            client = self._redis()
+            if client is not None:
+                threading.Thread(target=self._listen, args=(client,), daemon=True, name=self.channel).start()
+
+    def _listen(self, client):
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Anything may have changed while we were not subscribed
+                self.local.clear()
+                for message in pubsub.listen():
+                    self.handle_message(message["data"])
+            except Exception:
+                logger.exception("Cache invalidation listener on %s failed, reconnecting", self.channel)
+                time.sleep(1)
+
+
+_process = {"pid": None, "id": None}
+
+
+def _process_id():
+    if _process["pid"] != os.getpid():
+        _process["pid"], _process["id"] = os.getpid(), uuid.uuid4().hex
+    return _process["id"]
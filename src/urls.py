@@ -7,6 +7,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 import socket 
 
+from src.metrics import metrics_view
+
 
 class TestView(APIView):
     def get(self, request):
@@ -18,6 +20,7 @@ class TestView(APIView):
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('apps.router.urls')),
+    path('metrics', metrics_view, name='metrics'),
     # path('test/', TestView.as_view(), name='test'),
 ] 
 
@@ -0,0 +1,90 @@
+"""
+In-process stand-ins for the Redis-backed stores, for tests running on LocMem.
+
+Single process, no locking across workers: never use these outside tests.
+"""
+import threading
+
+from django.core.cache import cache
+
+from community import likes, timeline
+
+
+class CacheTimelineStore:
+    """community.timeline.RedisTimelineStore, as one cache value per timeline."""
+
+    def read(self, user_id):
+        return cache.get(timeline.timeline_key(user_id))
+
+    def replace(self, user_id, entries):
+        cache.set(timeline.timeline_key(user_id), list(entries), timeline.TIMELINE_TTL)
+
+    def add(self, user_ids, post_id, score):
+        timelines = cache.get_many([timeline.timeline_key(user_id) for user_id in user_ids])
+        for key, entries in timelines.items():
+            entries.append((post_id, score))
+            entries.sort(key=lambda entry: entry[1], reverse=True)
+            del entries[timeline.timeline_length():]
+        cache.set_many(timelines, timeline.TIMELINE_TTL)
+
+    def delete(self, user_ids):
+        cache.delete_many([timeline.timeline_key(user_id) for user_id in user_ids])
+
+
+class CacheLikeStore:
+    """community.likes.RedisLikeStore on the cache, one process lock instead of Lua."""
+
+    _lock = threading.Lock()
+
+    def epoch(self, post_id):
+        return cache.get(likes.epoch_key(post_id), 0)
+
+    def toggle(self, post_id, user_id, db_liked, db_count, epoch=0):
+        with self._lock:
+            if self.epoch(post_id) != epoch:
+                return None
+            pending = cache.get(likes.pending_key(post_id)) or {}
+            flushing = cache.get(likes.flushing_key(post_id)) or {}
+            liked = 1 - pending.get(user_id, flushing.get(user_id, int(db_liked)))
+            pending[user_id] = liked
+
+            count = cache.get(likes.count_key(post_id))
+            count = (db_count if count is None else count) + (1 if liked else -1)
+            dirty = cache.get(likes.DIRTY_KEY) or set()
+            dirty.add(post_id)
+            cache.set_many({likes.pending_key(post_id): pending, likes.count_key(post_id): count, likes.DIRTY_KEY: dirty}, None)
+        return bool(liked), count
+
+    def state(self, post_ids, user_id):
+        result = {}
+        for post_id in post_ids:
+            pending = cache.get(likes.pending_key(post_id)) or {}
+            flushing = cache.get(likes.flushing_key(post_id)) or {}
+            liked = pending.get(user_id, flushing.get(user_id))
+            result[post_id] = (cache.get(likes.count_key(post_id)), bool(liked) if liked is not None else None)
+        return result
+
+    def dirty_posts(self, limit):
+        return list(cache.get(likes.DIRTY_KEY) or ())[:limit]
+
+    def claim(self, post_id):
+        with self._lock:
+            flushing = cache.get(likes.flushing_key(post_id))
+            if flushing is None:
+                flushing = cache.get(likes.pending_key(post_id)) or {}
+                cache.set(likes.flushing_key(post_id), flushing, None)
+                cache.delete(likes.pending_key(post_id))
+        return dict(flushing)
+
+    def finalize(self, post_id, count=None):
+        with self._lock:
+            cache.delete(likes.flushing_key(post_id))
+            cache.set(likes.epoch_key(post_id), self.epoch(post_id) + 1, likes.COUNT_TTL)
+            if cache.get(likes.pending_key(post_id)) is None:
+                dirty = cache.get(likes.DIRTY_KEY) or set()
+                dirty.discard(post_id)
+                cache.set(likes.DIRTY_KEY, dirty, None)
+                if count is None:
+                    count = cache.get(likes.count_key(post_id))
+                if count is not None:
+                    cache.set(likes.count_key(post_id), count, likes.COUNT_TTL)
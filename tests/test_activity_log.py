@@ -0,0 +1,71 @@
+import pytest
+from django.db import transaction
+
+from workspace.activity_services import record_activity
+from workspace.models import Workspace, WorkspaceMember, Project, Task, ActivityLog
+from workspace.tasks import write_activity_logs
+from workspace.workspace_services import complete_task_service, create_project_service
+
+
+@pytest.fixture
+def workspace_setup(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    worker = django_user_model.objects.create_user(email="worker@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    return {"owner": owner, "worker": worker, "workspace": workspace}
+
+
+def actions(workspace):
+    return sorted(ActivityLog.objects.filter(workspace=workspace).values_list("action_type", flat=True))
+
+
+@pytest.mark.django_db
+def test_each_event_is_logged_once(workspace_setup, django_capture_on_commit_callbacks):
+    s = workspace_setup
+
+    with django_capture_on_commit_callbacks(execute=True):
+        # Signal + service both record create_project -> one row
+        project = create_project_service(s["owner"], s["workspace"], {"title": "P"})
+        task = Task.objects.create(project=project, title="T", created_by=s["owner"], assigned_to=s["owner"])
+    assert actions(s["workspace"]) == ["create_project", "create_task"]
+
+    # The service's actor wins over the signal's fallback (assignee)
+    with django_capture_on_commit_callbacks(execute=True):
+        complete_task_service(s["worker"], Task.objects.get(pk=task.pk))
+    log = ActivityLog.objects.get(action_type="complete_task")
+    assert log.actor == s["worker"]
+
+    # Later saves of a completed task are not new completions
+    with django_capture_on_commit_callbacks(execute=True):
+        task = Task.objects.get(pk=task.pk)
+        task.title = "Renamed"
+        task.save()
+    assert ActivityLog.objects.filter(action_type="complete_task").count() == 1
+
+
+@pytest.mark.django_db
+def test_rolled_back_and_deferred_entries(workspace_setup, django_capture_on_commit_callbacks, monkeypatch):
+    s = workspace_setup
+    with django_capture_on_commit_callbacks(execute=True):
+        project = Project.objects.create(workspace=s["workspace"], title="P", created_by=s["owner"])
+    ActivityLog.objects.all().delete()
+
+    # 1. Rolled back work leaves no log behind
+    with django_capture_on_commit_callbacks(execute=True):
+        try:
+            with transaction.atomic():
+                record_activity(s["workspace"].id, s["owner"], "start_task", project.id, "x")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+    assert not ActivityLog.objects.exists()
+
+    # 2. Deferred entries go to the worker as one batch
+    batches = []
+    monkeypatch.setattr(write_activity_logs, "delay", batches.append)
+    with django_capture_on_commit_callbacks(execute=True):
+        record_activity(s["workspace"].id, s["owner"], "comment", project.id, "a", defer=True)
+        record_activity(s["workspace"].id, s["owner"], "start_task", project.id, "b", defer=True)
+    assert [len(batch) for batch in batches] == [2]
+    assert not ActivityLog.objects.exists()
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from notifications.models import Notification
+from workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task, ActivityLog
+
+
+@pytest.fixture
+def bulk_setup(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    reader = django_user_model.objects.create_user(email="reader@test.com", password="password")
+    assignee = django_user_model.objects.create_user(email="assignee@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    WorkspaceMember.objects.create(workspace=workspace, user=reader, role="member")
+    WorkspaceMember.objects.create(workspace=workspace, user=assignee, role="member")
+    project = Project.objects.create(workspace=workspace, title="P", created_by=owner)
+    ProjectMember.objects.create(project=project, user=reader, permission="read")
+    ProjectMember.objects.create(project=project, user=assignee, permission="write")
+
+    tasks = [Task.objects.create(project=project, title=f"T{i}", created_by=assignee) for i in range(30)]
+    return {
+        "owner": owner, "reader": reader, "assignee": assignee, "project": project, "tasks": tasks,
+        "url": f"/api/v1/workspaces/{workspace.id}/projects/{project.id}/tasks/bulk/",
+    }
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_bulk_complete_and_reassign(bulk_setup, django_capture_on_commit_callbacks):
+    s = bulk_setup
+    ids = [str(t.id) for t in s["tasks"]]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client_for(s["owner"]).post(
+                s["url"], {"task_ids": ids, "status": "completed", "assign_user_id": str(s["assignee"].id)},
+                format="json",
+            )
+    assert response.status_code == 200
+    assert response.data["updated"] == 30
+    # Query count does not grow with the number of tasks
+    assert len(ctx.captured_queries) < 30
+
+    assert Task.objects.filter(status="completed", completed_at__isnull=False, assigned_to=s["assignee"]).count() == 30
+    s["project"].refresh_from_db()
+    assert (s["project"].task_count, s["project"].completed_count) == (30, 30)
+    assert ActivityLog.objects.filter(action_type="complete_task").count() == 30
+
+    # One merged notification for the assignee (assigned + their tasks completed)
+    assert Notification.objects.filter(recipient=s["assignee"]).count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_update_requires_write_access(bulk_setup):
+    s = bulk_setup
+    response = client_for(s["reader"]).post(
+        s["url"], {"task_ids": [str(s["tasks"][0].id)], "priority": "high"}, format="json"
+    )
+    assert response.status_code == 403
+    assert not Task.objects.filter(priority="high").exists()
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from src.cache_aside import CacheAside
+from users.api.views.user_views import PublicUserProfileView
+from users.caches import public_profile_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user_client(django_user_model):
+    user = django_user_model.objects.create_user(email="me@test.com", password="password")
+    client = APIClient()
+    client.force_authenticate(user)
+    return user, client
+
+
+@pytest.mark.django_db
+def test_stale_entries_are_refreshed_by_one_caller():
+    store = CacheAside("tests:swr", timeout=60, stale_timeout=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert store.get_or_set("k", compute=compute) == 1
+    assert store.get_or_set("k", compute=compute) == 1
+
+    # 1. Stale + lock held elsewhere -> the stale value is served, nothing recomputed
+    key = store.key("k")
+    cache.set(key, (1, time.time() - 1), timeout=60)
+    cache.add(store._lock_key(key), 1)
+    assert store.get_or_set("k", compute=compute) == 1 and len(calls) == 1
+
+    # 2. Stale + lock free -> this caller refreshes
+    cache.delete(store._lock_key(key))
+    assert store.get_or_set("k", compute=compute) == 2
+
+    # 3. invalidate drops one key, invalidate_all the whole namespace
+    store.invalidate("k")
+    assert store.get_or_set("k", compute=compute) == 3
+    store.invalidate_all()
+    assert store.get_or_set("k", compute=compute) == 4
+
+
+@pytest.mark.django_db
+def test_profile_patch_invalidates(user_client):
+    user, client = user_client
+
+    # 1. Second GET is served from the cache
+    assert client.get("/api/v1/user/profile/").data["first_name"] == ""
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/api/v1/user/profile/")
+    assert not any("user_profiles" in query["sql"] for query in ctx.captured_queries)
+
+    # 2. PATCH invalidates (it used to keep serving the old profile)
+    assert client.patch("/api/v1/user/profile/", {"first_name": "Ada"}).status_code == 200
+    assert client.get("/api/v1/user/profile/").data["first_name"] == "Ada"
+
+
+@pytest.mark.django_db
+def test_writes_elsewhere_invalidate_through_signals(user_client):
+    # (separate test: these views share a 5/minute throttle)
+    user, client = user_client
+    client.get("/api/v1/user/account/")
+    client.get("/api/v1/user/profile/")
+    user.email = "new@test.com"
+    user.save()
+    assert client.get("/api/v1/user/account/").data["email"] == "new@test.com"
+    assert client.get("/api/v1/user/profile/").data["user"]["email"] == "new@test.com"
+
+
+@pytest.mark.django_db
+def test_public_profile_is_dropped_on_rename(user_client, rf):
+    user, _ = user_client
+    profile = user.profile
+    profile.username = "ada"
+    profile.save()
+    view = PublicUserProfileView.as_view()
+
+    assert view(rf.get("/"), username="ada").data["username"] == "ada"
+    assert cache.get(public_profile_cache.key("ada")) is not None
+
+    profile = type(profile).objects.get(pk=profile.pk)
+    profile.username = "lovelace"
+    profile.save()
+    assert cache.get(public_profile_cache.key("ada")) is None
+    assert view(rf.get("/"), username="ada").status_code == 404
@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from community.discovery_services import rebuild_discovery_index
+from community.models import (
+    Community, CommunityCategory, CommunityDiscovery, CommunityInvitation, CommunityMember,
+)
+
+URL = "/api/v1/communities/public_communities/"
+
+
+@pytest.fixture
+def directory(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    reader = django_user_model.objects.create_user(email="reader@test.com", password="password")
+    tech = CommunityCategory.objects.create(name="Tech")
+    art = CommunityCategory.objects.create(name="Art")
+
+    def community(name, category, members=0, visibility="public"):
+        community = Community.objects.create(name=name, category=category, created_by=owner, visibility=visibility)
+        CommunityMember.objects.create(community=community, user=owner, role="admin")
+        CommunityInvitation.objects.create(community=community, invited_by=owner, max_uses=0)
+        for i in range(members):
+            user = django_user_model.objects.create_user(email=f"{name}{i}@test.com")
+            CommunityMember.objects.create(community=community, user=user)
+        return community
+
+    communities = {
+        "big": community("big", tech, members=3),
+        "new": community("new", art),
+        "joined": community("joined", tech, members=5),
+        "private": community("private", tech, visibility="private"),
+    }
+    CommunityMember.objects.create(community=communities["joined"], user=reader)
+
+    client = APIClient()
+    client.force_authenticate(reader)
+    return client, communities, tech
+
+
+@pytest.mark.django_db
+def test_discovery_lists_unjoined_public_communities(directory):
+    client, communities, tech = directory
+
+    with CaptureQueriesContext(connection) as ctx:
+        results = client.get(URL).data["results"]
+    assert [(row["name"], row["member_count"], row["category"]) for row in results] == [
+        ("big", 4, "Tech"), ("new", 1, "Art"),
+    ]
+    assert results[0]["invite_code"] == CommunityInvitation.objects.get(community=communities["big"]).invite_code
+    # Page + user settings, no per-row queries
+    assert len(ctx.captured_queries) <= 3
+
+    assert [row["name"] for row in client.get(URL, {"sort": "recent"}).data["results"]] == ["new", "big"]
+    assert [row["name"] for row in client.get(URL, {"category": tech.id}).data["results"]] == ["big"]
+    assert client.get(URL, {"category": "nope"}).status_code == 400
+
+    page = client.get(URL, {"page_size": 1}).data
+    assert [row["name"] for row in page["results"]] == ["big"]
+    assert [row["name"] for row in client.get(page["next"]).data["results"]] == ["new"]
+
+
+@pytest.mark.django_db
+def test_discovery_index_follows_changes(directory):
+    client, communities, tech = directory
+    big = communities["big"]
+
+    # Leaving / joining shifts the count, going private removes the row
+    CommunityMember.objects.filter(community=big).exclude(role="admin").first().delete()
+    assert CommunityDiscovery.objects.get(pk=big.pk).member_count == 3
+    big.visibility = "private"
+    big.save()
+    assert not CommunityDiscovery.objects.filter(pk=big.pk).exists()
+
+    # Repair rebuilds the same rows
+    expected = set(CommunityDiscovery.objects.values_list("community_id", "member_count", "invite_code"))
+    CommunityDiscovery.objects.all().delete()
+    assert rebuild_discovery_index() == 4
+    assert set(CommunityDiscovery.objects.values_list("community_id", "member_count", "invite_code")) == expected
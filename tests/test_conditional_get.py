@@ -0,0 +1,92 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from community import likes
+from community.models import Community, CommunityCategory, CommunityMember, Post
+from workspace.models import Project, ProjectMember, Task, Workspace, WorkspaceMember
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Pending like toggles would otherwise reach the next test's flusher
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def workspace_setup(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    project = Project.objects.create(workspace=workspace, title="P", created_by=owner)
+    ProjectMember.objects.create(project=project, user=owner, permission="admin")
+
+    client = APIClient()
+    client.force_authenticate(owner)
+    return client, owner, workspace, project
+
+
+def get(client, url, etag=None):
+    return client.get(url, HTTP_IF_NONE_MATCH=etag) if etag else client.get(url)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["dashboard/", "projects/", "members/"])
+def test_workspace_reads_answer_304_until_a_write(workspace_setup, path, django_capture_on_commit_callbacks):
+    client, owner, workspace, project = workspace_setup
+    url = f"/api/v1/workspaces/{workspace.id}/{path}"
+
+    # 1. 200 with an ETag; the same request with If-None-Match is a 304
+    response = get(client, url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert response["Cache-Control"] == "private, no-cache"
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = get(client, url, etag)
+    assert response.status_code == 304 and response["ETag"] == etag
+    # Membership + version only (ACL cache hit -> just the version)
+    assert len(ctx.captured_queries) <= 2
+
+    # 2. A write inside the workspace changes the ETag (once committed)
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.create(project=project, title="T", created_by=owner)
+    response = get(client, url, etag)
+    assert response.status_code == 200 and response["ETag"] != etag
+
+    # 3. Another query string is another representation
+    assert get(client, f"{url}?page_size=1", response["ETag"]).status_code == 200
+
+
+@pytest.mark.django_db
+def test_community_posts_etag_follows_posts_and_likes(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    community = Community.objects.create(
+        name="C", category=CommunityCategory.objects.create(name="Tech"), created_by=owner
+    )
+    CommunityMember.objects.create(community=community, user=owner, role="admin")
+    post = Post.objects.create(community=community, author=owner, content="p")
+    client = APIClient()
+    client.force_authenticate(owner)
+    url = f"/api/v1/posts/communities/{community.id}/posts/"
+
+    etag = get(client, url)["ETag"]
+    assert get(client, url, etag).status_code == 304
+
+    # 1. Like toggles change the ETag, also in a worker that did not see the
+    #    toggle (another LocMem: no like generation)
+    client.post(f"/api/v1/posts/posts/{post.id}/like/")
+    cache.delete(likes.generation_key(community.id))
+    response = get(client, url, etag)
+    assert response.status_code == 200 and response.data["results"][0]["like_count"] == 1
+    etag = response["ETag"]
+
+    # 2. So does a new post
+    Post.objects.create(community=community, author=owner, content="q")
+    assert get(client, url, etag).status_code == 200
+
+    # 3. Writes never carry an ETag
+    assert "ETag" not in client.post(url, {"content": "r"})
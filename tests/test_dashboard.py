@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task
+
+
+@pytest.fixture
+def dashboard_setup(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+
+    # A few projects with collaborators and tasks, so N+1 lookups would show up
+    for i in range(4):
+        project = Project.objects.create(workspace=workspace, title=f"P{i}", status="active", created_by=owner)
+        for j in range(3):
+            user = django_user_model.objects.create_user(email=f"u{i}{j}@test.com")
+            WorkspaceMember.objects.create(workspace=workspace, user=user, role="member")
+            ProjectMember.objects.create(project=project, user=user, permission="write")
+        Task.objects.create(project=project, title=f"T{i}", created_by=owner, assigned_to=owner)
+
+    client = APIClient()
+    client.force_authenticate(owner)
+    return {"client": client, "workspace": workspace, "owner": owner,
+            "url": f"/api/v1/workspaces/{workspace.id}/dashboard/"}
+
+
+@pytest.mark.django_db
+def test_dashboard_query_count_is_bounded(dashboard_setup):
+    with CaptureQueriesContext(connection) as ctx:
+        response = dashboard_setup["client"].get(dashboard_setup["url"])
+
+    assert response.status_code == 200
+    assert response.data["total_projects"] == 4
+    assert response.data["total_tasks"] == 4
+    assert len(response.data["active_projects"][0]["collaborators"]) == 3
+
+    # membership + workspace totals + projects + collaborators + my tasks + activity + members
+    assert len(ctx.captured_queries) <= 8
+
+
+@pytest.mark.django_db
+def test_dashboard_is_cached_and_invalidated(dashboard_setup, django_capture_on_commit_callbacks):
+    client, url = dashboard_setup["client"], dashboard_setup["url"]
+    client.get(url)
+
+    # 1. Second hit is served from the cache
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert not any("projects" in q["sql"] for q in ctx.captured_queries)
+
+    # 2. A new task bumps the workspace version on commit -> fresh totals
+    project = Project.objects.filter(workspace=dashboard_setup["workspace"]).first()
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.create(project=project, title="New", created_by=dashboard_setup["owner"])
+    assert client.get(url).data["total_tasks"] == 5
+
+
+@pytest.mark.django_db
+def test_version_is_bumped_once_per_transaction(dashboard_setup, django_capture_on_commit_callbacks):
+    workspace, owner = dashboard_setup["workspace"], dashboard_setup["owner"]
+    project = Project.objects.filter(workspace=workspace).first()
+    version = workspace.version
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with CaptureQueriesContext(connection) as ctx:
+            for i in range(3):
+                Task.objects.create(project=project, title=f"N{i}", created_by=owner)
+        # No UPDATE of the workspace row while the transaction is open
+        table = Workspace._meta.db_table
+        assert not any(q["sql"].startswith(f'UPDATE "{table}"') for q in ctx.captured_queries)
+
+    workspace.refresh_from_db()
+    assert workspace.version == version + 1
@@ -0,0 +1,113 @@
+import pytest
+from rest_framework.test import APIClient
+
+from community import timeline
+from community.models import Community, CommunityCategory, CommunityMember, Post
+from tests.fakes import CacheTimelineStore
+
+
+def feed_ids(client, page_size=50):
+    ids, url = [], f"/api/v1/posts/home/?page_size={page_size}"
+    while url:
+        data = client.get(url).data
+        ids += [post["id"] for post in data["results"]]
+        url = data["next"]
+    return ids
+
+
+@pytest.fixture
+def store(monkeypatch):
+    # Timelines normally need django-redis; the fake keeps them in LocMem
+    store = CacheTimelineStore()
+    monkeypatch.setattr(timeline, "get_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def setup(django_user_model, django_capture_on_commit_callbacks):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    reader = django_user_model.objects.create_user(email="reader@test.com", password="password")
+    category = CommunityCategory.objects.create(name="Tech")
+    with django_capture_on_commit_callbacks(execute=True):
+        small = Community.objects.create(name="Small", category=category, created_by=owner)
+        other = Community.objects.create(name="Other", category=category, created_by=owner)
+        for community in (small, other):
+            CommunityMember.objects.create(community=community, user=owner, role="admin")
+        CommunityMember.objects.create(community=small, user=reader, role="member")
+
+    owner_client = APIClient()
+    owner_client.force_authenticate(owner)
+    reader_client = APIClient()
+    reader_client.force_authenticate(reader)
+
+    def post(community, content="p"):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = owner_client.post(f"/api/v1/posts/communities/{community.id}/posts/", {"content": content})
+        assert response.status_code == 201
+        return str(Post.objects.filter(community=community).latest("created_at").id)
+
+    return reader, reader_client, small, other, post
+
+
+@pytest.mark.django_db
+def test_posts_are_fanned_out_to_member_timelines(store, setup, django_capture_on_commit_callbacks):
+    reader, client, small, other, post = setup
+
+    # 1. First read builds the timeline from the database
+    first = post(small)
+    post(other)
+    assert feed_ids(client) == [first]
+    assert [entry[0] for entry in timeline.get_store().read(reader.id)] == [first]
+
+    # 2. New posts are pushed into the existing timeline
+    second = post(small)
+    assert [entry[0] for entry in timeline.get_store().read(reader.id)] == [second, first]
+    assert feed_ids(client) == [second, first]
+
+    # 3. Joining / leaving rebuilds it
+    with django_capture_on_commit_callbacks(execute=True):
+        membership = CommunityMember.objects.create(community=other, user=reader, role="member")
+    assert timeline.get_store().read(reader.id) is None
+    assert len(feed_ids(client)) == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        membership.delete()
+    assert feed_ids(client) == [second, first]
+
+
+@pytest.mark.django_db
+def test_large_communities_are_read_at_request_time(store, setup, settings):
+    settings.HOME_TIMELINE_FANOUT_LIMIT = 2
+    reader, client, small, other, post = setup
+
+    feed_ids(client)
+    new = post(small)
+    # Not fanned out (2 members), still served
+    assert timeline.get_store().read(reader.id) == []
+    assert feed_ids(client) == [new]
+
+
+@pytest.mark.django_db
+def test_trimmed_timeline_falls_back_to_database(store, setup, settings):
+    settings.HOME_TIMELINE_LENGTH = 3
+    reader, client, small, other, post = setup
+
+    posted = [post(small, f"p{i}") for i in range(5)]
+    assert len(feed_ids(client)) == 5
+    posted.append(post(small))
+    assert len(timeline.get_store().read(reader.id)) == 3
+    # Pages past the oldest timeline entry come from the communities directly
+    assert feed_ids(client, page_size=2) == posted[::-1]
+
+
+@pytest.mark.django_db
+def test_without_a_shared_store_the_feed_is_read_on_request(setup):
+    # LocMem is per worker: a fanned-out post would miss the other workers' timelines
+    reader, client, small, other, post = setup
+    assert timeline.get_store() is None
+
+    first = post(small)
+    post(other)
+    assert feed_ids(client) == [first]
+    second = post(small)
+    assert feed_ids(client) == [second, first]
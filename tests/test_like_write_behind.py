@@ -0,0 +1,155 @@
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from community import likes
+from community.models import Community, CommunityCategory, CommunityMember, Post, PostLike
+from tests.fakes import CacheLikeStore
+
+
+@pytest.fixture
+def post(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    community = Community.objects.create(
+        name="C", category=CommunityCategory.objects.create(name="Tech"), created_by=owner
+    )
+    CommunityMember.objects.create(community=community, user=owner, role="admin")
+    return Post.objects.create(community=community, author=owner, content="p")
+
+
+def redis_client():
+    # TEST_REDIS_URL runs the scripts on a real server, fakeredis[lua] in-process
+    if os.environ.get("TEST_REDIS_URL"):
+        import redis
+        client = redis.Redis.from_url(os.environ["TEST_REDIS_URL"])
+        client.flushdb()
+        return client
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    try:
+        client.eval("return 1", 0)
+    except Exception:
+        pytest.skip("fakeredis without Lua support")
+    return client
+
+
+@pytest.fixture(params=["cache", "redis"])
+def store(request, monkeypatch):
+    # Write-behind normally needs django-redis; both stores run it in the test process
+    store = CacheLikeStore() if request.param == "cache" else likes.RedisLikeStore(redis_client())
+    monkeypatch.setattr(likes, "get_store", lambda: store)
+    return store
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_toggles_are_served_before_and_written_after_flush(post, store, django_user_model):
+    fan = django_user_model.objects.create_user(email="fan@test.com")
+    owner, fan = client_for(post.author), client_for(fan)
+    url = f"/api/v1/posts/posts/{post.id}/like/"
+
+    # 1. Toggles answer from the store, nothing is written yet
+    assert owner.post(url).data == {"status": "liked", "count": 1}
+    assert fan.post(url).data == {"status": "liked", "count": 2}
+    assert fan.post(url).data == {"status": "unliked", "count": 1}
+    assert not PostLike.objects.exists()
+
+    # 2. Reads include the pending toggles
+    feed = owner.get(f"/api/v1/posts/communities/{post.community_id}/posts/").data["results"]
+    assert (feed[0]["like_count"], feed[0]["is_liked"]) == (1, True)
+    detail = fan.get(f"/api/v1/posts/posts/{post.id}/").data
+    assert (detail["like_count"], detail["is_liked"]) == (1, False)
+
+    # 3. The flusher writes rows and counter in one batch
+    assert likes.flush_likes() == 1
+    assert likes.flush_likes() == 0
+
+
+@pytest.mark.django_db
+def test_synchronous_toggle_bumps_the_community_version(post):
+    community = post.community
+    for expected in [(True, 1), (False, 0)]:
+        version = community.version
+        assert likes.toggle(post, post.author) == expected
+        community.refresh_from_db()
+        assert community.version > version
+    assert PostLike.objects.count() == 0
+    post.refresh_from_db()
+    assert post.like_count == 0
+    post.refresh_from_db()
+    assert post.like_count == 1
+    assert list(PostLike.objects.values_list("user_id", flat=True)) == [post.author_id]
+
+
+@pytest.mark.django_db
+def test_interrupted_flush_is_written_again(post, store, monkeypatch):
+    store.toggle(str(post.id), str(post.author_id), False, 0)
+
+    # Flusher dies after claiming the batch, before writing it
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "finalize", lambda post_id, count=None: None)
+        patch.setattr(likes.PostLike.objects, "bulk_create", lambda *a, **k: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            likes.flush_likes()
+
+    # A toggle in between (an unlike) waits for the next batch; the restart
+    # first writes the interrupted like again
+    assert store.toggle(str(post.id), str(post.author_id), False, 0, store.epoch(str(post.id))) == (False, 0)
+    likes.flush_likes()
+    assert PostLike.objects.count() == 1
+    assert store.dirty_posts(10) == [str(post.id)]
+    likes.flush_likes()
+    assert store.dirty_posts(10) == []
+    post.refresh_from_db()
+    assert post.like_count == 0
+
+
+@pytest.mark.django_db
+def test_toggle_racing_a_flush_is_retried(post, store):
+    post_id, user_id = str(post.id), str(post.author_id)
+    assert likes.toggle(post, post.author) == (True, 1)
+
+    # A toggle that read PostLike before this flush committed is refused...
+    epoch = store.epoch(post_id)
+    likes.flush_likes()
+    assert store.toggle(post_id, user_id, False, 0, epoch) is None
+    # ...and toggle() reads it again: an unlike, not a second like
+    assert likes.toggle(post, post.author) == (False, 0)
+
+
+@pytest.mark.django_db
+def test_flush_resets_the_count(post, store):
+    # e.g. a toggle counted against a stale Post.like_count
+    assert store.toggle(str(post.id), str(post.author_id), False, 6) == (True, 7)
+    likes.flush_likes()
+    assert store.state([str(post.id)], str(post.author_id))[str(post.id)][0] == 1
+
+
+@pytest.mark.django_db
+def test_toggles_are_written_at_once_without_a_shared_store(post):
+    url = f"/api/v1/posts/posts/{post.id}/like/"
+    client = client_for(post.author)
+    assert client.post(url).data == {"status": "liked", "count": 1}
+    assert PostLike.objects.filter(post=post).count() == 1
+    assert client.post(url).data == {"status": "unliked", "count": 0}
+    assert not PostLike.objects.exists()
+    assert likes.flush_likes() == 0
+
+
+@pytest.mark.django_db
+def test_synchronous_toggle_bumps_the_community_version(post):
+    community = post.community
+    for expected in [(True, 1), (False, 0)]:
+        version = community.version
+        assert likes.toggle(post, post.author) == expected
+        community.refresh_from_db()
+        assert community.version > version
+    assert PostLike.objects.count() == 0
+    post.refresh_from_db()
+    assert post.like_count == 0
@@ -0,0 +1,87 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from src import acl_cache
+from workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task
+
+
+@pytest.fixture
+def task_setup(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    writer = django_user_model.objects.create_user(email="writer@test.com", password="password")
+    reader = django_user_model.objects.create_user(email="reader@test.com", password="password")
+
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    WorkspaceMember.objects.create(workspace=workspace, user=writer, role="member")
+    WorkspaceMember.objects.create(workspace=workspace, user=reader, role="member")
+
+    project = Project.objects.create(workspace=workspace, title="API", created_by=owner)
+    ProjectMember.objects.create(project=project, user=writer, permission="write")
+    ProjectMember.objects.create(project=project, user=reader, permission="read")
+
+    task = Task.objects.create(project=project, title="Fix login", created_by=owner)
+    url = f"/api/v1/workspaces/{workspace.id}/projects/{project.id}/tasks/{task.id}/"
+    return {"writer": writer, "reader": reader, "task": task, "url": url}
+
+
+@pytest.mark.django_db
+def test_task_patch_resolves_membership_once(task_setup):
+    client = APIClient()
+    client.force_authenticate(task_setup["writer"])
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.patch(task_setup["url"], {"title": "Fix login flow"}, format="json")
+
+    assert response.status_code == 200
+
+    # Only ONE query may touch the membership tables for the whole request
+    membership_queries = [
+        q["sql"] for q in ctx.captured_queries
+        if "workspace_workspacemember" in q["sql"] or "workspace_projectmember" in q["sql"]
+    ]
+    assert len(membership_queries) == 1
+
+
+@pytest.mark.django_db
+def test_read_only_member_cannot_patch_task(task_setup):
+    client = APIClient()
+    client.force_authenticate(task_setup["reader"])
+
+    response = client.patch(task_setup["url"], {"title": "Nope"}, format="json")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+@override_settings(ACL_CACHE_ENABLED=True)
+def test_role_change_invalidates_cached_acl(task_setup):
+    client = APIClient()
+    client.force_authenticate(task_setup["reader"])
+
+    # 1. Warm the ACL cache with the read-only permission
+    assert client.patch(task_setup["url"], {"title": "Nope"}, format="json").status_code == 403
+
+    # 2. Upgrade the membership -> post_save drops the cached entry
+    member = ProjectMember.objects.get(user=task_setup["reader"])
+    member.permission = "write"
+    member.save()
+
+    # 3. The next request sees the new permission
+    assert client.patch(task_setup["url"], {"title": "Now allowed"}, format="json").status_code == 200
+
+
+@pytest.mark.django_db
+def test_acl_cache_is_off_without_a_shared_cache(task_setup):
+    # LocMem is per worker: an invalidation there would not reach the others
+    assert not acl_cache.enabled()
+    client = APIClient()
+    client.force_authenticate(task_setup["reader"])
+    client.patch(task_setup["url"], {"title": "Nope"}, format="json")
+    assert not cache.get_many(
+        [acl_cache.acl_key("project", task_setup["task"].project_id, task_setup["reader"].id)]
+    )
@@ -0,0 +1,104 @@
+import json
+import re
+import subprocess
+import sys
+
+import pytest
+from django.test import override_settings
+from django.urls import resolve
+from rest_framework.test import APIClient
+
+from src import metrics
+from workspace.models import Workspace, WorkspaceMember
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch, settings):
+    settings.METRICS_TOKEN = "secret"
+    registry = metrics.Registry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    return registry
+
+
+def scrape(client):
+    return client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").content.decode()
+
+
+def sample(text, name, **labels):
+    """Value of one series in the exposition text."""
+    for line in text.splitlines():
+        match = re.match(r"(\w+)\{(.*)\} (\S+)$", line)
+        if match and match.group(1) == name:
+            found = dict(re.findall(r'(\w+)="([^"]*)"', match.group(2)))
+            if all(found.get(key) == str(value) for key, value in labels.items()):
+                return float(match.group(3))
+    return None
+
+
+@pytest.mark.django_db
+def test_requests_are_measured_per_view(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    client = APIClient()
+    client.force_authenticate(owner)
+    url = f"/api/v1/workspaces/{workspace.id}/dashboard/"
+    view = resolve(url).view_name
+
+    client.get(url)
+    client.get(url)
+    text = scrape(client)
+
+    assert sample(text, "http_requests_total", view=view, method="GET", status=200) == 2
+    assert sample(text, "http_request_duration_seconds_count", view=view) == 2
+    assert sample(text, "http_request_duration_seconds_bucket", view=view, le="+Inf") == 2
+    assert sample(text, "db_queries_total", view=view) > 0
+    assert sample(text, "db_query_duration_seconds_total", view=view) > 0
+    # Dashboard: miss then hit on the cache-aside entry
+    assert sample(text, "cache_hits_total", view=view) >= 1
+    assert sample(text, "cache_misses_total", view=view) >= 1
+    # The scrape itself is not recorded
+    assert "metrics" not in {line.split('view="')[1].split('"')[0] for line in text.splitlines() if 'view="' in line}
+
+
+@pytest.mark.django_db
+def test_workers_are_merged_through_the_shared_directory(tmp_path, registry, client):
+    other = metrics.Registry()
+    other.observe("a-view", "GET", 200, 0.02, metrics.RequestStats())
+    (tmp_path / "metrics-1.json").write_text(json.dumps(other.snapshot()))
+    registry.observe("a-view", "GET", 200, 0.2, metrics.RequestStats())
+
+    with override_settings(METRICS_DIR=str(tmp_path)):
+        text = scrape(client)
+        # This worker's own file is written on the next flush
+        registry.flush(str(tmp_path))
+    assert sample(text, "http_requests_total", view="a-view", method="GET", status=200) == 2
+    assert sample(text, "http_request_duration_seconds_bucket", view="a-view", le=0.025) == 1
+    assert sample(text, "http_request_duration_seconds_bucket", view="a-view", le=0.25) == 2
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 2
+
+
+@pytest.mark.django_db
+def test_files_of_exited_workers_are_dropped(tmp_path, client):
+    exited = subprocess.Popen([sys.executable, "-c", ""])
+    exited.wait()
+    stale = metrics.Registry()
+    stale.observe("a-view", "GET", 200, 0.02, metrics.RequestStats())
+    (tmp_path / f"metrics-{exited.pid}.json").write_text(json.dumps(stale.snapshot()))
+
+    with override_settings(METRICS_DIR=str(tmp_path)):
+        text = scrape(client)
+    assert sample(text, "http_requests_total", view="a-view", method="GET", status=200) is None
+    assert not list(tmp_path.glob("metrics-*.json"))
+
+
+@pytest.mark.django_db
+def test_metrics_token(client, settings):
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+    # No token: hidden, except in DEBUG
+    settings.METRICS_TOKEN = ""
+    assert client.get("/metrics").status_code == 404
+    settings.DEBUG = True
+    assert client.get("/metrics").status_code == 200
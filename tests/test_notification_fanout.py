@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from notifications import notification_services
+from notifications.models import Notification
+from notifications.notification_services import NotificationService
+from notifications.tasks import fan_out_notifications
+from workspace.models import Workspace, WorkspaceMember
+
+
+@pytest.fixture
+def workspace(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    for i in range(5):
+        user = django_user_model.objects.create_user(email=f"m{i}@test.com")
+        WorkspaceMember.objects.create(workspace=workspace, user=user, role="member")
+    return workspace
+
+
+def notify_workspace(workspace):
+    return NotificationService.send_bulk_notification(
+        audience={"model": "workspace.WorkspaceMember", "filters": {"workspace_id": str(workspace.id)}},
+        actor=workspace.owner,
+        title="Hello",
+        message="Hello team",
+        target_obj=workspace,
+    )
+
+
+@pytest.mark.django_db
+def test_eager_fan_out_writes_in_chunks(workspace, settings, monkeypatch):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    monkeypatch.setattr(notification_services, "FANOUT_CHUNK_SIZE", 2)
+
+    assert notify_workspace(workspace) == 5
+    assert Notification.objects.count() == 5
+    assert not Notification.objects.filter(recipient=workspace.owner).exists()
+
+
+@pytest.mark.django_db
+def test_fan_out_is_enqueued_after_commit(workspace, settings, monkeypatch, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = False
+    settings.CELERY_BROKER_URL = "redis://redis:6379/0"
+    jobs = []
+    monkeypatch.setattr(fan_out_notifications, "delay", lambda *args: jobs.append(args))
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        notify_workspace(workspace)
+    assert jobs == [] and Notification.objects.count() == 0
+
+    callbacks[0]()
+    audience, payload = jobs[0]
+
+    # The worker side reports progress per chunk
+    progress = []
+    assert NotificationService.fan_out(audience, payload, progress=lambda *p: progress.append(p)) == 5
+    assert progress[-1] == (5, 5)
+
+
+@pytest.mark.django_db
+def test_bursts_are_coalesced_per_recipient(workspace, settings, django_user_model):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    member = WorkspaceMember.objects.filter(role="member").first().user
+    other_actor = django_user_model.objects.create_user(email="actor@test.com")
+
+    for actor in (workspace.owner, other_actor, workspace.owner):
+        NotificationService.send_bulk_notification(
+            recipients=[member], actor=actor, title="New Task Added", message="m",
+            target_obj=workspace, category="task_added", coalesce_on=workspace,
+        )
+
+    row = Notification.objects.get(recipient=member)
+    assert row.event_count == 3
+    assert row.actor == workspace.owner
+
+    # Once read, the next event starts a new row
+    Notification.objects.filter(pk=row.pk).update(is_read=True)
+    NotificationService.send_bulk_notification(
+        recipients=[member], actor=other_actor, title="New Task Added", message="m",
+        target_obj=workspace, category="task_added", coalesce_on=workspace,
+    )
+    assert Notification.objects.filter(recipient=member).count() == 2
+
+
+@pytest.mark.django_db
+def test_coalescing_window_and_inbox_order(workspace, settings):
+    member = WorkspaceMember.objects.filter(role="member").first().user
+    client = APIClient()
+    client.force_authenticate(member)
+
+    def task_event():
+        NotificationService.send_bulk_notification(
+            recipients=[member], actor=workspace.owner, title="New Task Added", message="m",
+            target_obj=workspace, category="task_added", coalesce_on=workspace,
+        )
+
+    # 1. A merge moves the row back to the top of the inbox
+    task_event()
+    merged = Notification.objects.get(recipient=member)
+    Notification.objects.filter(pk=merged.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+    NotificationService.send_notification(member, workspace.owner, "Other", "m", workspace)
+    task_event()
+    inbox = client.get("/api/v1/notifications/").data["results"]
+    assert [(row["title"], row["event_count"]) for row in inbox] == [("New Task Added", 2), ("Other", 1)]
+
+    # 2. The window runs from the row's creation, not from its last merge
+    window = timedelta(seconds=settings.NOTIFICATION_COALESCE_WINDOW)
+    Notification.objects.filter(pk=merged.pk).update(created_at=timezone.now() - window * 2)
+    task_event()
+    assert Notification.objects.filter(recipient=member, coalesce_key=merged.coalesce_key).count() == 2
+
+
+@pytest.mark.django_db
+def test_fan_out_without_a_broker_is_not_lost(workspace, settings, monkeypatch, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = False
+
+    # 1. No broker configured: inline, like eager mode
+    settings.CELERY_BROKER_URL = ""
+    assert notify_workspace(workspace) == 5
+
+    # 2. Broker down after commit: delivered inline instead of raising
+    settings.CELERY_BROKER_URL = "redis://redis:6379/0"
+    monkeypatch.setattr(fan_out_notifications, "delay", lambda *args: 1 / 0)
+    Notification.objects.all().delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        notify_workspace(workspace)
+    assert Notification.objects.count() == 5
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.utils import timezone
+
+from notifications import unread_counter
+from notifications.models import Notification
+from notifications.retention import purge_notifications
+
+
+@pytest.fixture
+def inbox(django_user_model):
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+    content_type = ContentType.objects.get_for_model(user)
+
+    def make(count, is_read, age_days):
+        rows = Notification.objects.bulk_create(
+            Notification(recipient=user, content_type=content_type, object_id=user.id,
+                         title="n", message="n", is_read=is_read)
+            for _ in range(count)
+        )
+        Notification.objects.filter(pk__in=[n.pk for n in rows]).update(
+            created_at=timezone.now() - timedelta(days=age_days)
+        )
+
+    make(3, is_read=True, age_days=40)   # expired
+    make(1, is_read=True, age_days=5)
+    make(2, is_read=False, age_days=100)  # expired
+    make(1, is_read=False, age_days=40)
+    return user
+
+
+@pytest.mark.django_db
+def test_purge_respects_retention_and_batches(inbox):
+    # 1. Dry run only reports
+    report = purge_notifications(read_days=30, unread_days=90, dry_run=True)
+    assert (report["read_purged"], report["unread_purged"]) == (3, 2)
+    assert Notification.objects.count() == 7
+
+    # 2. Real run deletes in batches and drops the stale badge counter
+    assert unread_counter.get_unread_count(inbox.id) == 3
+    metrics = purge_notifications(read_days=30, unread_days=90, batch_size=2)
+    assert (metrics["read_purged"], metrics["unread_purged"], metrics["batches"]) == (3, 2, 3)
+    assert Notification.objects.count() == 2
+    assert unread_counter.get_unread_count(inbox.id) == 1
+
+
+@pytest.mark.django_db
+def test_purge_command_dry_run(inbox, capsys):
+    call_command("purge_notifications", "--dry-run")
+    assert "Would purge 3 read and 2 unread" in capsys.readouterr().out
+    assert Notification.objects.count() == 7
@@ -0,0 +1,92 @@
+import base64
+import importlib
+import json
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.apps import apps as django_apps
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from notifications.models import Notification
+from users.models import UserSettings
+
+
+def notify(user, title, is_read=False):
+    return Notification.objects.create(
+        recipient=user,
+        content_type=ContentType.objects.get_for_model(user),
+        object_id=user.id,
+        title=title,
+        message=title,
+        is_read=is_read,
+    )
+
+
+@pytest.mark.django_db
+def test_notification_cursor_is_stable_while_rows_arrive(django_user_model):
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+    UserSettings.objects.create(user=user, items_per_page=2)
+    for i in range(4):
+        notify(user, f"unread-{i}")
+    notify(user, "read", is_read=True)
+
+    client = APIClient()
+    client.force_authenticate(user)
+
+    # 1. First page honours items_per_page and keeps unread first
+    page = client.get("/api/v1/notifications/").data
+    assert [n["title"] for n in page["results"]] == ["unread-3", "unread-2"]
+
+    # 2. A new notification does not shift the following pages
+    notify(user, "unread-new")
+    seen = [n["title"] for n in page["results"]]
+    while page["next"]:
+        page = client.get(page["next"]).data
+        seen += [n["title"] for n in page["results"]]
+
+    assert seen == ["unread-3", "unread-2", "unread-1", "unread-0", "read"]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_rejected(django_user_model):
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    assert client.get("/api/v1/notifications/", {"cursor": "garbage"}).status_code == 404
+    # Well-formed, but the values do not fit the columns
+    for values in ([False, "not-a-date", "x"], [False, None, 1], [1, 2]):
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        assert client.get("/api/v1/notifications/", {"cursor": cursor}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_cursor_of_another_sort_is_rejected(django_user_model):
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+    client = APIClient()
+    client.force_authenticate(user)
+    cursor = base64.urlsafe_b64encode(json.dumps([12, str(uuid.uuid4())]).encode()).decode()
+
+    url = "/api/v1/communities/public_communities/"
+    assert client.get(url, {"sort": "popular", "cursor": cursor}).status_code == 200
+    assert client.get(url, {"sort": "recent", "cursor": cursor}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_rows_older_than_coalescing_keep_their_order(django_user_model):
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+    older, newer = notify(user, "older"), notify(user, "newer")
+    Notification.objects.filter(pk=older.pk).update(created_at=timezone.now() - timedelta(days=2))
+    # As left by AddField(updated_at): one timestamp for every existing row
+    Notification.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+    migration = importlib.import_module("notifications.migrations.0003_notification_coalescing")
+    migration.backfill_updated_at(django_apps, None)
+
+    client = APIClient()
+    client.force_authenticate(user)
+    titles = [row["title"] for row in client.get("/api/v1/notifications/").data["results"]]
+    assert titles == ["newer", "older"]
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from community.models import Community, CommunityCategory, CommunityMember, Post, PostLike
+
+
+@pytest.fixture
+def community(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    community = Community.objects.create(
+        name="C", category=CommunityCategory.objects.create(name="Tech"), created_by=owner
+    )
+    CommunityMember.objects.create(community=community, user=owner, role="admin")
+    client = APIClient()
+    client.force_authenticate(owner)
+    return owner, community, client
+
+
+@pytest.mark.django_db
+def test_counters_follow_likes_and_comments(community, django_user_model):
+    owner, community, client = community
+    post = Post.objects.create(community=community, author=owner, content="p")
+    fan = django_user_model.objects.create_user(email="fan@test.com")
+    PostLike.objects.create(post=post, user=fan)
+
+    # 1. Toggle like / unlike returns the stored counter
+    like_url = f"/api/v1/posts/posts/{post.id}/like/"
+    assert client.post(like_url).data == {"status": "liked", "count": 2}
+    assert client.post(like_url).data == {"status": "unliked", "count": 1}
+
+    # 2. Comments are counted on create and delete
+    for _ in range(2):
+        assert client.post(f"/api/v1/posts/posts/{post.id}/comments/", {"content": "c"}).status_code == 201
+    post.comments.first().delete()
+    post.refresh_from_db()
+    assert (post.like_count, post.comment_count) == (1, 1)
+
+    # 3. Deleting the post does not touch the (gone) counters
+    post.delete()
+    assert not Post.objects.exists()
+
+
+@pytest.mark.django_db
+def test_feed_queries_do_not_grow_with_page_size(community):
+    owner, community, client = community
+    url = f"/api/v1/posts/communities/{community.id}/posts/"
+
+    def run():
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        return response.data["results"], len(ctx.captured_queries)
+
+    liked = Post.objects.create(community=community, author=owner, content="p")
+    PostLike.objects.create(post=liked, user=owner)
+    results, few = run()
+    assert results[0]["is_liked"] is True and results[0]["like_count"] == 1
+
+    for _ in range(5):
+        Post.objects.create(community=community, author=owner, content="p")
+    results, many = run()
+    assert many <= few
+    assert [post["is_liked"] for post in results] == [False] * 5 + [True]
@@ -0,0 +1,66 @@
+import pytest
+from rest_framework.test import APIClient
+
+from workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, ProjectAccess
+
+
+@pytest.fixture
+def workspace_setup(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    member = django_user_model.objects.create_user(email="member@test.com", password="password")
+
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    WorkspaceMember.objects.create(workspace=workspace, user=member, role="member")
+
+    public = Project.objects.create(workspace=workspace, title="Public", visibility="public", created_by=owner)
+    private = Project.objects.create(workspace=workspace, title="Private", visibility="private", created_by=owner)
+    return {"owner": owner, "member": member, "workspace": workspace, "public": public, "private": private}
+
+
+def visible_titles(user, workspace):
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.get(f"/api/v1/workspaces/{workspace.id}/projects/")
+    assert response.status_code == 200
+    rows = response.data["results"] if isinstance(response.data, dict) else response.data
+    return sorted(p["title"] for p in rows)
+
+
+@pytest.mark.django_db
+def test_member_sees_public_and_own_projects(workspace_setup):
+    s = workspace_setup
+
+    # 1. Only the public project at first
+    assert visible_titles(s["member"], s["workspace"]) == ["Public"]
+
+    # 2. Being added to the private project grants access
+    ProjectMember.objects.create(project=s["private"], user=s["member"], permission="read")
+    assert visible_titles(s["member"], s["workspace"]) == ["Private", "Public"]
+
+    # 3. Owners see everything
+    assert visible_titles(s["owner"], s["workspace"]) == ["Private", "Public"]
+
+
+@pytest.mark.django_db
+def test_access_follows_visibility_and_membership_changes(workspace_setup):
+    s = workspace_setup
+
+    # 1. Making the private project public exposes it to every member
+    s["private"].visibility = "public"
+    s["private"].save()
+    assert ProjectAccess.objects.filter(user=s["member"], project=s["private"]).exists()
+
+    # 2. And back
+    s["private"].visibility = "private"
+    s["private"].save()
+    assert not ProjectAccess.objects.filter(user=s["member"], project=s["private"]).exists()
+
+    # 3. Leaving the workspace removes every row of that user
+    WorkspaceMember.objects.filter(workspace=s["workspace"], user=s["member"]).delete()
+    assert not ProjectAccess.objects.filter(user=s["member"]).exists()
+
+    # 4. Deleting a project with members does not leave dangling rows behind
+    ProjectMember.objects.create(project=s["public"], user=s["owner"], permission="write")
+    s["public"].delete()
+    assert not ProjectAccess.objects.filter(project_id=s["public"].id).exists()
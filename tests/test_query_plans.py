@@ -0,0 +1,124 @@
+"""
+EXPLAIN every query an endpoint runs and fail on sequential scans of hot tables.
+
+SQLite reports a full table scan as "SCAN <table>" (without "USING ... INDEX");
+PostgreSQL as "Seq Scan on <table>". On PostgreSQL seq scans are disabled for
+the EXPLAIN so the planner's choice does not depend on the tiny seeded tables.
+"""
+import re
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from community.models import Community, CommunityCategory, CommunityMember, Post, Comment as PostComment
+from notifications.models import Notification
+from workspace.models import (
+    Workspace, WorkspaceMember, Project, ProjectMember, Task, Comment, ActivityLog,
+)
+
+
+HOT_TABLES = {
+    model._meta.db_table
+    for model in (Task, Comment, ActivityLog, Notification, Post, PostComment)
+}
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def table_aliases(sql):
+    """Django aliases subquery/join tables (`"tasks" U0`); plans report the alias."""
+    return dict(
+        (alias, table)
+        for table, alias in re.findall(r'"(\w+)"\s+(?:AS\s+)?"?([A-Z]\d+)"?', sql)
+    )
+
+
+def sequential_scans(queries):
+    """[(table, sql)] for every hot table that is read without an index."""
+    scans = []
+    for query in queries:
+        sql = query["sql"]
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        aliases = table_aliases(sql)
+        for line in explain(sql):
+            match = re.search(r'(?:Seq Scan on|^SCAN) "?(\w+)"?', line.strip())
+            if not match or "INDEX" in line:
+                continue
+            table = aliases.get(match.group(1), match.group(1))
+            if table in HOT_TABLES:
+                scans.append((table, sql))
+    return scans
+
+
+@pytest.fixture
+def seeded(django_user_model):
+    user = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    other = django_user_model.objects.create_user(email="other@test.com")
+
+    workspace = Workspace.objects.create(name="Acme", owner=user)
+    WorkspaceMember.objects.create(workspace=workspace, user=user, role="owner")
+    WorkspaceMember.objects.create(workspace=workspace, user=other, role="member")
+    project = Project.objects.create(workspace=workspace, title="P", created_by=user, status="active")
+    ProjectMember.objects.create(project=project, user=other, permission="write")
+    for i in range(20):
+        task = Task.objects.create(
+            project=project, title=f"T{i}", created_by=user,
+            assigned_to=user if i % 2 else other,
+            status="completed" if i % 3 == 0 else "pending",
+        )
+        Comment.objects.create(task=task, author=other, content="c")
+
+    user_type = ContentType.objects.get_for_model(user)
+    Notification.objects.bulk_create(
+        Notification(recipient=recipient, content_type=user_type, object_id=user.id,
+                     title="n", message="n", is_read=bool(i % 2))
+        for i in range(20) for recipient in (user, other)
+    )
+
+    category = CommunityCategory.objects.create(name="Tech")
+    community = Community.objects.create(name="C", category=category, created_by=user)
+    CommunityMember.objects.create(community=community, user=user, role="admin")
+    for i in range(20):
+        post = Post.objects.create(community=community, author=user, content="p", is_pinned=i == 0)
+        PostComment.objects.create(post=post, author=user, content="c")
+
+    client = APIClient()
+    client.force_authenticate(user)
+    base = f"/api/v1/workspaces/{workspace.id}"
+    task = project.tasks.first()
+    return client, [
+        f"{base}/dashboard/",
+        f"{base}/projects/",
+        f"{base}/projects/{project.id}/tasks/",
+        f"{base}/projects/{project.id}/tasks/{task.id}/comment/",
+        "/api/v1/notifications/",
+        f"/api/v1/posts/communities/{community.id}/posts/",
+        f"/api/v1/posts/posts/{post.id}/comments/",
+        "/api/v1/posts/home/",
+    ]
+
+
+@pytest.mark.django_db
+def test_hot_endpoints_do_not_scan_tables(seeded):
+    client, urls = seeded
+
+    problems = []
+    for url in urls:
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert response.status_code == 200, url
+        problems += [(url, table, sql) for table, sql in sequential_scans(ctx.captured_queries)]
+
+    assert not problems, "\n\n".join(f"{url}: SCAN {table}\n{sql}" for url, table, sql in problems)
@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+import pytest
+from rest_framework_simplejwt.tokens import AccessToken
+
+from notifications import realtime
+from notifications.notification_services import NotificationService
+from notifications.websocket import CLOSE_UNAUTHORIZED, notifications_websocket
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = realtime.InMemoryBroker()
+    monkeypatch.setattr(realtime, "_broker", broker)
+    return broker
+
+
+def run_socket(token, after_accept):
+    """Drives one WebSocket session, returns the frames sent to the client."""
+    async def session():
+        inbox, outbox = asyncio.Queue(), asyncio.Queue()
+        await inbox.put({"type": "websocket.connect"})
+        scope = {"type": "websocket", "path": "/ws/notifications/", "query_string": f"token={token}".encode()}
+        handler = asyncio.ensure_future(notifications_websocket(scope, inbox.get, outbox.put))
+
+        frames = [await asyncio.wait_for(outbox.get(), 1)]
+        if frames[0]["type"] == "websocket.accept":
+            after_accept()
+            frames.append(await asyncio.wait_for(outbox.get(), 1))
+            await inbox.put({"type": "websocket.disconnect"})
+        await asyncio.wait_for(handler, 1)
+        return frames
+
+    return asyncio.run(session())
+
+
+@pytest.mark.django_db
+def test_notification_is_pushed_after_commit(django_user_model, broker, django_capture_on_commit_callbacks):
+    actor = django_user_model.objects.create_user(email="actor@test.com", password="password")
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        notification = NotificationService.send_notification(
+            recipient=user, actor=actor, title="Hi", message="Hello", target_obj=actor,
+        )
+
+    def commit():
+        for callback in callbacks:
+            callback()
+
+    frames = run_socket(str(AccessToken.for_user(user)), commit)
+    assert frames[0]["type"] == "websocket.accept"
+    assert json.loads(frames[1]["text"])["notification"]["id"] == str(notification.id)
+
+
+@pytest.mark.django_db
+def test_invalid_token_is_rejected(broker):
+    frames = run_socket("not-a-token", lambda: None)
+    assert frames == [{"type": "websocket.close", "code": CLOSE_UNAUTHORIZED}]
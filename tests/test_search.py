@@ -0,0 +1,118 @@
+import importlib
+
+import pytest
+from django.apps import apps as django_apps
+from rest_framework.test import APIClient
+
+from community.models import Comment as PostComment, Community, CommunityCategory, CommunityMember, Post
+from search.indexing import rebuild_search_index
+from search.models import SearchDocument
+from workspace.models import Comment, Project, ProjectMember, Task, Workspace, WorkspaceMember
+
+URL = "/api/v1/search/"
+
+
+@pytest.fixture
+def content(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    member = django_user_model.objects.create_user(email="member@test.com", password="password")
+
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    WorkspaceMember.objects.create(workspace=workspace, user=member, role="member")
+    public = Project.objects.create(workspace=workspace, title="Rocket launch", created_by=owner, visibility="public")
+    secret = Project.objects.create(workspace=workspace, title="Secret rocket", created_by=owner, visibility="private")
+
+    task = Task.objects.create(project=public, title="Fuel the rocket", description="Liquid oxygen", created_by=owner)
+    Task.objects.create(project=secret, title="Hide the rocket", created_by=owner)
+    Comment.objects.create(task=task, author=owner, content="The rocket is fuelled")
+
+    category = CommunityCategory.objects.create(name="Space")
+    joined = Community.objects.create(name="Joined", category=category, created_by=owner)
+    other = Community.objects.create(name="Other", category=category, created_by=owner)
+    CommunityMember.objects.create(community=joined, user=member)
+    post = Post.objects.create(community=joined, author=owner, content="Rocket photos")
+    PostComment.objects.create(post=post, author=owner, content="Nice rocket")
+    Post.objects.create(community=other, author=owner, content="Rocket gossip")
+
+    client = APIClient()
+    client.force_authenticate(member)
+    return client, owner, member, secret, task, post
+
+
+def search(client, **params):
+    return client.get(URL, params).data["results"]
+
+
+@pytest.mark.django_db
+def test_search_is_scoped_ranked_and_highlighted(content):
+    client, owner, member, secret, task, post = content
+
+    results = search(client, q="rocket")
+    assert sorted(row["kind"] for row in results) == [
+        "post", "post_comment", "project", "task", "task_comment",
+    ]
+    assert all("<mark>" in row["highlight"].lower() for row in results)
+    assert results == sorted(results, key=lambda row: -row["rank"])
+
+    # Every word must match, stemming, kind filter
+    assert [row["id"] for row in search(client, q="fuel oxygen")] == [str(task.id)]
+    assert [row["title"] for row in search(client, q="launches")] == ["Rocket launch"]
+    assert [row["kind"] for row in search(client, q="rocket", kind="post")] == ["post"]
+    assert client.get(URL).status_code == 400
+
+    # Joining the private project widens the scope
+    ProjectMember.objects.create(project=secret, user=member, permission="read")
+    assert len(search(client, q="rocket")) == 7
+
+    # Cursor pagination walks the same result set
+    ids, url = [], f"{URL}?q=rocket&page_size=2"
+    while url:
+        data = client.get(url).data
+        ids += [row["id"] for row in data["results"]]
+        url = data["next"]
+    assert ids == [row["id"] for row in search(client, q="rocket")]
+
+
+@pytest.mark.django_db
+def test_index_follows_writes(content):
+    client, owner, member, secret, task, post = content
+
+    task.title = "Polish the shuttle"
+    task.description = ""
+    task.save()
+    assert [row["id"] for row in search(client, q="shuttle")] == [str(task.id)]
+
+    task.delete()
+    post.delete()
+    assert not search(client, q="fuelled") and not search(client, q="photos")
+    assert not SearchDocument.objects.filter(parent_id__in=[task.id, post.id]).exists()
+
+    count = SearchDocument.objects.count()
+    assert rebuild_search_index() == count
+    assert len(search(client, q="rocket")) == 1
+
+
+@pytest.mark.django_db
+def test_highlight_escapes_the_document_text(content):
+    client, owner, member, secret, task, post = content
+
+    task.title = "rocket <img src=x onerror=alert(1)>"
+    task.save()
+    highlight, = [row["highlight"] for row in search(client, q="onerror")]
+    assert "<img" not in highlight
+    assert "&lt;img src=x <mark>onerror</mark>=alert(1)&gt;" in highlight
+
+
+@pytest.mark.django_db
+def test_migration_indexes_existing_content(content):
+    client, owner, member, secret, task, post = content
+    before = sorted(SearchDocument.objects.values_list("kind", "object_id", "title", "body"))
+
+    # Objects written before the search app existed have no documents
+    SearchDocument.objects.all().delete()
+    assert not search(client, q="rocket")
+
+    importlib.import_module("search.migrations.0003_backfill_documents").backfill_documents(django_apps, None)
+    assert sorted(SearchDocument.objects.values_list("kind", "object_id", "title", "body")) == before
+    assert len(search(client, q="rocket")) == 5
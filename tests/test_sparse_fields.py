@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task, Comment
+
+
+@pytest.fixture
+def projects_setup(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+
+    for i in range(3):
+        project = Project.objects.create(workspace=workspace, title=f"P{i}", created_by=owner)
+        ProjectMember.objects.create(project=project, user=owner, permission="admin")
+        for j in range(2):
+            task = Task.objects.create(project=project, title=f"T{i}{j}", created_by=owner, assigned_to=owner)
+            Comment.objects.create(task=task, author=owner, content="hi")
+
+    client = APIClient()
+    client.force_authenticate(owner)
+    return {"client": client, "workspace": workspace, "project": project,
+            "url": f"/api/v1/workspaces/{workspace.id}/projects/"}
+
+
+def rows(response):
+    return response.data["results"] if isinstance(response.data, dict) and "results" in response.data else response.data
+
+
+@pytest.mark.django_db
+def test_project_list_is_summary_by_default(projects_setup):
+    client, url = projects_setup["client"], projects_setup["url"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    project = rows(response)[0]
+    assert "tasks" not in project and "members" not in project
+    assert project["task_count"] == 2
+    assert project["user_permission"]["permission"] == "admin"
+    assert len(ctx.captured_queries) <= 3
+
+    # ?fields narrows the root
+    project = rows(client.get(url, {"fields": "id,title"}))[0]
+    assert set(project) == {"id", "title"}
+
+
+@pytest.mark.django_db
+def test_expand_loads_only_requested_relations(projects_setup):
+    client, url = projects_setup["client"], projects_setup["url"]
+
+    # 1. Dotted expand nests comments inside tasks, prefetched in constant queries
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, {"expand": "tasks.comments"})
+    project = rows(response)[0]
+    assert "members" not in project
+    assert len(project["tasks"][0]["comments"]) == 1
+    assert len(ctx.captured_queries) <= 5
+
+    # 2. Detail is fully nested
+    detail = client.get(f"{url}{projects_setup['project'].id}/").data
+    assert {"tasks", "members"} <= set(detail)
+    assert "comments" in detail["tasks"][0]
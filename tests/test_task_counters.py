@@ -0,0 +1,54 @@
+import pytest
+
+from workspace.counter_services import reconcile_task_counters
+from workspace.models import Workspace, WorkspaceMember, Project, Task
+
+
+@pytest.fixture
+def project(django_user_model):
+    owner = django_user_model.objects.create_user(email="owner@test.com", password="password")
+    workspace = Workspace.objects.create(name="Acme", owner=owner)
+    WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+    return Project.objects.create(workspace=workspace, title="P", created_by=owner)
+
+
+def counters(project):
+    project.refresh_from_db(fields=["task_count", "completed_count"])
+    return project.task_count, project.completed_count
+
+
+@pytest.mark.django_db
+def test_counters_follow_task_lifecycle(project):
+    owner = project.created_by
+
+    # 1. Create
+    task = Task.objects.create(project=project, title="A", created_by=owner)
+    Task.objects.create(project=project, title="B", created_by=owner, status="completed")
+    assert counters(project) == (2, 1)
+
+    # 2. Status transitions (re-saving a completed task does not double count)
+    task = Task.objects.get(pk=task.pk)
+    task.status = "completed"
+    task.save()
+    task.save()
+    assert counters(project) == (2, 2)
+
+    task.status = "in_progress"
+    task.save()
+    assert counters(project) == (2, 1)
+
+    # 3. Delete (single and queryset)
+    task.delete()
+    Task.objects.filter(project=project).delete()
+    assert counters(project) == (0, 0)
+
+
+@pytest.mark.django_db
+def test_reconcile_repairs_drift(project):
+    Task.objects.create(project=project, title="A", created_by=project.created_by, status="completed")
+    Project.objects.filter(pk=project.pk).update(task_count=7, completed_count=0)
+
+    drifted = reconcile_task_counters()
+    assert [pk for pk, _, _ in drifted] == [project.pk]
+    assert counters(project) == (1, 1)
+    assert reconcile_task_counters() == []
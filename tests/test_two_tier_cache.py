@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from community.models import CommunityCategory
+from src import two_tier_cache
+from src.two_tier_cache import get_hot_cache
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "two-tier-tests"},
+    "hot": {
+        "BACKEND": "src.two_tier_cache.TwoTierCache",
+        "OPTIONS": {"SHARED_CACHE": "default", "LOCAL_TIMEOUT": 30, "LOCAL_MAX_ENTRIES": 3},
+    },
+}
+
+
+@pytest.fixture
+def hot():
+    with override_settings(CACHES=CACHES):
+        cache = get_hot_cache()
+        cache.clear()
+        yield cache
+        cache.clear()
+
+
+def message_from_other_worker(keys):
+    return json.dumps({"origin": "other-worker", "keys": keys})
+
+
+def test_local_copy_until_invalidated(hot):
+    shared = caches["default"]
+
+    # 1. A read fills the worker's LRU; a change it was not told about is not seen
+    hot.set("k", 1)
+    shared.set("k", 2)
+    assert hot.get("k") == 1
+
+    # 2. Another worker's invalidation drops it; our own messages are ignored
+    local_key = hot.make_key("k")
+    hot.handle_message(json.dumps({"origin": two_tier_cache._process_id(), "keys": [local_key]}))
+    assert hot.get("k") == 1
+    hot.handle_message(message_from_other_worker([local_key]))
+    assert hot.get("k") == 2
+
+    # 3. Writes through the two-tier cache replace both tiers
+    hot.set_many({"k": 3, "j": 4})
+    assert hot.get_many(["k", "j", "missing"]) == {"k": 3, "j": 4}
+    hot.delete("k")
+    assert hot.get("k") is None and shared.get("k") is None
+
+
+def test_local_tier_is_bounded_by_size_and_ttl(hot, monkeypatch):
+    # An LRU built earlier from other settings (dev/prod: 5000) is not reused
+    two_tier_cache.TwoTierCache("hot", {"OPTIONS": {"LOCAL_MAX_ENTRIES": 5000}})
+    hot = two_tier_cache.TwoTierCache("hot", CACHES["hot"])
+    for i in range(5):
+        hot.set(f"k{i}", i)
+    assert len(hot.local) == 3
+    assert hot.local.get(hot.make_key("k0")) is two_tier_cache._MISSING
+    assert hot.get("k0") == 0  # still in the shared tier
+
+    now = two_tier_cache.time.monotonic()
+    monkeypatch.setattr(two_tier_cache.time, "monotonic", lambda: now + 31)
+    assert hot.local.get(hot.make_key("k4")) is two_tier_cache._MISSING
+
+
+def test_fill_racing_an_invalidation_is_dropped(hot):
+    shared = caches["default"]
+    shared.set("k", "old")
+
+    generation = hot.local.generation
+    hot.handle_message(message_from_other_worker([hot.make_key("k")]))
+    hot.local.set(hot.make_key("k"), "old", 30, generation)
+    assert hot.local.get(hot.make_key("k")) is two_tier_cache._MISSING
+
+
+@pytest.mark.django_db
+def test_category_list_is_served_from_the_hot_cache(hot, django_user_model):
+    user = django_user_model.objects.create_user(email="u@test.com", password="password")
+    client = APIClient()
+    client.force_authenticate(user)
+    url = "/api/v1/communities/categories/"
+    CommunityCategory.objects.create(name="Tech")
+
+    assert [row["name"] for row in client.get(url).data] == ["Tech"]
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    assert not any("category" in query["sql"] for query in ctx.captured_queries)
+
+    CommunityCategory.objects.create(name="Art")
+    assert sorted(row["name"] for row in client.get(url).data) == ["Art", "Tech"]
@@ -0,0 +1,61 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from notifications.models import Notification
+from notifications.notification_services import NotificationService
+
+
+@pytest.mark.django_db
+@override_settings(UNREAD_COUNT_CACHE_ENABLED=True)
+def test_unread_count_follows_writes(django_user_model, django_capture_on_commit_callbacks):
+    actor = django_user_model.objects.create_user(email="actor@test.com", password="password")
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+    client = APIClient()
+    client.force_authenticate(user)
+    url = "/api/v1/notifications/unread-count/"
+
+    def send(count):
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(count):
+                NotificationService.send_bulk_notification([user], actor, "Hi", "Hello", actor)
+
+    # 1. First read counts from the DB, the next ones come from the cache
+    send(2)
+    assert client.get(url).data["unread_count"] == 2
+    send(1)
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(url).data["unread_count"] == 3
+    assert not any("notification" in q["sql"] for q in ctx.captured_queries)
+
+    # 2. Marking one read twice only decrements once
+    pk = Notification.objects.filter(recipient=user).first().pk
+    for _ in range(2):
+        with django_capture_on_commit_callbacks(execute=True):
+            assert client.post(f"/api/v1/notifications/{pk}/read/").status_code == 200
+    assert client.get(url).data["unread_count"] == 2
+
+    # 3. Mark all resets
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post("/api/v1/notifications/mark-all-read/")
+    assert client.get(url).data["unread_count"] == 0
+
+
+@pytest.mark.django_db
+def test_unread_count_is_not_cached_without_a_shared_cache(django_user_model):
+    # LocMem is per worker: the other workers would never see the adjustments
+    actor = django_user_model.objects.create_user(email="actor@test.com", password="password")
+    user = django_user_model.objects.create_user(email="user@test.com", password="password")
+    client = APIClient()
+    client.force_authenticate(user)
+    url = "/api/v1/notifications/unread-count/"
+
+    NotificationService.send_bulk_notification([user], actor, "Hi", "Hello", actor)
+    assert client.get(url).data["unread_count"] == 1
+    # Written without the badge hooks (e.g. by another worker): still counted
+    Notification.objects.filter(recipient=user).update(is_read=True)
+    assert client.get(url).data["unread_count"] == 0
+    assert cache.get(f"notifications:unread:{user.id}") is None
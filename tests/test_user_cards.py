@@ -0,0 +1,77 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from community.models import Comment, Community, CommunityCategory, CommunityMember, Post
+from users.api import UserSerializer
+from users.user_cards import card_key
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_users(django_user_model, count):
+    users = [django_user_model.objects.create_user(email=f"u{i}@test.com") for i in range(count)]
+    for i, user in enumerate(users):
+        user.profile.username = f"user{i}"
+        user.profile.save()
+    return users
+
+
+def comment_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response, [query["sql"] for query in ctx.captured_queries]
+
+
+@pytest.mark.django_db
+def test_comment_authors_are_batched_and_cached(django_user_model):
+    owner, *authors = make_users(django_user_model, 6)
+    community = Community.objects.create(
+        name="C", category=CommunityCategory.objects.create(name="Tech"), created_by=owner
+    )
+    CommunityMember.objects.create(community=community, user=owner, role="admin")
+    post = Post.objects.create(community=community, author=owner, content="p")
+    client = APIClient()
+    client.force_authenticate(owner)
+    url = f"/api/v1/posts/posts/{post.id}/comments/"
+
+    # 1. Cold cache: one query for every author card of the page
+    Comment.objects.create(post=post, author=authors[0], content="c")
+    _, few = comment_queries(client, url)
+    cache.clear()
+    for author in authors[1:]:
+        Comment.objects.create(post=post, author=author, content="c")
+    response, many = comment_queries(client, url)
+    assert len(many) <= len(few)
+    assert sum("user_profiles" in sql for sql in many) == 1
+    first = response.data["results"][0]["author"]
+    assert set(first) == {"id", "email", "username", "avatar"}
+
+    # 2. Warm cache: no profile query at all
+    _, warm = comment_queries(client, url)
+    assert not any("user_profiles" in sql for sql in warm)
+
+    # 3. A profile save drops the card
+    profile = authors[0].profile
+    profile.username = "renamed"
+    profile.save()
+    assert cache.get(card_key(authors[0].pk)) is None
+    usernames = {row["author"]["username"] for row in client.get(url).data["results"]}
+    assert usernames == {"renamed", "user2", "user3", "user4", "user5"}
+
+
+@pytest.mark.django_db
+def test_user_serializer_shape_is_unchanged(django_user_model):
+    user, = make_users(django_user_model, 1)
+    assert UserSerializer(user).data == {
+        "id": str(user.id), "email": "u0@test.com", "username": "user0", "avatar": None,
+    }
+    assert UserSerializer([user], many=True).data[0]["username"] == "user0"